@@ -0,0 +1,134 @@
+"""
+Compares the latency and accuracy of the model precisions.
+
+Runs the ALPR pipeline (detector and OCR model) at each precision over the images
+in a directory, and reports the per-image latency and how closely the results of
+each precision match those of fp32. The test images have no ground-truth labels,
+so the fp32 results serve as the reference: a plate matches when the reduced-
+precision pipeline finds a plate at (nearly) the same place with the same text.
+
+Producing the int8 models needs the `quantization` extra:
+
+    pip install omni-lpr[quantization]
+    python scripts/benchmark_precision.py --images tests/testdata/plates
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import cv2
+import numpy as np
+from open_image_models.detection.core.base import BoundingBox
+
+from omni_lpr import tools
+from omni_lpr.quantization import MODEL_PRECISIONS
+from omni_lpr.settings import settings
+
+# The minimum overlap of two detections of the same plate.
+_MIN_IOU = 0.5
+
+
+def load_images(directory: Path) -> dict[str, np.ndarray]:
+    """Loads the images of a directory as BGR frames, skipping unreadable files."""
+    frames = {}
+    for path in sorted(directory.iterdir()):
+        frame = cv2.imread(str(path))
+        if frame is None:
+            print(f"Skipping unreadable image: {path.name}", file=sys.stderr)
+            continue
+        frames[path.name] = frame
+    return frames
+
+
+def run_precision(
+    precision: str, frames: dict[str, np.ndarray], detector_model: str, ocr_model: str, runs: int
+) -> tuple[list[float], dict[str, list[Any]]]:
+    """Runs the pipeline of a precision over the frames and returns latencies and results."""
+    alpr = tools._compose_alpr(
+        tools._build_detector(detector_model, precision),
+        tools._build_ocr_recognizer(ocr_model, precision),
+    )
+    latencies, results = [], {}
+    for name, frame in frames.items():
+        # The first run of a session is slower, so it is not measured.
+        results[name] = alpr.predict(frame)
+        for _ in range(runs):
+            started = time.perf_counter()
+            alpr.predict(frame)
+            latencies.append((time.perf_counter() - started) * 1000)
+    return latencies, results
+
+
+def _iou(a: BoundingBox, b: BoundingBox) -> float:
+    x1, y1 = max(a.x1, b.x1), max(a.y1, b.y1)
+    x2, y2 = min(a.x2, b.x2), min(a.y2, b.y2)
+    intersection = max(0, x2 - x1) * max(0, y2 - y1)
+    union = (a.x2 - a.x1) * (a.y2 - a.y1) + (b.x2 - b.x1) * (b.y2 - b.y1) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def compare(reference: dict[str, list[Any]], results: dict[str, list[Any]]) -> dict[str, int]:
+    """Counts the reference plates that were found again, and those read the same."""
+    found = same_text = total = 0
+    for name, reference_plates in reference.items():
+        total += len(reference_plates)
+        for plate in reference_plates:
+            matches = [
+                other
+                for other in results[name]
+                if _iou(plate.detection.bounding_box, other.detection.bounding_box) >= _MIN_IOU
+            ]
+            if matches:
+                found += 1
+                same_text += any(
+                    other.ocr is not None
+                    and plate.ocr is not None
+                    and other.ocr.text == plate.ocr.text
+                    for other in matches
+                )
+    return {"reference_plates": total, "found": found, "same_text": same_text}
+
+
+def main() -> int:
+    """Runs the benchmark and prints a table of the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--images", type=Path, default=Path("tests/testdata/plates"))
+    parser.add_argument("--detector-model", default=settings.default_detector_model)
+    parser.add_argument("--ocr-model", default=settings.default_ocr_model)
+    parser.add_argument("--runs", type=int, default=10, help="Measured runs per image.")
+    args = parser.parse_args()
+
+    frames = load_images(args.images)
+    if not frames:
+        print(f"No readable images in {args.images}.", file=sys.stderr)
+        return 1
+
+    print(
+        f"Detector '{args.detector_model}', OCR '{args.ocr_model}', {len(frames)} image(s), "
+        f"{args.runs} run(s) per image.\n"
+    )
+    print(f"{'precision':<10} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'plates':>7} {'text':>6}")
+    reference = None
+    for precision in MODEL_PRECISIONS:
+        latencies, results = run_precision(
+            precision, frames, args.detector_model, args.ocr_model, args.runs
+        )
+        reference = reference or results
+        accuracy = compare(reference, results)
+        total = accuracy["reference_plates"] or 1
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+        print(
+            f"{precision:<10} {statistics.mean(latencies):>9.2f} "
+            f"{statistics.median(latencies):>8.2f} {p95:>8.2f} "
+            f"{accuracy['found'] / total:>7.1%} {accuracy['same_text'] / total:>6.1%}"
+        )
+    print("\n'plates' and 'text': share of the fp32 plates found again and read the same.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,6 +25,28 @@ fi
 
 export PATH="${VENV_BIN}:$PATH"
 
+# With the sidecar backend, one inference process owns all models and the
+# Gunicorn workers forward images to it over a Unix socket.
+if [ "${INFERENCE_BACKEND:-thread}" = "sidecar" ]; then
+  : "${INFERENCE_SOCKET_PATH:=${HOME}/.cache/omni-lpr/inference.sock}"
+  export INFERENCE_SOCKET_PATH
+  echo "Starting the inference sidecar on ${INFERENCE_SOCKET_PATH}..."
+  "${VENV_BIN}/omni-lpr-inference" &
+  SIDECAR_PID=$!
+  for _ in $(seq 1 100); do
+    [ -S "${INFERENCE_SOCKET_PATH}" ] && break
+    if ! kill -0 "${SIDECAR_PID}" 2>/dev/null; then
+      echo "Error: the inference sidecar exited during startup"
+      exit 1
+    fi
+    sleep 0.1
+  done
+  if [ ! -S "${INFERENCE_SOCKET_PATH}" ]; then
+    echo "Error: the inference sidecar did not create ${INFERENCE_SOCKET_PATH}"
+    exit 1
+  fi
+fi
+
 BIND="${HOST}:${PORT}"
 
 # Word-split GUNICORN_EXTRA_ARGS and store them in an array.
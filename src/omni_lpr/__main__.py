@@ -1,24 +1,40 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Mapping
 
 import click
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 from pythonjsonlogger import jsonlogger
 from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
 from starlette.responses import JSONResponse
 from starlette.routing import Mount, Route
 from starlette.types import Receive, Scope, Send
 
 from .event_store import InMemoryEventStore
+from .inference_pool import shutdown_inference_pool
 from .mcp import app as mcp_app
-from .settings import settings
-from .tools import setup_cache, setup_tools
+from .settings import ServerSettings, settings
+from .tools import (
+    batch_scheduler,
+    cascade_stats,
+    decode_pool,
+    image_fetcher,
+    inference_scheduler,
+    model_manager,
+    near_duplicates,
+    result_cache,
+    setup_tools,
+    tool_registry,
+)
+from .warmup import readiness, warm_up_models
 
 _logger = logging.getLogger(__name__)
 
 
-def setup_logging(log_level: str):
+def setup_logging(log_level: str) -> None:
     level = logging.getLevelName(log_level.upper())
     logHandler = logging.StreamHandler()
     formatter = jsonlogger.JsonFormatter("%(asctime)s %(name)s %(levelname)s %(message)s")
@@ -27,12 +43,34 @@ def setup_logging(log_level: str):
     _logger.info(f"Logging configured with level: {log_level.upper()}")
 
 
-async def health_check(_request):
+async def health_check(_request: Request) -> JSONResponse:
     """Health check endpoint."""
     _logger.debug("Health check requested.")
     return JSONResponse({"status": "ok", "version": settings.pkg_version})
 
 
+async def readiness_check(_request: Request) -> JSONResponse:
+    """Readiness endpoint that only succeeds once the model warm-up has finished."""
+    return JSONResponse(readiness.to_dict(), status_code=200 if readiness.ready else 503)
+
+
+async def metrics(_request: Request) -> JSONResponse:
+    """Metrics endpoint reporting admission, scheduling, model, decode, fetch, and cache stats."""
+    return JSONResponse(
+        {
+            "admission": tool_registry.admission.stats(),
+            "scheduler": inference_scheduler.stats(),
+            "batching": batch_scheduler.stats(),
+            "models": model_manager.stats(),
+            "cascade": cascade_stats.stats(),
+            "decoding": decode_pool.stats(),
+            "fetching": image_fetcher.stats(),
+            "result_cache": result_cache.stats(),
+            "near_duplicates": near_duplicates.stats(),
+        }
+    )
+
+
 # --- Setup Streamable HTTP Manager for the main app ---
 event_store = InMemoryEventStore()
 session_manager = StreamableHTTPSessionManager(app=mcp_app, event_store=event_store)
@@ -44,21 +82,34 @@ async def handle_streamable_http(scope: Scope, receive: Receive, send: Send) ->
 
 
 @asynccontextmanager
-async def lifespan(app: Starlette):
-    """Context manager for managing the session manager lifecycle."""
+async def lifespan(app: Starlette) -> AsyncIterator[None]:
+    """Context manager for managing the session manager lifecycle and model warm-up."""
+    # The warm-up runs in the background, so that liveness checks are served meanwhile.
+    warmup_task = asyncio.create_task(
+        warm_up_models(settings.preload_models, settings.warmup_iterations)
+    )
+    idle_unloader_task = asyncio.create_task(model_manager.run_idle_unloader())
+    await image_fetcher.start()
+    await result_cache.start()
     async with session_manager.run():
         _logger.info("Application started with StreamableHTTP session manager.")
         try:
             yield
         finally:
             _logger.info("Application shutting down...")
+            warmup_task.cancel()
+            idle_unloader_task.cancel()
+            model_manager.clear()
+            shutdown_inference_pool()
+            await image_fetcher.aclose()
+            await result_cache.aclose()
 
 
 # Create main app with lifespan manager
 starlette_app = Starlette(debug=True, lifespan=lifespan)
 
 
-def setup_app_routes(main_app: Starlette):
+def setup_app_routes(main_app: Starlette) -> None:
     """Adds routes to the Starlette application."""
     from .rest import api_spec, setup_rest_routes
 
@@ -71,12 +122,16 @@ def setup_app_routes(main_app: Starlette):
 
     # 3. Define other routes for the main application
     health_route = Route("/api/health", endpoint=health_check, methods=["GET"])
+    ready_route = Route("/api/ready", endpoint=readiness_check, methods=["GET"])
+    metrics_route = Route("/api/metrics", endpoint=metrics, methods=["GET"])
 
     # 4. Mount the sub-app and add other routes to the main app
     main_app.routes.extend(
         [
             Mount("/mcp/", app=handle_streamable_http),
             health_route,
+            ready_route,
+            metrics_route,
             Mount("/api/v1", app=api_v1_app),
         ]
     )
@@ -95,6 +150,58 @@ starlette_app = CORSMiddleware(
 )
 
 
+# The CLI options that are ignored when empty or zero, not only when they are not given.
+_OPTIONS_UNSET_IF_FALSY = frozenset(
+    {
+        "host",
+        "port",
+        "log_level",
+        "default_ocr_model",
+        "default_detector_model",
+        "model_precision",
+        "quantized_model_dir",
+        "cascade_detector_model",
+        "cascade_policy",
+        "max_image_size_mb",
+        "decode_concurrency",
+        "fetch_max_connections",
+        "fetch_max_connections_per_host",
+        "fetch_timeout_s",
+        "fetch_connect_timeout_s",
+        "fetch_cache_dir",
+        "result_cache_backend",
+        "result_cache_path",
+        "model_cache_size",
+        "inference_batch_max_size",
+        "inference_backend",
+        "inference_processes",
+        "inference_socket_path",
+        "preload_models",
+        "ort_execution_mode",
+        "ort_graph_optimization_level",
+        "ort_optimized_model_dir",
+        "scheduler_default_priority",
+        "scheduler_client_weights",
+    }
+)
+# Converts the values of CLI options to those of their settings.
+_OPTION_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    "result_cache_backend": str.lower,
+    "scheduler_default_priority": str.lower,
+    "preload_models": ServerSettings.split_preload_models,
+    "scheduler_client_weights": ServerSettings.parse_client_weights,
+}
+
+
+def _apply_cli_options(options: Mapping[str, Any]) -> None:
+    """Overrides the settings with the CLI options that were given."""
+    for name, value in options.items():
+        if value is None or (name in _OPTIONS_UNSET_IF_FALSY and not value):
+            continue
+        converter = _OPTION_CONVERTERS.get(name)
+        setattr(settings, name, converter(value) if converter else value)
+
+
 @click.command()
 @click.option("--host", default=None, help="The host to bind to.", envvar="HOST")
 @click.option("--port", default=None, type=int, help="The port to bind to.", envvar="PORT")
@@ -112,6 +219,39 @@ starlette_app = CORSMiddleware(
     help="The default detector model to use.",
     envvar="DEFAULT_DETECTOR_MODEL",
 )
+@click.option(
+    "--model-precision",
+    default=None,
+    type=click.Choice(["fp32", "int8"]),
+    help="The precision of the models of calls that do not choose one.",
+    envvar="MODEL_PRECISION",
+)
+@click.option(
+    "--quantized-model-dir",
+    default=None,
+    help="The directory for caching the quantized (int8) model files.",
+    envvar="QUANTIZED_MODEL_DIR",
+)
+@click.option(
+    "--cascade-detector-model",
+    default=None,
+    help="A larger detector that re-runs the frames the requested detector handled poorly.",
+    envvar="CASCADE_DETECTOR_MODEL",
+)
+@click.option(
+    "--cascade-policy",
+    default=None,
+    type=click.Choice(["empty", "low_confidence"]),
+    help="Which frames the detector cascade re-runs on the larger detector.",
+    envvar="CASCADE_POLICY",
+)
+@click.option(
+    "--cascade-min-confidence",
+    default=None,
+    type=float,
+    help="The detection confidence below which the low_confidence policy re-runs a frame.",
+    envvar="CASCADE_MIN_CONFIDENCE",
+)
 @click.option(
     "--max-image-size-mb",
     default=None,
@@ -119,6 +259,143 @@ starlette_app = CORSMiddleware(
     help="The maximum image size in megabytes.",
     envvar="MAX_IMAGE_SIZE_MB",
 )
+@click.option(
+    "--reduced-decode/--no-reduced-decode",
+    default=None,
+    help="Decode JPEG images for the detectors (and OCR) at a reduced scale covering their input.",
+    envvar="REDUCED_DECODE",
+)
+@click.option(
+    "--decode-concurrency",
+    default=None,
+    type=int,
+    help="The number of images decoded at once, in worker threads of their own.",
+    envvar="DECODE_CONCURRENCY",
+)
+@click.option(
+    "--fetch-max-connections",
+    default=None,
+    type=int,
+    help="The number of remote images fetched at once, over pooled connections.",
+    envvar="FETCH_MAX_CONNECTIONS",
+)
+@click.option(
+    "--fetch-max-connections-per-host",
+    default=None,
+    type=int,
+    help="The number of remote images fetched at once from the same host.",
+    envvar="FETCH_MAX_CONNECTIONS_PER_HOST",
+)
+@click.option(
+    "--fetch-timeout-s",
+    default=None,
+    type=float,
+    help="The timeout of reading a remote image, in seconds.",
+    envvar="FETCH_TIMEOUT_S",
+)
+@click.option(
+    "--fetch-connect-timeout-s",
+    default=None,
+    type=float,
+    help="The timeout of connecting to the host of a remote image, in seconds.",
+    envvar="FETCH_CONNECT_TIMEOUT_S",
+)
+@click.option(
+    "--fetch-keepalive-s",
+    default=None,
+    type=float,
+    help="How long idle connections to image hosts are kept open for reuse, in seconds.",
+    envvar="FETCH_KEEPALIVE_S",
+)
+@click.option(
+    "--fetch-http2/--no-fetch-http2",
+    default=None,
+    help="Fetch remote images over HTTP/2 (needs the 'http2' extra).",
+    envvar="FETCH_HTTP2",
+)
+@click.option(
+    "--fetch-cache-max-mb",
+    default=None,
+    type=int,
+    help="The memory that the cache of fetched images may take, in megabytes (0 disables it).",
+    envvar="FETCH_CACHE_MAX_MB",
+)
+@click.option(
+    "--fetch-cache-dir",
+    default=None,
+    type=str,
+    help="A directory that images evicted from the fetch cache are spilled to.",
+    envvar="FETCH_CACHE_DIR",
+)
+@click.option(
+    "--fetch-cache-disk-max-mb",
+    default=None,
+    type=int,
+    help="The disk space that the fetch cache directory may take, in megabytes.",
+    envvar="FETCH_CACHE_DISK_MAX_MB",
+)
+@click.option(
+    "--result-cache-size",
+    default=None,
+    type=int,
+    help="The number of images whose inference results are cached (0 disables the cache).",
+    envvar="RESULT_CACHE_SIZE",
+)
+@click.option(
+    "--result-cache-max-mb",
+    default=None,
+    type=int,
+    help="The memory that cached inference results may take, in megabytes.",
+    envvar="RESULT_CACHE_MAX_MB",
+)
+@click.option(
+    "--result-cache-ttl-s",
+    default=None,
+    type=float,
+    help="How long inference results stay cached, in seconds (0 keeps them until evicted).",
+    envvar="RESULT_CACHE_TTL_S",
+)
+@click.option(
+    "--result-cache-backend",
+    default=None,
+    type=click.Choice(["memory", "sqlite"], case_sensitive=False),
+    help="Where inference results are cached ('sqlite' is shared by the workers of a host).",
+    envvar="RESULT_CACHE_BACKEND",
+)
+@click.option(
+    "--result-cache-path",
+    default=None,
+    type=str,
+    help="The path of the SQLite database of the 'sqlite' result cache backend.",
+    envvar="RESULT_CACHE_PATH",
+)
+@click.option(
+    "--near-duplicate-detection/--no-near-duplicate-detection",
+    default=None,
+    help="Reuse the results of a recent, nearly identical frame of the same source.",
+    envvar="NEAR_DUPLICATE_DETECTION",
+)
+@click.option(
+    "--near-duplicate-max-distance",
+    default=None,
+    type=int,
+    help="The maximum number of differing perceptual hash bits (of 64) of near-duplicate frames.",
+    envvar="NEAR_DUPLICATE_MAX_DISTANCE",
+)
+@click.option(
+    "--near-duplicate-window",
+    default=None,
+    type=int,
+    help="The number of recent frames of each source that new frames are matched against.",
+    envvar="NEAR_DUPLICATE_WINDOW",
+)
+@click.option(
+    "--near-duplicate-max-age-s",
+    default=None,
+    type=float,
+    help="How long the results of a frame are reused for near-duplicate frames, in seconds.",
+    envvar="NEAR_DUPLICATE_MAX_AGE_S",
+)
 @click.option(
     "--model-cache-size",
     default=None,
@@ -126,37 +403,211 @@ starlette_app = CORSMiddleware(
     help="The number of models to keep in the cache.",
     envvar="MODEL_CACHE_SIZE",
 )
+@click.option(
+    "--model-cache-max-mb",
+    default=None,
+    type=int,
+    help="The estimated memory in megabytes that cached models may take (0 for no limit).",
+    envvar="MODEL_CACHE_MAX_MB",
+)
+@click.option(
+    "--model-cache-pin-defaults/--no-model-cache-pin-defaults",
+    default=None,
+    help="Keep the models of the default detector and OCR model loaded.",
+    envvar="MODEL_CACHE_PIN_DEFAULTS",
+)
+@click.option(
+    "--model-idle-ttl-s",
+    default=None,
+    type=float,
+    help="Unload models that have not been used for this many seconds (0 disables it).",
+    envvar="MODEL_IDLE_TTL_S",
+)
+@click.option(
+    "--inference-batch-max-size",
+    default=None,
+    type=int,
+    help="The maximum number of images per inference batch (1 disables batching).",
+    envvar="INFERENCE_BATCH_MAX_SIZE",
+)
+@click.option(
+    "--inference-batch-max-wait-ms",
+    default=None,
+    type=float,
+    help="The maximum time in milliseconds to wait for an inference batch to fill up.",
+    envvar="INFERENCE_BATCH_MAX_WAIT_MS",
+)
+@click.option(
+    "--inference-backend",
+    default=None,
+    type=click.Choice(["thread", "process", "sidecar"]),
+    help="Where to run inference: worker threads, worker processes, or the inference sidecar.",
+    envvar="INFERENCE_BACKEND",
+)
+@click.option(
+    "--inference-processes",
+    default=None,
+    type=int,
+    help="The number of worker processes for the process inference backend.",
+    envvar="INFERENCE_PROCESSES",
+)
+@click.option(
+    "--inference-socket-path",
+    default=None,
+    help="The Unix socket path of the inference sidecar.",
+    envvar="INFERENCE_SOCKET_PATH",
+)
+@click.option(
+    "--preload-models",
+    default=None,
+    help="Comma-separated '<detector_model>:<ocr_model>' combinations to warm up at startup.",
+    envvar="PRELOAD_MODELS",
+)
+@click.option(
+    "--warmup-iterations",
+    default=None,
+    type=int,
+    help="The number of warm-up inferences per preloaded model.",
+    envvar="WARMUP_ITERATIONS",
+)
+@click.option(
+    "--ort-intra-op-threads",
+    default=None,
+    type=int,
+    help="Threads used within an ONNX Runtime operator (0 uses one per core).",
+    envvar="ORT_INTRA_OP_THREADS",
+)
+@click.option(
+    "--ort-inter-op-threads",
+    default=None,
+    type=int,
+    help="Threads used across ONNX Runtime operators in parallel execution mode.",
+    envvar="ORT_INTER_OP_THREADS",
+)
+@click.option(
+    "--ort-execution-mode",
+    default=None,
+    type=click.Choice(["sequential", "parallel"]),
+    help="The ONNX Runtime execution mode.",
+    envvar="ORT_EXECUTION_MODE",
+)
+@click.option(
+    "--ort-graph-optimization-level",
+    default=None,
+    type=click.Choice(["disable", "basic", "extended", "all"]),
+    help="The ONNX Runtime graph optimization level.",
+    envvar="ORT_GRAPH_OPTIMIZATION_LEVEL",
+)
+@click.option(
+    "--ort-optimized-model-dir",
+    default=None,
+    help="A directory for caching optimized model files across restarts.",
+    envvar="ORT_OPTIMIZED_MODEL_DIR",
+)
+@click.option(
+    "--admission-max-concurrency",
+    default=None,
+    type=int,
+    help="The maximum number of concurrent calls per tool (0 disables admission control).",
+    envvar="ADMISSION_MAX_CONCURRENCY",
+)
+@click.option(
+    "--admission-max-queue",
+    default=None,
+    type=int,
+    help="The maximum number of queued calls per tool before new calls are rejected.",
+    envvar="ADMISSION_MAX_QUEUE",
+)
+@click.option(
+    "--admission-queue-timeout-s",
+    default=None,
+    type=float,
+    help="The maximum time in seconds a call waits in the queue before it is rejected.",
+    envvar="ADMISSION_QUEUE_TIMEOUT_S",
+)
+@click.option(
+    "--scheduler-max-concurrency",
+    default=None,
+    type=int,
+    help="The maximum number of concurrent inference dispatches (0 disables scheduling).",
+    envvar="SCHEDULER_MAX_CONCURRENCY",
+)
+@click.option(
+    "--scheduler-default-priority",
+    default=None,
+    type=click.Choice(["realtime", "batch"], case_sensitive=False),
+    help="The priority class of calls that do not set one.",
+    envvar="SCHEDULER_DEFAULT_PRIORITY",
+)
+@click.option(
+    "--scheduler-client-weights",
+    default=None,
+    type=str,
+    help="Comma-separated '<client_id>=<weight>' fair-share weights of clients.",
+    envvar="SCHEDULER_CLIENT_WEIGHTS",
+)
 def main(
     host: str | None,
     port: int | None,
     log_level: str | None,
     default_ocr_model: str | None,
     default_detector_model: str | None,
+    model_precision: str | None,
+    quantized_model_dir: str | None,
+    cascade_detector_model: str | None,
+    cascade_policy: str | None,
+    cascade_min_confidence: float | None,
     max_image_size_mb: int | None,
+    reduced_decode: bool | None,
+    decode_concurrency: int | None,
+    fetch_max_connections: int | None,
+    fetch_max_connections_per_host: int | None,
+    fetch_timeout_s: float | None,
+    fetch_connect_timeout_s: float | None,
+    fetch_keepalive_s: float | None,
+    fetch_http2: bool | None,
+    fetch_cache_max_mb: int | None,
+    fetch_cache_dir: str | None,
+    fetch_cache_disk_max_mb: int | None,
+    result_cache_size: int | None,
+    result_cache_max_mb: int | None,
+    result_cache_ttl_s: float | None,
+    result_cache_backend: str | None,
+    result_cache_path: str | None,
+    near_duplicate_detection: bool | None,
+    near_duplicate_max_distance: int | None,
+    near_duplicate_window: int | None,
+    near_duplicate_max_age_s: float | None,
     model_cache_size: int | None,
+    model_cache_max_mb: int | None,
+    model_cache_pin_defaults: bool | None,
+    model_idle_ttl_s: float | None,
+    inference_batch_max_size: int | None,
+    inference_batch_max_wait_ms: float | None,
+    inference_backend: str | None,
+    inference_processes: int | None,
+    inference_socket_path: str | None,
+    preload_models: str | None,
+    warmup_iterations: int | None,
+    ort_intra_op_threads: int | None,
+    ort_inter_op_threads: int | None,
+    ort_execution_mode: str | None,
+    ort_graph_optimization_level: str | None,
+    ort_optimized_model_dir: str | None,
+    admission_max_concurrency: int | None,
+    admission_max_queue: int | None,
+    admission_queue_timeout_s: float | None,
+    scheduler_max_concurrency: int | None,
+    scheduler_default_priority: str | None,
+    scheduler_client_weights: str | None,
 ) -> int:
     """Main entrypoint for the omni-lpr server."""
     import uvicorn
 
     # Override settings from CLI if provided
-    if host:
-        settings.host = host
-    if port:
-        settings.port = port
-    if log_level:
-        settings.log_level = log_level
-    if default_ocr_model:
-        settings.default_ocr_model = default_ocr_model
-    if default_detector_model:
-        settings.default_detector_model = default_detector_model
-    if max_image_size_mb:
-        settings.max_image_size_mb = max_image_size_mb
-    if model_cache_size:
-        settings.model_cache_size = model_cache_size
+    _apply_cli_options(click.get_current_context().params)
 
     setup_logging(settings.log_level)
-    _logger.info("Setting up cache...")
-    setup_cache()
 
     _logger.info(f"Starting Streamable HTTP server on {settings.host}:{settings.port}")
     uvicorn.run(starlette_app, host=settings.host, port=settings.port)
@@ -0,0 +1,147 @@
+"""
+Admission control for tool calls.
+
+Each tool has a bounded number of calls that run at once and a bounded queue of
+calls waiting for a slot. Calls that arrive when the queue is full are rejected
+immediately, before their request bodies are read or their images decoded, so
+that the server sheds load cheaply instead of letting memory and latency grow
+without limit during traffic spikes.
+"""
+
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import anyio
+
+from .errors import ErrorCode, ToolLogicError
+from .settings import settings
+
+_logger = logging.getLogger(__name__)
+
+# The weight of the latest call in the moving average of call durations.
+_DURATION_SMOOTHING = 0.2
+
+
+class OverloadedError(ToolLogicError):
+    """
+    Raised when a tool call is rejected because the tool is overloaded.
+
+    Attributes:
+        retry_after: the suggested number of seconds to wait before retrying.
+    """
+
+    def __init__(self, tool_name: str, retry_after: int, reason: str) -> None:
+        super().__init__(
+            message=f"Tool '{tool_name}' is overloaded ({reason}). Retry after {retry_after}s.",
+            code=ErrorCode.OVERLOADED,
+            details={"retry_after": retry_after},
+        )
+        self.retry_after = retry_after
+
+
+class _ToolGate:
+    """The admission state of a single tool."""
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.semaphore = anyio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.avg_duration_s: Optional[float] = None
+
+    def record_duration(self, duration_s: float) -> None:
+        if self.avg_duration_s is None:
+            self.avg_duration_s = duration_s
+        else:
+            self.avg_duration_s += _DURATION_SMOOTHING * (duration_s - self.avg_duration_s)
+
+    def retry_after(self) -> int:
+        """Estimates how long the calls that are already queued need to drain."""
+        if self.avg_duration_s is None:
+            return 1
+        batches = (self.waiting + self.in_flight) / self.max_concurrency
+        return max(1, math.ceil(batches * self.avg_duration_s))
+
+
+class AdmissionController:
+    """
+    Bounds the number of running and queued calls of each tool.
+
+    The limits are read from the `admission_*` settings when a tool is first
+    called. A `admission_max_concurrency` of 0 disables admission control.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the controller with no per-tool state."""
+        self._gates: dict[str, _ToolGate] = {}
+
+    def _gate(self, tool_name: str) -> _ToolGate:
+        gate = self._gates.get(tool_name)
+        if gate is None:
+            gate = _ToolGate(settings.admission_max_concurrency)
+            self._gates[tool_name] = gate
+        return gate
+
+    def clear(self) -> None:
+        """Removes the per-tool state, so that changed settings take effect."""
+        self._gates.clear()
+
+    @asynccontextmanager
+    async def admit(self, tool_name: str) -> AsyncIterator[None]:
+        """
+        Holds a slot of a tool for the duration of the `async with` block.
+
+        Raises:
+            OverloadedError: If the tool's queue is full, or if no slot became
+                free within the queue timeout.
+        """
+        if settings.admission_max_concurrency <= 0:
+            yield
+            return
+
+        gate = self._gate(tool_name)
+        if gate.semaphore.value == 0 and gate.waiting >= settings.admission_max_queue:
+            gate.rejected += 1
+            _logger.warning(f"Rejected call of tool '{tool_name}': queue is full.")
+            raise OverloadedError(tool_name, gate.retry_after(), "queue is full")
+
+        acquired = False
+        gate.waiting += 1
+        try:
+            with anyio.move_on_after(settings.admission_queue_timeout_s):
+                await gate.semaphore.acquire()
+                acquired = True
+        finally:
+            gate.waiting -= 1
+        if not acquired:
+            gate.rejected += 1
+            _logger.warning(f"Rejected call of tool '{tool_name}': timed out in queue.")
+            raise OverloadedError(tool_name, gate.retry_after(), "timed out in queue")
+
+        gate.in_flight += 1
+        gate.admitted += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            gate.record_duration(time.perf_counter() - started)
+            gate.in_flight -= 1
+            gate.semaphore.release()
+
+    def stats(self) -> dict[str, dict[str, float | int | None]]:
+        """Returns per-tool admission statistics, including the queue depth."""
+        return {
+            name: {
+                "in_flight": gate.in_flight,
+                "queue_depth": gate.waiting,
+                "admitted": gate.admitted,
+                "rejected": gate.rejected,
+                "avg_duration_s": gate.avg_duration_s,
+            }
+            for name, gate in self._gates.items()
+        }
@@ -0,0 +1,225 @@
+"""
+Dynamic micro-batching for model inference.
+
+Concurrent requests that target the same model are queued and coalesced into a
+single batch, which is executed in one worker thread. The results are then fanned
+back out to the awaiting requests.
+"""
+
+import asyncio
+import logging
+from contextlib import AbstractAsyncContextManager
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+import anyio
+
+from .context import RequestContext, request_context
+
+_logger = logging.getLogger(__name__)
+
+BatchFunction = Callable[[Sequence[Any]], Sequence[Any]]
+# Returns a context held while a batch runs, given the request context of each of its items.
+BatchSlot = Callable[[Sequence[RequestContext]], AbstractAsyncContextManager[Any]]
+_Pending = tuple[Any, asyncio.Future, RequestContext]
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent submissions into batches for a single model.
+
+    A batch is flushed as soon as it holds `max_batch_size` items or when the
+    oldest queued item has waited `max_wait_ms` milliseconds, whichever comes
+    first. The batch function receives the list of queued items and must return
+    one result per item, in the same order.
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFunction,
+        max_batch_size: int,
+        max_wait_ms: float,
+        slot: Optional[BatchSlot] = None,
+    ) -> None:
+        """Initializes the batcher.
+
+        Args:
+            batch_fn: A blocking function that processes a batch of items.
+            max_batch_size: The maximum number of items in a single batch.
+            max_wait_ms: The maximum time an item waits for a batch to fill up.
+            slot: A function returning a context to hold while a batch runs, such
+                as a scheduler slot, given the request context of each item.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        self.batch_fn = batch_fn
+        self.slot = slot
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending: list[_Pending] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: set[asyncio.Task] = set()
+        self.batches_run = 0
+        self.items_processed = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of items waiting for the next batch."""
+        return len(self._pending)
+
+    async def submit(self, item: object) -> object:
+        """
+        Queues an item for batched processing and waits for its result.
+
+        Args:
+            item: The item to process.
+
+        Returns:
+            The result produced by the batch function for this item.
+        """
+        return (await self.submit_many([item]))[0]
+
+    async def submit_many(self, items: Sequence[Any]) -> list[Any]:
+        """
+        Queues several items for batched processing and waits for all results.
+
+        The items may end up in different batches if they do not fit in the
+        current one.
+
+        Args:
+            items: The items to process.
+
+        Returns:
+            The results produced by the batch function, in the order of `items`.
+        """
+        loop = asyncio.get_running_loop()
+        # A batch runs outside of the calls of its items, so each item keeps its own.
+        context = request_context.get()
+        futures = []
+        for item in items:
+            future = loop.create_future()
+            futures.append(future)
+            self._pending.append((item, future, context))
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+
+        if self._pending and self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+
+        try:
+            results = await asyncio.gather(*futures, return_exceptions=True)
+        except asyncio.CancelledError:
+            # The caller went away or ran out of time, so its queued items are
+            # dropped instead of taking up room in the next batch.
+            self._pending = [pending for pending in self._pending if not pending[1].done()]
+            raise
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    def _flush(self) -> None:
+        """Starts processing the currently queued items as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run_batch(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: list[_Pending]) -> None:
+        """Runs the batch function in a worker thread and resolves the futures."""
+        # Requests that were cancelled while queued no longer need a result.
+        batch = [pending for pending in batch if not pending[1].done()]
+        if not batch:
+            return
+        if self.slot is None:
+            await self._run_items(batch)
+            return
+        async with self.slot([context for _, _, context in batch]):
+            # Requests may also have been cancelled while the batch waited for its slot.
+            batch = [pending for pending in batch if not pending[1].done()]
+            if batch:
+                await self._run_items(batch)
+
+    async def _run_items(self, batch: list[_Pending]) -> None:
+        """Runs the batch function over the items of a batch and resolves their futures."""
+        items = [item for item, _, _ in batch]
+        try:
+            results = await anyio.to_thread.run_sync(self.batch_fn, items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"Batch function returned {len(results)} results for {len(items)} items."
+                )
+        except Exception as e:
+            _logger.exception("Batched inference failed for %d item(s).", len(items))
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_run += 1
+        self.items_processed += len(items)
+        _logger.debug("Processed a batch of %d item(s).", len(items))
+        for (_, future, _), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+
+class BatchScheduler:
+    """
+    Keeps one `MicroBatcher` per model key.
+
+    The key identifies the model (or model combination) that a batch runs
+    against, so that only requests targeting the same model are coalesced.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the scheduler with no batchers."""
+        self._batchers: dict[Hashable, MicroBatcher] = {}
+
+    def get(
+        self,
+        key: Hashable,
+        batch_fn: BatchFunction,
+        max_batch_size: int,
+        max_wait_ms: float,
+        slot: Optional[BatchSlot] = None,
+    ) -> MicroBatcher:
+        """
+        Returns the batcher for a key, creating it on first use.
+
+        Args:
+            key: The model key.
+            batch_fn: The batch function to use when creating a new batcher.
+            max_batch_size: The maximum batch size for a new batcher.
+            max_wait_ms: The maximum wait time for a new batcher.
+            slot: The slot function for a new batcher.
+
+        Returns:
+            The batcher registered for the key.
+        """
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            batcher = MicroBatcher(batch_fn, max_batch_size, max_wait_ms, slot)
+            self._batchers[key] = batcher
+        return batcher
+
+    def clear(self) -> None:
+        """Removes all batchers."""
+        self._batchers.clear()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Returns per-key batching statistics."""
+        return {
+            "/".join(map(str, key)) if isinstance(key, tuple) else str(key): {
+                "queue_depth": batcher.queue_depth,
+                "batches_run": batcher.batches_run,
+                "items_processed": batcher.items_processed,
+            }
+            for key, batcher in self._batchers.items()
+        }
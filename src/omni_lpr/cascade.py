@@ -0,0 +1,61 @@
+"""
+Detector cascades.
+
+A cascade runs a small, fast detector on every frame and re-runs only the frames
+whose results are not good enough through a larger, slower detector. When most
+frames show a large, clear plate, this keeps the cost of the larger detector for
+the frames that need it.
+
+Which frames are escalated is set by the cascade policy:
+
+- "empty" escalates the frames in which the fast detector found no plate.
+- "low_confidence" also escalates the frames in which any plate was detected with
+  a confidence below `cascade_min_confidence`.
+"""
+
+from typing import TYPE_CHECKING, Any, Literal, Sequence
+
+from .settings import settings
+
+if TYPE_CHECKING:
+    from fast_alpr import ALPRResult
+
+CascadePolicy = Literal["empty", "low_confidence"]
+CascadeStage = Literal["fast", "escalated"]
+
+
+def needs_escalation(results: Sequence["ALPRResult"]) -> bool:
+    """Returns whether the fast-stage results of a frame should be re-run on the larger detector."""
+    if not results:
+        return True
+    if settings.cascade_policy == "empty":
+        return False
+    return any(result.detection.confidence < settings.cascade_min_confidence for result in results)
+
+
+class CascadeStats:
+    """Counts how many frames the cascades escalated, to help tune the policy."""
+
+    def __init__(self) -> None:
+        """Initializes the statistics with no frames."""
+        self._pairs: dict[tuple[str, str], dict[str, int]] = {}
+
+    def record(self, fast_model: str, escalated_model: str, frames: int, escalated: int) -> None:
+        """Records the frames of a cascade run and how many of them were escalated."""
+        counts = self._pairs.setdefault(
+            (fast_model, escalated_model), {"frames": 0, "escalated": 0}
+        )
+        counts["frames"] += frames
+        counts["escalated"] += escalated
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Returns the per-cascade frame counts and escalation rates."""
+        return {
+            f"{fast_model}->{escalated_model}": {
+                **counts,
+                "escalation_rate": counts["escalated"] / counts["frames"]
+                if counts["frames"]
+                else None,
+            }
+            for (fast_model, escalated_model), counts in self._pairs.items()
+        }
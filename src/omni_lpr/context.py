@@ -0,0 +1,97 @@
+"""
+Per-request context shared by the REST and MCP interfaces.
+
+The interfaces store who made a tool call, how it should be scheduled, by when
+it must finish, and whether it may use cached results in a context variable, so
+that the inference code can read it without threading it through every tool
+function.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Literal, Mapping, Optional
+
+PriorityClass = Literal["realtime", "batch"]
+PRIORITY_CLASSES: tuple[PriorityClass, ...] = ("realtime", "batch")
+
+CLIENT_ID_HEADER = "x-client-id"
+PRIORITY_HEADER = "x-priority"
+TIMEOUT_HEADER = "x-request-timeout-ms"
+CACHE_CONTROL_HEADER = "cache-control"
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """
+    The context of a tool call.
+
+    Attributes:
+        client_id: the identity of the caller, used for fair-share scheduling.
+        priority: the priority class of the call, or None for the default class.
+        deadline: the `time.monotonic()` time by which the call must finish, or
+            None if it has no deadline.
+        bypass_cache: whether the call must not use or fill the result cache.
+    """
+
+    client_id: str = "anonymous"
+    priority: Optional[PriorityClass] = None
+    deadline: Optional[float] = None
+    bypass_cache: bool = False
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str], fallback_client_id: str) -> "RequestContext":
+        """
+        Builds a context from the `X-Client-Id`, `X-Priority`,
+        `X-Request-Timeout-Ms`, and `Cache-Control` request headers.
+
+        Raises:
+            ValueError: If the priority header names an unknown priority class, or
+                if the timeout header is not a positive number of milliseconds.
+        """
+        priority = headers.get(PRIORITY_HEADER)
+        if priority is not None:
+            priority = priority.strip().lower()
+            if priority not in PRIORITY_CLASSES:
+                raise ValueError(
+                    f"Invalid X-Priority header '{priority}'. "
+                    f"Expected one of: {', '.join(PRIORITY_CLASSES)}."
+                )
+        context = cls(
+            client_id=headers.get(CLIENT_ID_HEADER) or fallback_client_id,
+            priority=priority,
+            bypass_cache="no-cache" in headers.get(CACHE_CONTROL_HEADER, "").lower(),
+        )
+
+        timeout_ms = headers.get(TIMEOUT_HEADER)
+        if timeout_ms is not None:
+            try:
+                timeout = float(timeout_ms)
+            except ValueError:
+                timeout = 0.0
+            if not timeout > 0:
+                raise ValueError(
+                    f"Invalid X-Request-Timeout-Ms header '{timeout_ms}'. "
+                    "Expected a positive number of milliseconds."
+                )
+            context = context.with_timeout(timeout)
+        return context
+
+    def with_timeout(self, timeout_ms: float) -> "RequestContext":
+        """Returns a copy of the context that must finish within `timeout_ms`, or earlier."""
+        deadline = time.monotonic() + timeout_ms / 1000
+        if self.deadline is not None:
+            deadline = min(deadline, self.deadline)
+        return replace(self, deadline=deadline)
+
+    def remaining(self) -> Optional[float]:
+        """Returns the number of seconds left until the deadline, or None without one."""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+
+# The context of calls made outside of a request; it is frozen, so it can be shared.
+_NO_REQUEST = RequestContext()
+
+request_context: ContextVar[RequestContext] = ContextVar("request_context", default=_NO_REQUEST)
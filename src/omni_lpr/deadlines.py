@@ -0,0 +1,73 @@
+"""
+Deadlines of tool calls.
+
+A tool call may be given a deadline, either with the `X-Request-Timeout-Ms`
+header or with the `timeout_ms` argument of a tool. The deadline is enforced in
+two ways: the remaining work of the call is cancelled once it passes, and the
+tools check it between their stages (fetching, decoding, and inference), so that
+a call that has run out of time does not start its next, expensive stage.
+"""
+
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import anyio
+
+from .context import request_context
+from .errors import ErrorCode, ToolLogicError
+
+_logger = logging.getLogger(__name__)
+
+
+class DeadlineExceededError(ToolLogicError):
+    """Raised when a tool call does not finish before its deadline."""
+
+    def __init__(self, stage: str) -> None:
+        super().__init__(
+            message=f"The request deadline passed before {stage} could finish.",
+            code=ErrorCode.DEADLINE_EXCEEDED,
+            details={"stage": stage},
+        )
+
+
+def check_deadline(stage: str) -> None:
+    """
+    Raises if the deadline of the current tool call has passed.
+
+    Args:
+        stage: The stage of the call that is about to start, for the error message.
+
+    Raises:
+        DeadlineExceededError: If the deadline has passed.
+    """
+    remaining = request_context.get().remaining()
+    if remaining is not None and remaining <= 0:
+        _logger.info(f"Skipping {stage}: the request deadline has passed.")
+        raise DeadlineExceededError(stage)
+
+
+@asynccontextmanager
+async def enforce_deadline(stage: str = "the request") -> AsyncIterator[None]:
+    """
+    Cancels the `async with` block when the deadline of the current tool call passes.
+
+    Raises:
+        DeadlineExceededError: If the deadline passed before or during the block.
+    """
+    remaining = request_context.get().remaining()
+    if remaining is None:
+        yield
+        return
+
+    check_deadline(stage)
+    try:
+        with anyio.fail_after(remaining) as scope:
+            yield
+    except TimeoutError as e:
+        # Only the timeout of this scope is the deadline; a timeout raised by the
+        # block itself (a fetch, for instance) is passed on unchanged.
+        if not scope.cancelled_caught:
+            raise
+        _logger.info(f"Cancelled {stage}: the request deadline has passed.")
+        raise DeadlineExceededError(stage) from e
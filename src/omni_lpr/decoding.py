@@ -0,0 +1,139 @@
+"""
+Image decoding.
+
+Images are decoded with OpenCV straight into the BGR arrays that the detectors
+take, without going through a PIL image and a copy into NumPy. The tools convert
+them to the color mode of the OCR model before plates are read.
+When the caller gives the smallest size it needs, JPEG images are decoded at a
+reduced scale (1/2, 1/4, or 1/8) by the JPEG decoder itself. The detectors take
+inputs of 256 to 640 pixels, so decoding a 12 MP camera still at full
+resolution spends most of its time and memory on pixels that are thrown away.
+Formats that OpenCV cannot decode fall back to PIL.
+
+Decoding a large image takes tens of milliseconds of CPU time, so the tools run it
+in the decode pool, in worker threads of its own, instead of on the event loop.
+"""
+
+import io
+import time
+from typing import Any, Optional
+
+import anyio
+import cv2
+import numpy as np
+from PIL import Image
+
+from .settings import settings
+
+# The reduced-scale decode flags of OpenCV, by reduction factor, largest first.
+_REDUCED_FLAGS = {
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+}
+
+
+def reduction_factor(image_format: str, width: int, height: int, min_size: int) -> int:
+    """
+    Returns the largest factor by which an image can be reduced while decoding,
+    such that both of its sides keep at least `min_size` pixels.
+
+    Only JPEG images can be decoded at a reduced scale; the factor of other
+    formats is always 1.
+    """
+    if image_format != "JPEG" or min_size <= 0:
+        return 1
+    for factor in _REDUCED_FLAGS:
+        if min(width, height) // factor >= min_size:
+            return factor
+    return 1
+
+
+def decode_image(data: bytes, min_size: int = 0) -> tuple[np.ndarray, int]:
+    """
+    Decodes an image file into a BGR array.
+
+    Args:
+        data: The bytes of the image file.
+        min_size: The number of pixels that both sides of the decoded image must
+            keep, or 0 to decode the image at full resolution.
+
+    Returns:
+        The decoded image and the factor by which it was reduced. Coordinates in
+        the decoded image times the factor are coordinates in the original image.
+
+    Raises:
+        PIL.UnidentifiedImageError: If the data is not an image file.
+    """
+    # Reading the header is cheap: PIL only decodes the pixels on first access.
+    with Image.open(io.BytesIO(data)) as image:
+        factor = reduction_factor(image.format or "", *image.size, min_size)
+
+        # The orientation is ignored, like PIL does, so that coordinates refer to
+        # the image as stored.
+        flags = _REDUCED_FLAGS.get(factor, cv2.IMREAD_COLOR) | cv2.IMREAD_IGNORE_ORIENTATION
+        decoded = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags)
+        if decoded is None:
+            return cv2.cvtColor(np.asarray(image.convert("RGB")), cv2.COLOR_RGB2BGR), 1
+    return decoded, factor
+
+
+class DecodePool:
+    """
+    Runs image decoding in worker threads, at most `decode_concurrency` at once.
+
+    The pool has its own capacity limiter, so that decoding neither waits for nor
+    holds up the worker threads of inference.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the pool with no decodes."""
+        self._limiter: Optional[anyio.CapacityLimiter] = None
+        self.decodes = 0
+        self.failures = 0
+        self.total_wait_s = 0.0
+        self.total_decode_s = 0.0
+        self.max_decode_s = 0.0
+
+    def _get_limiter(self) -> anyio.CapacityLimiter:
+        """Returns the capacity limiter, created on first use and resized with the setting."""
+        total_tokens = max(settings.decode_concurrency, 1)
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(total_tokens)
+        elif self._limiter.total_tokens != total_tokens:
+            self._limiter.total_tokens = total_tokens
+        return self._limiter
+
+    async def decode(self, data: bytes, min_size: int = 0) -> tuple[np.ndarray, int]:
+        """Decodes an image file in a worker thread of the pool; see `decode_image`."""
+
+        def run() -> tuple[tuple[np.ndarray, int], float]:
+            started = time.perf_counter()
+            return decode_image(data, min_size), started
+
+        queued = time.perf_counter()
+        try:
+            decoded, started = await anyio.to_thread.run_sync(run, limiter=self._get_limiter())
+        except Exception:
+            self.failures += 1
+            raise
+        finished = time.perf_counter()
+        self.decodes += 1
+        self.total_wait_s += started - queued
+        self.total_decode_s += finished - started
+        self.max_decode_s = max(self.max_decode_s, finished - started)
+        return decoded
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the number of running and waiting decodes, and their timings."""
+        statistics = self._limiter.statistics() if self._limiter is not None else None
+        return {
+            "concurrency": max(settings.decode_concurrency, 1),
+            "active": statistics.borrowed_tokens if statistics else 0,
+            "waiting": statistics.tasks_waiting if statistics else 0,
+            "decodes": self.decodes,
+            "failures": self.failures,
+            "avg_wait_ms": self.total_wait_s / self.decodes * 1000 if self.decodes else None,
+            "avg_decode_ms": self.total_decode_s / self.decodes * 1000 if self.decodes else None,
+            "max_decode_ms": self.max_decode_s * 1000 if self.decodes else None,
+        }
@@ -10,6 +10,8 @@ class ErrorCode(str, Enum):
     VALIDATION_ERROR = "VALIDATION_ERROR"
     DESERIALIZATION_ERROR = "DESERIALIZATION_ERROR"
     TOOL_LOGIC_ERROR = "TOOL_LOGIC_ERROR"
+    OVERLOADED = "OVERLOADED"
+    DEADLINE_EXCEEDED = "DEADLINE_EXCEEDED"
     UNKNOWN_ERROR = "UNKNOWN_ERROR"
 
 
@@ -0,0 +1,191 @@
+"""
+Cache of fetched remote images.
+
+When several callers ask about the same snapshot URL, the image is downloaded
+once and kept with the validators its server sent (`ETag` and `Last-Modified`).
+Later fetches of the URL are conditional requests: a `304 Not Modified` answer
+reuses the cached body, so only the headers travel over the network, while a
+changed image is downloaded and replaces the cached one. Responses without
+validators, or marked `Cache-Control: no-store`, are not cached.
+
+The cache is held in memory, bounded by `fetch_cache_max_mb`, and evicts the
+least recently used images first. With `fetch_cache_dir` set, evicted images are
+spilled to files in that directory, bounded by `fetch_cache_disk_max_mb`, and
+read back on their next fetch. The files also survive restarts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Mapping, Optional
+
+import anyio
+
+from .settings import settings
+
+_logger = logging.getLogger(__name__)
+
+
+class CachedImage:
+    """A fetched image and the validators its server sent."""
+
+    __slots__ = ("body", "etag", "last_modified")
+
+    def __init__(self, body: bytes, etag: Optional[str], last_modified: Optional[str]) -> None:
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Returns the headers of a conditional request that revalidates the image."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def cacheable(headers: Mapping[str, str]) -> bool:
+    """Returns whether a response with these headers may be cached and revalidated."""
+    if "no-store" in headers.get("cache-control", "").lower():
+        return False
+    return bool(headers.get("etag") or headers.get("last-modified"))
+
+
+def _file_stem(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+class FetchCache:
+    """A bytes-bounded LRU cache of fetched images, with an optional disk tier."""
+
+    def __init__(self) -> None:
+        """Initializes an empty cache."""
+        self._images: OrderedDict[str, CachedImage] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache is enabled, which it is with a positive `fetch_cache_max_mb`."""
+        return settings.fetch_cache_max_mb > 0
+
+    async def get(self, url: str) -> Optional[CachedImage]:
+        """Returns the cached image of a URL, from memory or disk, or None."""
+        image = self._images.get(url)
+        if image is not None:
+            self._images.move_to_end(url)
+            return image
+        if settings.fetch_cache_dir:
+            image = await anyio.to_thread.run_sync(self._read_file, settings.fetch_cache_dir, url)
+            if image is not None:
+                self.disk_hits += 1
+                await self.put(url, image)
+        return image
+
+    async def put(self, url: str, image: CachedImage) -> None:
+        """Caches the image of a URL, evicting the least recently used images if needed."""
+        max_bytes = settings.fetch_cache_max_mb * 2**20
+        if len(image.body) > max_bytes:
+            return
+        previous = self._images.pop(url, None)
+        if previous is not None:
+            self._bytes -= len(previous.body)
+        self._images[url] = image
+        self._bytes += len(image.body)
+
+        evicted = []
+        while self._bytes > max_bytes:
+            evicted_url, evicted_image = self._images.popitem(last=False)
+            self._bytes -= len(evicted_image.body)
+            evicted.append((evicted_url, evicted_image))
+        if evicted and settings.fetch_cache_dir:
+            await anyio.to_thread.run_sync(self._spill, settings.fetch_cache_dir, evicted)
+
+    def record(self, hit: bool) -> None:
+        """Records whether a fetch was served from the cache after revalidation."""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def _read_file(self, cache_dir: str, url: str) -> Optional[CachedImage]:
+        """Reads the spilled image of a URL from a cache directory, if there is one."""
+        stem = Path(cache_dir).expanduser() / _file_stem(url)
+        try:
+            metadata = json.loads(stem.with_suffix(".json").read_text())
+            body = stem.with_suffix(".body").read_bytes()
+        except (OSError, ValueError):
+            return None
+        if metadata.get("url") != url or metadata.get("size") != len(body):
+            return None
+        return CachedImage(body, metadata.get("etag"), metadata.get("last_modified"))
+
+    def _spill(self, cache_dir: str, images: list[tuple[str, CachedImage]]) -> None:
+        """Writes evicted images to a cache directory and prunes the oldest files."""
+        directory = Path(cache_dir).expanduser()
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            for url, image in images:
+                stem = directory / _file_stem(url)
+                metadata = {
+                    "url": url,
+                    "etag": image.etag,
+                    "last_modified": image.last_modified,
+                    "size": len(image.body),
+                }
+                # The body is written first, so that a metadata file always
+                # describes a complete body.
+                for suffix, data in (
+                    (".body", image.body),
+                    (".json", json.dumps(metadata).encode()),
+                ):
+                    tmp_path = stem.with_suffix(f"{suffix}.{os.getpid()}")
+                    tmp_path.write_bytes(data)
+                    os.replace(tmp_path, stem.with_suffix(suffix))
+            self._prune(directory)
+        except OSError:
+            _logger.warning(f"Could not spill fetched images to {directory}.", exc_info=True)
+
+    @staticmethod
+    def _prune(directory: Path) -> None:
+        """Deletes the least recently written files until the directory is within its limit."""
+        files = sorted(
+            (path for path in directory.iterdir() if path.suffix in (".body", ".json")),
+            key=lambda path: path.stat().st_mtime,
+        )
+        total = sum(path.stat().st_size for path in files)
+        max_bytes = settings.fetch_cache_disk_max_mb * 2**20
+        for path in files:
+            if total <= max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+    async def persist(self) -> None:
+        """Spills the images held in memory to the cache directory, if one is set."""
+        if settings.fetch_cache_dir and self._images:
+            await anyio.to_thread.run_sync(
+                self._spill, settings.fetch_cache_dir, list(self._images.items())
+            )
+
+    def clear(self) -> None:
+        """Drops the images held in memory."""
+        self._images.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the cache size and hit counts."""
+        return {
+            "entries": len(self._images),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+        }
@@ -0,0 +1,171 @@
+"""
+Fetching of remote images.
+
+The `_from_path` tools fetch URLs through one HTTP client that is shared by all
+requests of the server, so that connections to a host are kept alive and reused
+instead of paying DNS, TCP, and TLS setup on every fetch. The client is created
+when the server starts and closed when it stops.
+
+At most `fetch_max_connections` fetches run at once, and at most
+`fetch_max_connections_per_host` of them to the same host; further fetches wait
+for their turn rather than failing on a full connection pool. HTTP/2 needs the
+`h2` package, which is installed with the `http2` extra
+(`pip install omni-lpr[http2]`).
+
+Fetched images are kept in the fetch cache and revalidated with conditional
+requests on their next fetch (see `fetch_cache`).
+"""
+
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+
+import anyio
+import httpx
+
+from .fetch_cache import CachedImage, FetchCache, cacheable
+from .settings import settings
+
+_logger = logging.getLogger(__name__)
+
+
+class ImageFetcher:
+    """Fetches remote images over a shared, pooled HTTP client."""
+
+    def __init__(self) -> None:
+        """Initializes the fetcher without a client; it is created on start or first use."""
+        self._client: Optional[httpx.AsyncClient] = None
+        self._limiter: Optional[anyio.CapacityLimiter] = None
+        self._host_limiters: dict[tuple[str, str, Optional[int]], anyio.Semaphore] = {}
+        self._host_holders: dict[tuple[str, str, Optional[int]], int] = {}
+        self.cache = FetchCache()
+        self.fetches = 0
+        self.failures = 0
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """
+        Creates the HTTP client from the fetch settings.
+
+        Raises:
+            RuntimeError: If HTTP/2 is enabled but the `h2` package is not installed.
+        """
+        try:
+            client = httpx.AsyncClient(
+                http2=settings.fetch_http2,
+                timeout=httpx.Timeout(
+                    settings.fetch_timeout_s, connect=settings.fetch_connect_timeout_s
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.fetch_max_connections,
+                    max_keepalive_connections=settings.fetch_max_connections,
+                    keepalive_expiry=settings.fetch_keepalive_s,
+                ),
+            )
+        except ImportError as e:
+            raise RuntimeError(
+                "Fetching images over HTTP/2 requires the 'h2' package. "
+                "Install it with: pip install omni-lpr[http2]"
+            ) from e
+        _logger.info(
+            f"Created the image fetch client (HTTP/2: {settings.fetch_http2}, "
+            f"max connections: {settings.fetch_max_connections})."
+        )
+        return client
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    def _get_limiter(self) -> anyio.CapacityLimiter:
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(max(settings.fetch_max_connections, 1))
+        return self._limiter
+
+    @asynccontextmanager
+    async def _host_slot(self, url: httpx.URL) -> AsyncIterator[None]:
+        """
+        Holds one of the connections to the host of a URL.
+
+        The limiter of a host is dropped once no fetch holds or waits for it, so
+        that fetching from many hosts does not keep a limiter for each of them.
+        """
+        key = (url.scheme, url.host, url.port)
+        limiter = self._host_limiters.get(key)
+        if limiter is None:
+            limiter = anyio.Semaphore(max(settings.fetch_max_connections_per_host, 1))
+            self._host_limiters[key] = limiter
+        self._host_holders[key] = self._host_holders.get(key, 0) + 1
+        try:
+            async with limiter:
+                yield
+        finally:
+            self._host_holders[key] -= 1
+            if not self._host_holders[key]:
+                del self._host_holders[key]
+                del self._host_limiters[key]
+
+    async def start(self) -> None:
+        """Creates the HTTP client, so that a misconfiguration shows at startup."""
+        self._get_client()
+
+    async def aclose(self) -> None:
+        """Closes the HTTP client and its connections, and persists the fetch cache."""
+        await self.cache.persist()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._limiter = None
+        self._host_limiters.clear()
+        self._host_holders.clear()
+
+    async def fetch(self, url: str) -> bytes:
+        """
+        Fetches the body of a URL, revalidating the cached body if there is one.
+
+        Raises:
+            httpx.HTTPStatusError: If the server answers with an error status.
+            httpx.HTTPError: If the request fails.
+        """
+        client = self._get_client()
+        cached = await self.cache.get(url) if self.cache.enabled else None
+        async with self._get_limiter(), self._host_slot(httpx.URL(url)):
+            try:
+                response = await client.get(
+                    url, headers=cached.conditional_headers() if cached else None
+                )
+                not_modified = cached is not None and response.status_code == 304
+                if not not_modified:
+                    response.raise_for_status()
+            except httpx.HTTPError:
+                self.failures += 1
+                raise
+        self.fetches += 1
+
+        if cached is not None and not_modified:
+            self.cache.record(hit=True)
+            return cached.body
+        if self.cache.enabled:
+            self.cache.record(hit=False)
+            if cacheable(response.headers):
+                await self.cache.put(
+                    url,
+                    CachedImage(
+                        response.content,
+                        response.headers.get("etag"),
+                        response.headers.get("last-modified"),
+                    ),
+                )
+        return response.content
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the number of running and waiting fetches, and the fetch counts."""
+        statistics = self._limiter.statistics() if self._limiter is not None else None
+        return {
+            "active": statistics.borrowed_tokens if statistics else 0,
+            "waiting": statistics.tasks_waiting if statistics else 0,
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "cache": self.cache.stats(),
+        }
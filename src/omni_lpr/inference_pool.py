@@ -0,0 +1,331 @@
+"""
+Process pool backend for model inference.
+
+A fixed pool of worker processes owns the ONNX Runtime sessions, so that the
+Python-side pre- and post-processing of different requests does not contend on
+the GIL of the server process. Frames are handed to the workers through shared
+memory blocks; only the block names and the (small) results cross the process
+boundary through the pool's result channel.
+
+The same operations are served to all server processes of a host by the
+inference sidecar (see `sidecar.py`). The `RemoteALPR` and `RemoteRecognizer`
+classes mirror the parts of the `fast_alpr.ALPR` and
+`fast_plate_ocr.LicensePlateRecognizer` interfaces that the tools use, so they
+can be returned from the model loading functions in place of the in-process
+models.
+"""
+
+import logging
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence, cast
+
+import numpy as np
+
+from .settings import settings
+
+if TYPE_CHECKING:
+    from fast_alpr import ALPR, ALPRResult, DetectionResult
+    from fast_alpr.base import BaseDetector
+    from fast_plate_ocr import LicensePlateRecognizer
+    from fast_plate_ocr.core.types import PlatePrediction
+
+    from .quantization import ModelPrecision
+    from .sidecar import SidecarClient
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SharedFrame:
+    """A reference to a frame stored in a shared memory block."""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+def share_frame(frame: np.ndarray) -> tuple[SharedMemory, SharedFrame]:
+    """
+    Copies a frame into a new shared memory block.
+
+    The caller owns the returned block and must close and unlink it once the
+    workers are done with the frame.
+    """
+    shm = SharedMemory(create=True, size=max(frame.nbytes, 1))
+    view = np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)
+    view[...] = frame
+    return shm, SharedFrame(name=shm.name, shape=frame.shape, dtype=frame.dtype.str)
+
+
+def attach_frame(ref: SharedFrame) -> tuple[SharedMemory, np.ndarray]:
+    """
+    Attaches to a frame in shared memory without copying it.
+
+    The returned array is only valid until the returned block is closed.
+    """
+    if sys.version_info >= (3, 13):
+        shm = SharedMemory(name=ref.name, track=False)
+    else:
+        shm = SharedMemory(name=ref.name)
+        # Before Python 3.13, attaching registers the block with the resource
+        # tracker, which would unlink it when this process exits even though the
+        # server process owns it.
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    frame = np.ndarray(ref.shape, dtype=np.dtype(ref.dtype), buffer=shm.buf)
+    return shm, frame
+
+
+def _release(blocks: Sequence[SharedMemory]) -> None:
+    """Closes and unlinks shared memory blocks owned by the server process."""
+    for shm in blocks:
+        shm.close()
+        shm.unlink()
+
+
+# --- Model owner side (pool workers and the inference sidecar) ---
+
+_worker_models: dict[tuple[str, ...], Any] = {}
+_worker_models_lock = threading.RLock()
+
+
+def _init_worker(settings_values: dict[str, Any]) -> None:
+    """Applies the server's settings, including CLI overrides, in a worker process."""
+    for name, value in settings_values.items():
+        setattr(settings, name, value)
+    # Workers always run the models in-process.
+    settings.inference_backend = "thread"
+
+
+def _worker_model(*key: str) -> object:
+    """Returns a model owned by this worker process, loading it on first use."""
+    with _worker_models_lock:
+        model = _worker_models.get(key)
+        if model is None:
+            from . import tools
+
+            kind, *names = key
+            if kind == "alpr":
+                # Pipelines share the detectors and OCR models of this process.
+                detector_model, ocr_model, precision = names
+                model = tools._compose_alpr(
+                    cast("BaseDetector", _worker_model("detector", detector_model, precision)),
+                    cast("LicensePlateRecognizer", _worker_model("ocr", ocr_model, precision)),
+                )
+            else:
+                name, precision = names
+                if kind == "detector":
+                    model = tools._build_detector(name, cast("ModelPrecision", precision))
+                else:
+                    model = tools._build_ocr_recognizer(name, cast("ModelPrecision", precision))
+            _worker_models[key] = model
+        return model
+
+
+def predict_frames(
+    detector_model: str, ocr_model: str, precision: str, frames: Sequence[np.ndarray]
+) -> list[list["ALPRResult"]]:
+    """Runs the full ALPR pipeline on frames with a model owned by this process."""
+    alpr = cast("ALPR", _worker_model("alpr", detector_model, ocr_model, precision))
+    return [alpr.predict(frame) for frame in frames]
+
+
+def detect_frames(
+    detector_model: str, ocr_model: str, precision: str, frames: Sequence[np.ndarray]
+) -> list[list["DetectionResult"]]:
+    """Runs plate detection on frames with a model owned by this process."""
+    from . import tools
+
+    alpr = cast("ALPR", _worker_model("alpr", detector_model, ocr_model, precision))
+    return tools._detect_plates_batch(alpr, list(frames))
+
+
+def recognize_plates(
+    ocr_model: str, precision: str, return_confidence: bool, plates: Sequence[np.ndarray]
+) -> list["PlatePrediction"]:
+    """Runs OCR on plate images with a model owned by this process."""
+    recognizer = cast("LicensePlateRecognizer", _worker_model("ocr", ocr_model, precision))
+    return recognizer.run(list(plates), return_confidence=return_confidence)
+
+
+def ocr_color_mode(ocr_model: str, precision: str) -> str:
+    """Loads an OCR model in this process and returns its input color mode."""
+    recognizer = cast("LicensePlateRecognizer", _worker_model("ocr", ocr_model, precision))
+    return recognizer.config.image_color_mode
+
+
+# The operations that a remote backend can run, by name. Operations that take
+# frames receive them as their last positional argument.
+OPERATIONS: dict[str, Callable[..., Any]] = {
+    "predict": predict_frames,
+    "detect": detect_frames,
+    "recognize": recognize_plates,
+    "ocr_color_mode": ocr_color_mode,
+}
+
+
+def _worker_call(
+    operation: str, args: tuple[Any, ...], refs: Optional[Sequence[SharedFrame]]
+) -> object:
+    """Runs an operation in a worker process, attaching to its shared frames."""
+    fn = OPERATIONS[operation]
+    if refs is None:
+        return fn(*args)
+
+    blocks, frames = [], []
+    for ref in refs:
+        shm, frame = attach_frame(ref)
+        blocks.append(shm)
+        frames.append(frame)
+    try:
+        return fn(*args, frames)
+    finally:
+        # The array views must be released before their blocks can be closed.
+        frames.clear()
+        for shm in blocks:
+            shm.close()
+
+
+# --- Server process side ---
+
+
+class InferencePool:
+    """A fixed pool of worker processes that run model inference."""
+
+    def __init__(self, processes: int) -> None:
+        """Starts the pool.
+
+        Args:
+            processes: The number of worker processes.
+        """
+        # Worker processes are spawned rather than forked, as forking a process
+        # that already runs ONNX Runtime threads is not safe.
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(settings.model_dump(),),
+        )
+        self.processes = processes
+
+    def run(
+        self, operation: str, *args: object, frames: Optional[Sequence[np.ndarray]] = None
+    ) -> object:
+        """
+        Runs an operation in a worker process and blocks until its result is available.
+
+        The frames, if given, are placed in shared memory and passed to the
+        operation after the other positional arguments.
+        """
+        if frames is None:
+            return self._executor.submit(_worker_call, operation, args, None).result()
+
+        shared = [share_frame(np.ascontiguousarray(frame)) for frame in frames]
+        try:
+            refs = [ref for _, ref in shared]
+            return self._executor.submit(_worker_call, operation, args, refs).result()
+        finally:
+            _release([shm for shm, _ in shared])
+
+    def shutdown(self) -> None:
+        """Stops the worker processes."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: "Optional[InferencePool | SidecarClient]" = None
+_pool_lock = threading.Lock()
+
+
+def get_inference_pool() -> "InferencePool | SidecarClient":
+    """
+    Returns the process-wide remote inference backend, starting it on first use.
+
+    This is a pool of worker processes for the "process" backend, and a client
+    of the inference sidecar for the "sidecar" backend.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if settings.inference_backend == "sidecar":
+                from .sidecar import SidecarClient
+
+                _logger.info(f"Using inference sidecar at {settings.inference_socket_path}.")
+                _pool = SidecarClient(settings.inference_socket_path)
+            else:
+                _logger.info(
+                    f"Starting inference pool with {settings.inference_processes} process(es)."
+                )
+                _pool = InferencePool(settings.inference_processes)
+        return _pool
+
+
+def shutdown_inference_pool() -> None:
+    """Stops the process-wide inference pool if it was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _logger.info("Shutting down remote inference backend.")
+            _pool.shutdown()
+            _pool = None
+
+
+class RemoteALPR:
+    """An ALPR pipeline whose models live in another process."""
+
+    def __init__(
+        self,
+        pool: "InferencePool | SidecarClient",
+        detector_model: str,
+        ocr_model: str,
+        precision: str = "fp32",
+    ) -> None:
+        """Initializes the pipeline for a detector and OCR model pair of a precision."""
+        self.pool = pool
+        self.detector_model = detector_model
+        self.ocr_model = ocr_model
+        self.precision = precision
+
+    def predict(self, frame: np.ndarray) -> list["ALPRResult"]:
+        """Runs detection and OCR on a frame."""
+        results = self.pool.run(
+            "predict", self.detector_model, self.ocr_model, self.precision, frames=[frame]
+        )
+        return cast("list[list[ALPRResult]]", results)[0]
+
+    def detect_batch(self, frames: list[np.ndarray]) -> list[list["DetectionResult"]]:
+        """Runs plate detection on several frames in one worker call."""
+        detections = self.pool.run(
+            "detect", self.detector_model, self.ocr_model, self.precision, frames=frames
+        )
+        return cast("list[list[DetectionResult]]", detections)
+
+
+class RemoteRecognizer:
+    """A license plate OCR model that lives in another process."""
+
+    def __init__(
+        self, pool: "InferencePool | SidecarClient", ocr_model: str, precision: str = "fp32"
+    ) -> None:
+        """Initializes the recognizer and loads its model in the remote process."""
+        self.pool = pool
+        self.ocr_model = ocr_model
+        self.precision = precision
+        self.config = SimpleNamespace(
+            image_color_mode=pool.run("ocr_color_mode", ocr_model, precision)
+        )
+
+    def run(
+        self, source: np.ndarray | list[np.ndarray], return_confidence: bool = False
+    ) -> list["PlatePrediction"]:
+        """Runs OCR on one plate image or a list of plate images."""
+        plates = source if isinstance(source, list) else [source]
+        predictions = self.pool.run(
+            "recognize", self.ocr_model, self.precision, return_confidence, frames=plates
+        )
+        return cast("list[PlatePrediction]", predictions)
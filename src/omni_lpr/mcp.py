@@ -3,6 +3,7 @@ import logging
 import mcp.types as types
 from mcp.server.lowlevel import Server
 
+from .context import RequestContext, request_context
 from .tools import tool_registry
 
 _logger = logging.getLogger(__name__)
@@ -30,7 +31,29 @@ async def call_tool_handler(name: str, arguments: dict) -> list[types.ContentBlo
             A list of content blocks resulting from the tool's processing.
     """
     _logger.debug(f"Tool call received: {name} with arguments: {arguments}")
-    return await tool_registry.call(name, arguments)
+    token = request_context.set(_request_context())
+    try:
+        return await tool_registry.call(name, arguments)
+    finally:
+        request_context.reset(token)
+
+
+def _request_context() -> RequestContext:
+    """
+    Builds the request context of the current MCP request.
+
+    The client is identified by its `X-Client-Id` header or, failing that, by its
+    MCP session. Requests over transports without HTTP headers get the default
+    context.
+    """
+    try:
+        request = app.request_context.request
+    except LookupError:
+        return RequestContext()
+    headers = getattr(request, "headers", None)
+    if headers is None:
+        return RequestContext()
+    return RequestContext.from_headers(headers, headers.get("mcp-session-id") or "anonymous")
 
 
 @app.list_tools()
@@ -0,0 +1,254 @@
+"""
+Ownership of the loaded models.
+
+The model manager keeps the models that the tools run, such as ALPR instances
+and OCR models, keyed by what they were loaded from. Loading a model can take
+seconds, so concurrent requests for a model that is not loaded yet share a
+single load (single-flight) instead of each building their own copy. The
+manager also records how often and how long models take to load.
+
+The loaded models are bounded by their estimated memory rather than only by
+their number, since a large detector can take many times the memory of a small
+one. When a new model does not fit, the least recently used models are unloaded
+first. Pinned models are never unloaded, and models that have been idle for
+longer than `model_idle_ttl_s` are unloaded even when the cache is not full.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar, cast
+
+from .settings import settings
+
+_logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _LoadStats:
+    """The load statistics of a single model."""
+
+    def __init__(self) -> None:
+        self.loads = 0
+        self.failures = 0
+        self.hits = 0
+        self.shared_loads = 0
+        self.evictions = 0
+        self.total_load_s = 0.0
+        self.last_load_s: Optional[float] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "loads": self.loads,
+            "failures": self.failures,
+            "hits": self.hits,
+            "shared_loads": self.shared_loads,
+            "evictions": self.evictions,
+            "last_load_s": self.last_load_s,
+            "avg_load_s": self.total_load_s / self.loads if self.loads else None,
+        }
+
+
+class _Entry:
+    """A loaded model."""
+
+    __slots__ = ("last_used", "model", "pinned", "size_bytes")
+
+    def __init__(self, model: object, size_bytes: int, pinned: bool) -> None:
+        self.model = model
+        self.size_bytes = size_bytes
+        self.pinned = pinned
+        self.last_used = time.monotonic()
+
+
+def _format_key(key: Hashable) -> str:
+    return "/".join(map(str, key)) if isinstance(key, tuple) else str(key)
+
+
+class ModelManager:
+    """
+    Loads, caches, and unloads models.
+
+    The cache limits are read from the settings on every load: at most
+    `model_cache_size` models, taking at most `model_cache_max_mb` of estimated
+    memory (0 disables the memory limit).
+    """
+
+    def __init__(self) -> None:
+        """Initializes the manager with no loaded models."""
+        self._models: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._loads: dict[Hashable, asyncio.Task] = {}
+        self._stats: dict[Hashable, _LoadStats] = {}
+        # Loads that finish after `clear()` must not repopulate the cache.
+        self._generation = 0
+
+    def _stat(self, key: Hashable) -> _LoadStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = _LoadStats()
+            self._stats[key] = stats
+        return stats
+
+    @property
+    def total_bytes(self) -> int:
+        """The estimated memory taken by the loaded models."""
+        return sum(entry.size_bytes for entry in self._models.values())
+
+    async def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[T]],
+        estimate_bytes: Callable[[T], int] = lambda _: 0,
+        pinned: bool = False,
+    ) -> T:
+        """
+        Returns the model for a key, loading it with `loader` if needed.
+
+        If the model is already being loaded, waits for that load instead of
+        starting another one. A caller that is cancelled while waiting does not
+        cancel the load for the other callers.
+
+        Args:
+            key: The key of the model, such as `("ocr", ocr_model)`.
+            loader: A function that loads the model.
+            estimate_bytes: A function that estimates the memory taken by a
+                loaded model.
+            pinned: Whether the model is exempt from eviction and idle unloading.
+
+        Returns:
+            The loaded model.
+        """
+        self.unload_idle()
+        entry = self._models.get(key)
+        if entry is not None:
+            self._models.move_to_end(key)
+            entry.last_used = time.monotonic()
+            self._stat(key).hits += 1
+            # The model of a key is always the one its loader returned.
+            return cast(T, entry.model)
+
+        task = self._loads.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._load(key, loader, estimate_bytes, pinned, self._generation)
+            )
+            # The failure of a load that nobody waits for anymore is logged by
+            # `_load` and must not be reported again as an unretrieved exception.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._loads[key] = task
+        else:
+            self._stat(key).shared_loads += 1
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[T]],
+        estimate_bytes: Callable[[T], int],
+        pinned: bool,
+        generation: int,
+    ) -> T:
+        """Runs a load and stores the model in the cache."""
+        stats = self._stat(key)
+        started = time.perf_counter()
+        try:
+            model = await loader()
+        except Exception:
+            stats.failures += 1
+            _logger.exception(f"Failed to load model '{_format_key(key)}'.")
+            raise
+        finally:
+            if self._loads.get(key) is asyncio.current_task():
+                del self._loads[key]
+
+        duration_s = time.perf_counter() - started
+        stats.loads += 1
+        stats.total_load_s += duration_s
+        stats.last_load_s = duration_s
+        size_bytes = estimate_bytes(model)
+        _logger.info(
+            f"Loaded model '{_format_key(key)}' in {duration_s:.2f}s "
+            f"(~{size_bytes / 2**20:.0f} MB)."
+        )
+
+        if generation == self._generation:
+            self._models[key] = _Entry(model, size_bytes, pinned)
+            self._evict(keep=key)
+        return model
+
+    def _over_limits(self) -> bool:
+        max_bytes = settings.model_cache_max_mb * 2**20
+        return len(self._models) > max(settings.model_cache_size, 1) or (
+            max_bytes > 0 and self.total_bytes > max_bytes
+        )
+
+    def _evict(self, keep: Hashable) -> None:
+        """Unloads the least recently used models until the cache is within its limits."""
+        candidates = [key for key, entry in self._models.items() if not entry.pinned]
+        for key in candidates:
+            if not self._over_limits():
+                return
+            if key != keep:
+                self._unload(key, "cache is full")
+        if self._over_limits():
+            _logger.warning(
+                f"The loaded models (~{self.total_bytes / 2**20:.0f} MB in "
+                f"{len(self._models)} model(s)) exceed the model cache limits, but the "
+                "remaining models are pinned or have just been loaded."
+            )
+
+    def _unload(self, key: Hashable, reason: str) -> None:
+        del self._models[key]
+        self._stat(key).evictions += 1
+        _logger.info(f"Unloaded model '{_format_key(key)}' ({reason}).")
+
+    def unload_idle(self) -> None:
+        """Unloads the models that have been idle for longer than `model_idle_ttl_s`."""
+        if settings.model_idle_ttl_s <= 0:
+            return
+        now = time.monotonic()
+        idle = [
+            key
+            for key, entry in self._models.items()
+            if not entry.pinned and now - entry.last_used > settings.model_idle_ttl_s
+        ]
+        for key in idle:
+            self._unload(key, "idle")
+
+    async def run_idle_unloader(self) -> None:
+        """Unloads idle models periodically, for servers that are idle themselves."""
+        while settings.model_idle_ttl_s > 0:
+            await asyncio.sleep(max(settings.model_idle_ttl_s / 2, 1.0))
+            self.unload_idle()
+
+    def clear(self) -> None:
+        """Unloads all models."""
+        self._models.clear()
+        self._loads.clear()
+        self._generation += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the loaded models and the per-model load statistics."""
+        now = time.monotonic()
+        return {
+            "loaded": [_format_key(key) for key in self._models],
+            "loading": [_format_key(key) for key in self._loads],
+            "estimated_bytes": self.total_bytes,
+            "models": {
+                _format_key(key): {
+                    **stats.to_dict(),
+                    **(
+                        {
+                            "estimated_bytes": self._models[key].size_bytes,
+                            "pinned": self._models[key].pinned,
+                            "idle_s": now - self._models[key].last_used,
+                        }
+                        if key in self._models
+                        else {}
+                    ),
+                }
+                for key, stats in self._stats.items()
+            },
+        }
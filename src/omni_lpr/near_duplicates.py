@@ -0,0 +1,157 @@
+"""
+Detection of near-duplicate frames.
+
+Cameras watching a static scene, such as a parking spot, send nearly the same
+frame over and over, which the result cache does not match because the pixels
+differ slightly (sensor noise, JPEG artifacts, a clock overlay). With
+`near_duplicate_detection` enabled, each frame gets a 64-bit perceptual hash:
+the signs of the lowest frequencies of the DCT of a 32x32 grayscale thumbnail,
+relative to their median. Frames that look alike have hashes that differ in few
+bits, whatever their noise.
+
+A frame whose hash is within `near_duplicate_max_distance` bits of one of the
+last `near_duplicate_window` frames of the same source, processed by the same
+models, is answered with the results of that frame without running inference.
+Results are reused for at most `near_duplicate_max_age_s`, so that a static
+scene is still re-run from time to time.
+"""
+
+import json
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Hashable, NamedTuple, Optional, TypeVar, cast
+
+import anyio
+import cv2
+import numpy as np
+
+from .context import request_context
+from .settings import settings
+
+T = TypeVar("T")
+
+_THUMBNAIL_SIZE = 32
+_HASH_SIZE = 8
+# The number of sources whose recent frames are kept.
+_MAX_SOURCES = 1024
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Returns the orthonormal DCT-II matrix of the given size."""
+    k = np.arange(size)[:, np.newaxis]
+    n = np.arange(size)[np.newaxis, :]
+    matrix: np.ndarray = np.sqrt(2 / size) * np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    matrix[0] /= np.sqrt(2)
+    return matrix.astype(np.float32)
+
+
+# The rows of the lowest frequencies, so that only the 8x8 low-frequency block is computed.
+_DCT_LOW = _dct_matrix(_THUMBNAIL_SIZE)[:_HASH_SIZE]
+
+
+def perceptual_hash(frame: np.ndarray) -> int:
+    """Returns the 64-bit perceptual hash of a BGR or grayscale image."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    thumbnail = cv2.resize(
+        gray, (_THUMBNAIL_SIZE, _THUMBNAIL_SIZE), interpolation=cv2.INTER_AREA
+    ).astype(np.float32)
+    low = (_DCT_LOW @ thumbnail @ _DCT_LOW.T).ravel()
+    # The DC term only reflects the overall brightness, so it is left out of the median.
+    bits = low > np.median(low[1:])
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distances(hashes: np.ndarray, frame_hash: int) -> np.ndarray:
+    """Returns the number of bits in which each of several hashes differs from a hash."""
+    differences = np.bitwise_xor(hashes, np.uint64(frame_hash))
+    bits = np.unpackbits(differences.view(np.uint8)).reshape(len(hashes), 64)
+    distances: np.ndarray = bits.sum(axis=1)
+    return distances
+
+
+class _Frame(NamedTuple):
+    hash: int
+    time: float
+    results: str
+
+
+class NearDuplicateIndex:
+    """Recent frames of each source, matched against new frames by perceptual hash."""
+
+    def __init__(self) -> None:
+        """Initializes an empty index."""
+        self._frames: OrderedDict[Hashable, deque[_Frame]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether near-duplicate detection is enabled."""
+        return settings.near_duplicate_detection
+
+    def lookup(self, key: Hashable, frame_hash: int) -> Optional[object]:
+        """Returns the results of the closest recent frame of a key within the distance, or None."""
+        frames = self._frames.get(key)
+        if not frames:
+            return None
+        oldest = time.monotonic() - settings.near_duplicate_max_age_s
+        while frames and frames[0].time < oldest:
+            frames.popleft()
+        if not frames:
+            return None
+        hashes = np.fromiter((frame.hash for frame in frames), dtype=np.uint64, count=len(frames))
+        distances = hamming_distances(hashes, frame_hash)
+        closest = int(np.argmin(distances))
+        if distances[closest] > settings.near_duplicate_max_distance:
+            return None
+        results: object = json.loads(frames[closest].results)
+        return results
+
+    def add(self, key: Hashable, frame_hash: int, results: object) -> None:
+        """Records a frame of a key and its results."""
+        frames = self._frames.get(key)
+        if frames is None or frames.maxlen != settings.near_duplicate_window:
+            frames = deque(frames or (), maxlen=max(settings.near_duplicate_window, 1))
+            self._frames[key] = frames
+        self._frames.move_to_end(key)
+        frames.append(_Frame(frame_hash, time.monotonic(), json.dumps(results)))
+        while len(self._frames) > _MAX_SOURCES:
+            self._frames.popitem(last=False)
+
+    async def run(self, key: Hashable, frame: np.ndarray, run: Callable[[], Awaitable[T]]) -> T:
+        """
+        Returns the results of a frame, reusing those of a recent near-duplicate frame.
+
+        Args:
+            key: The source of the frame and what its results depend on, such as
+                the models that process it.
+            frame: The decoded frame.
+            run: A function that runs the frame and returns its results.
+        """
+        if not self.enabled or request_context.get().bypass_cache:
+            return await run()
+        # Converting and resizing a large frame takes tens of milliseconds.
+        frame_hash = await anyio.to_thread.run_sync(perceptual_hash, frame)
+        results = self.lookup(key, frame_hash)
+        if results is not None:
+            self.hits += 1
+            # The results of a key were recorded from the same kind of run.
+            return cast(T, results)
+        self.misses += 1
+        frame_results = await run()
+        self.add(key, frame_hash, frame_results)
+        return frame_results
+
+    def clear(self) -> None:
+        """Drops all recent frames."""
+        self._frames.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the number of tracked sources and the hit counts."""
+        lookups = self.hits + self.misses
+        return {
+            "sources": len(self._frames),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
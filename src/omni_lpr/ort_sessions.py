@@ -0,0 +1,206 @@
+"""
+ONNX Runtime session configuration.
+
+This module turns the `ort_*` settings into `onnxruntime.SessionOptions` and
+manages an on-disk cache of optimized model files. With the cache enabled, the
+first session created for a model saves the graph that ONNX Runtime produced
+after its graph optimizations, and later sessions (including those of other
+processes and later restarts) load that file with graph optimization disabled.
+
+It also makes inference runs terminable: the sessions of the models are wrapped
+so that their runs use the `onnxruntime.RunOptions` of the current inference
+call, which are flagged for termination when the call is cancelled.
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Protocol, TypeVar, cast
+
+import anyio
+import onnxruntime as ort
+
+from .settings import settings
+
+_logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# A session holds the weights of its model, and ONNX Runtime's memory arena and
+# prepacked weights take about as much again.
+_SESSION_MEMORY_FACTOR = 2
+
+# The run options of the inference call that runs in the current thread.
+_run_options: ContextVar[Optional[ort.RunOptions]] = ContextVar("run_options", default=None)
+
+_EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+_GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+def execution_providers() -> Optional[list[str]]:
+    """Returns the ONNX Runtime providers for the configured execution device."""
+    if settings.execution_device == "cuda":
+        return ["CUDAExecutionProvider", "CPUExecutionProvider"]
+    if settings.execution_device == "openvino":
+        return ["OpenVINOExecutionProvider", "CPUExecutionProvider"]
+    if settings.execution_device == "cpu":
+        return ["CPUExecutionProvider"]
+    # 'auto' lets the libraries pick from the available providers.
+    return None
+
+
+def build_session_options() -> ort.SessionOptions:
+    """Creates session options from the ONNX Runtime settings."""
+    sess_options = ort.SessionOptions()
+    # A thread count of 0 keeps ONNX Runtime's default (one thread per core).
+    sess_options.intra_op_num_threads = settings.ort_intra_op_threads
+    sess_options.inter_op_num_threads = settings.ort_inter_op_threads
+    sess_options.execution_mode = _EXECUTION_MODES[settings.ort_execution_mode]
+    sess_options.graph_optimization_level = _GRAPH_OPTIMIZATION_LEVELS[
+        settings.ort_graph_optimization_level
+    ]
+    return sess_options
+
+
+def _optimized_model_file(model_name: str, cache_dir: str) -> Path:
+    """
+    Returns the cache file of an optimized model in a cache directory.
+
+    Optimized graphs can contain operators that are specific to the execution
+    provider and the ONNX Runtime version, so both are part of the file name.
+    """
+    name = (
+        f"{model_name}.{settings.ort_graph_optimization_level}."
+        f"{settings.execution_device}.ort-{ort.__version__}.onnx"
+    )
+    return Path(cache_dir).expanduser() / name
+
+
+@contextmanager
+def session_source(model_name: str, model_path: Path) -> Iterator[tuple[Path, ort.SessionOptions]]:
+    """
+    Chooses the model file and session options for creating a session.
+
+    Yields the cached optimized model, if there is one, and otherwise the
+    original model together with options that make ONNX Runtime save the
+    optimized graph. The saved graph is moved into the cache once the session
+    has been created inside the `with` block.
+
+    Args:
+        model_name: The name of the model, used as the cache key.
+        model_path: The path to the original model file.
+    """
+    sess_options = build_session_options()
+    if settings.ort_optimized_model_dir is None:
+        yield model_path, sess_options
+        return
+
+    cached_path = _optimized_model_file(model_name, settings.ort_optimized_model_dir)
+    if cached_path.is_file():
+        _logger.info(f"Loading optimized model from cache: {cached_path}")
+        sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        yield cached_path, sess_options
+        return
+
+    cached_path.parent.mkdir(parents=True, exist_ok=True)
+    # Several processes may optimize the same model at once, so each writes to
+    # its own file and the last rename wins.
+    tmp_path = cached_path.with_name(f"{cached_path.name}.{os.getpid()}.{threading.get_ident()}")
+    sess_options.optimized_model_filepath = str(tmp_path)
+    try:
+        yield model_path, sess_options
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if tmp_path.is_file():
+        os.replace(tmp_path, cached_path)
+        _logger.info(f"Saved optimized model to cache: {cached_path}")
+
+
+class TerminableSession:
+    """
+    Wraps an `onnxruntime.InferenceSession` so that its runs can be terminated.
+
+    Runs without explicit run options use the run options of the current
+    inference call (see `run_terminable`).
+    """
+
+    def __init__(self, session: ort.InferenceSession) -> None:
+        self._session = session
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._session, name)
+
+    def run(
+        self,
+        output_names: Optional[list[str]],
+        input_feed: dict[str, Any],
+        run_options: Optional[ort.RunOptions] = None,
+    ) -> list[Any]:
+        outputs: list[Any] = self._session.run(
+            output_names, input_feed, run_options or _run_options.get()
+        )
+        return outputs
+
+
+class _SessionOwner(Protocol):
+    model: Any
+
+
+def make_terminable(owner: object) -> None:
+    """Wraps the session held in the `model` attribute of `owner` with `TerminableSession`."""
+    session = getattr(owner, "model", None)
+    if isinstance(session, ort.InferenceSession):
+        cast(_SessionOwner, owner).model = TerminableSession(session)
+
+
+async def run_terminable(func: Callable[..., T], *args: object) -> T:
+    """
+    Runs a blocking inference function in a worker thread.
+
+    If the caller is cancelled, for example because its deadline passed, it
+    stops waiting for the thread right away, and the ONNX Runtime runs of the
+    function (those of sessions wrapped with `make_terminable`) are terminated.
+    """
+    run_options = ort.RunOptions()
+
+    def target() -> T:
+        token = _run_options.set(run_options)
+        try:
+            return func(*args)
+        finally:
+            _run_options.reset(token)
+
+    try:
+        return await anyio.to_thread.run_sync(target, abandon_on_cancel=True)
+    except anyio.get_cancelled_exc_class():
+        run_options.terminate = True
+        raise
+
+
+def estimate_session_bytes(session: object) -> int:
+    """Estimates the memory taken by an ONNX Runtime session from the size of its model."""
+    if isinstance(session, TerminableSession):
+        session = session._session
+    if not isinstance(session, ort.InferenceSession):
+        return 0
+    if session._model_path:
+        try:
+            model_bytes = os.path.getsize(session._model_path)
+        except OSError:
+            model_bytes = 0
+    else:
+        model_bytes = len(session._model_bytes or b"")
+    return model_bytes * _SESSION_MEMORY_FACTOR
@@ -0,0 +1,90 @@
+"""
+Reduced-precision variants of the detector and OCR models.
+
+The models are published as fp32 ONNX files. The int8 variant of a model is
+produced locally from its fp32 file with ONNX Runtime's dynamic quantization,
+which stores the weights as 8-bit integers and quantizes the activations at run
+time. On CPUs this typically makes inference faster at a small cost in accuracy.
+The quantized files are cached in `quantized_model_dir`, so a model is only
+quantized the first time its int8 variant is loaded.
+
+Quantizing needs the `onnx` package, which is installed with the
+`quantization` extra (`pip install omni-lpr[quantization]`).
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Literal
+
+import onnxruntime as ort
+
+from .settings import settings
+
+_logger = logging.getLogger(__name__)
+
+ModelPrecision = Literal["fp32", "int8"]
+MODEL_PRECISIONS: tuple[ModelPrecision, ...] = ("fp32", "int8")
+
+# Serializes the quantization of models in this process, which is memory-heavy.
+_quantize_lock = threading.Lock()
+
+
+def variant_name(model_name: str, precision: ModelPrecision) -> str:
+    """Returns the name of a model variant, such as `cct-xs-v1-global-model-int8`."""
+    return model_name if precision == "fp32" else f"{model_name}-{precision}"
+
+
+def _quantized_model_file(model_name: str, precision: ModelPrecision) -> Path:
+    """
+    Returns the cache file of a quantized model.
+
+    The quantized graph depends on the quantization tool, so the ONNX Runtime
+    version is part of the file name.
+    """
+    name = f"{variant_name(model_name, precision)}.ort-{ort.__version__}.onnx"
+    return Path(settings.quantized_model_dir).expanduser() / name
+
+
+def model_file(model_name: str, model_path: Path, precision: ModelPrecision) -> Path:
+    """
+    Returns the model file of a model variant, quantizing the model if needed.
+
+    Args:
+        model_name: The name of the model, used as the cache key.
+        model_path: The path to the fp32 model file.
+        precision: The precision of the variant.
+
+    Raises:
+        RuntimeError: If the model must be quantized but the `onnx` package is
+            not installed.
+    """
+    if precision == "fp32":
+        return model_path
+
+    cached_path = _quantized_model_file(model_name, precision)
+    with _quantize_lock:
+        if cached_path.is_file():
+            return cached_path
+
+        try:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+        except ImportError as e:
+            raise RuntimeError(
+                f"Producing the {precision} variant of model '{model_name}' requires the "
+                "'onnx' package. Install it with: pip install omni-lpr[quantization]"
+            ) from e
+
+        _logger.info(f"Quantizing model '{model_name}' to {precision}.")
+        cached_path.parent.mkdir(parents=True, exist_ok=True)
+        # Several processes may quantize the same model at once, so each writes
+        # to its own file and the last rename wins.
+        tmp_path = cached_path.with_name(f"{cached_path.name}.{os.getpid()}")
+        try:
+            quantize_dynamic(model_path, tmp_path, weight_type=QuantType.QInt8)
+            os.replace(tmp_path, cached_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        _logger.info(f"Saved quantized model to cache: {cached_path}")
+        return cached_path
@@ -1,25 +1,40 @@
-import base64
 import json
 import logging
+import sys
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
+import anyio
 from pydantic import BaseModel, ValidationError
 from spectree import Response, SpecTree
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 from starlette.routing import Route
 
+from .admission import OverloadedError
 from .api_models import (
     ErrorResponse,
     JsonContentBlock,
     ToolListResponse,
     ToolResponse,
 )
+from .context import RequestContext, request_context
+from .deadlines import DeadlineExceededError, enforce_deadline
 from .settings import settings
-from .tools import tool_registry
+from .tools import RawImage, tool_registry
+
+if sys.version_info < (3, 11):
+    from exceptiongroup import BaseExceptionGroup
 
 # Initialize logger
 _logger = logging.getLogger(__name__)
 
+# Content types of request bodies that are the image itself.
+RAW_IMAGE_CONTENT_TYPES = ("image/jpeg", "image/png", "application/octet-stream")
+# With a raw image body, tool parameters can also be sent as headers with this
+# prefix, such as `X-Tool-Ocr-Model`.
+TOOL_PARAM_HEADER_PREFIX = "x-tool-"
+
 # Initialize Spectree for API documentation generation
 api_spec = SpecTree(
     "starlette",
@@ -46,7 +61,7 @@ async def list_tools(request: Request) -> JSONResponse:
     return JSONResponse(response_data.model_dump())
 
 
-async def _parse_tool_arguments(request: Request, model: BaseModel) -> BaseModel:
+async def _parse_tool_arguments(request: Request, model: type[BaseModel]) -> BaseModel:
     """
     Parses and validates tool arguments from an incoming request.
     """
@@ -65,26 +80,110 @@ async def _parse_tool_arguments(request: Request, model: BaseModel) -> BaseModel
         if not image_upload:
             raise ValueError("Missing 'image' part in multipart form.")
 
-        image_bytes = await image_upload.read()
-        image_base64 = base64.b64encode(image_bytes).decode("utf-8")
+        # The upload goes to the image decoder as is, without a Base64 round-trip.
+        if isinstance(image_upload, str):
+            raise ValueError("The 'image' part of the multipart form must be a file.")
+        params: dict[str, object] = {k: v for k, v in form.items() if k != "image"}
+        params["image_base64"] = RawImage(await image_upload.read())
+        return model(**params)
 
-        params = {k: v for k, v in form.items() if k != "image"}
-        params["image_base64"] = image_base64
+    if content_type.split(";")[0].strip().lower() in RAW_IMAGE_CONTENT_TYPES:
+        _logger.debug(f"Processing raw '{content_type}' request.")
+        if "image_base64" not in model.model_fields:
+            raise ValueError("This tool does not take image data. Use application/json.")
+        params = _raw_body_params(request)
+        params["image_base64"] = RawImage(await _read_raw_image(request))
         return model(**params)
 
     if model.model_fields:
         _logger.warning(f"Unsupported Content-Type: {content_type}")
-        raise ValueError("Unsupported Content-Type. Use application/json or multipart/form-data.")
+        raise ValueError(
+            "Unsupported Content-Type. Use application/json, multipart/form-data, or "
+            f"a raw image body ({', '.join(RAW_IMAGE_CONTENT_TYPES)})."
+        )
     else:
         return model()
 
 
+def _raw_body_params(request: Request) -> dict[str, object]:
+    """
+    Returns the tool parameters of a request with a raw image body.
+
+    The parameters are read from the `X-Tool-*` headers, with dashes standing for
+    underscores, and from the query parameters, which take precedence.
+    """
+    params: dict[str, object] = {
+        key[len(TOOL_PARAM_HEADER_PREFIX) :].replace("-", "_"): value
+        for key, value in request.headers.items()
+        if key.startswith(TOOL_PARAM_HEADER_PREFIX)
+    }
+    params.update(request.query_params)
+    return params
+
+
+async def _read_raw_image(request: Request) -> bytes:
+    """
+    Reads a raw image body as it arrives, stopping as soon as it exceeds the
+    maximum image size instead of buffering the rest.
+    """
+    max_bytes = settings.max_image_size_mb * 1024 * 1024
+    too_large = ValueError(
+        f"Input image is too large. The maximum size is {settings.max_image_size_mb}MB."
+    )
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@asynccontextmanager
+async def _cancel_on_disconnect(request: Request) -> AsyncIterator[anyio.CancelScope]:
+    """
+    Cancels the `async with` block when the client disconnects.
+
+    The request body must have been read before entering the block. Yields the
+    cancel scope, whose `cancel_called` tells whether the block was cancelled.
+    Errors raised in the block propagate as they are, not in an exception group.
+    """
+
+    async def watch(scope: anyio.CancelScope) -> None:
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+        _logger.info("Client disconnected; cancelling its tool call.")
+        scope.cancel()
+
+    error = None
+    try:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(watch, tg.cancel_scope)
+            try:
+                yield tg.cancel_scope
+            finally:
+                tg.cancel_scope.cancel()
+    except BaseExceptionGroup as group:
+        # The task group wraps the error of the block, the only task that can fail.
+        if len(group.exceptions) != 1:
+            raise
+        error = group.exceptions[0]
+    if error is not None:
+        raise error
+
+
 @api_spec.validate(
     resp=Response(
         HTTP_200=ToolResponse,
         HTTP_400=ErrorResponse,
         HTTP_404=ErrorResponse,
+        HTTP_429=ErrorResponse,
         HTTP_500=ErrorResponse,
+        HTTP_504=ErrorResponse,
     ),
     tags=["Tool Invocation"],
 )
@@ -103,15 +202,39 @@ async def invoke_tool(request: Request) -> JSONResponse:
 
     input_model = tool_registry._tool_models.get(tool_name, BaseModel)
 
+    token = None
     try:
-        validated_args = await _parse_tool_arguments(request, input_model)
-        mcp_content_blocks = await tool_registry.call_validated(tool_name, validated_args)
+        client_host = request.client.host if request.client else "anonymous"
+        token = request_context.set(RequestContext.from_headers(request.headers, client_host))
+        # Admission comes first, so that rejected requests are not even read.
+        async with (
+            enforce_deadline(f"tool '{tool_name}'"),
+            tool_registry.admission.admit(tool_name),
+        ):
+            validated_args = await _parse_tool_arguments(request, input_model)
+            mcp_content_blocks = None
+            async with _cancel_on_disconnect(request):
+                mcp_content_blocks = await tool_registry.call_validated(tool_name, validated_args)
+        if mcp_content_blocks is None:
+            # Nobody is left to read this response.
+            error = ErrorResponse(
+                error={"code": "CLIENT_CLOSED_REQUEST", "message": "The client disconnected."}
+            )
+            return JSONResponse(error.model_dump(), status_code=499)
         api_content_blocks = [
             JsonContentBlock(data=json.loads(block.text)) for block in mcp_content_blocks
         ]
         response_data = ToolResponse(content=api_content_blocks)
         return JSONResponse(response_data.model_dump())
 
+    except OverloadedError as e:
+        error = ErrorResponse(error={"code": e.error.code.value, "message": e.error.message})
+        return JSONResponse(
+            error.model_dump(), status_code=429, headers={"Retry-After": str(e.retry_after)}
+        )
+    except DeadlineExceededError as e:
+        error = ErrorResponse(error={"code": e.error.code.value, "message": e.error.message})
+        return JSONResponse(error.model_dump(), status_code=504)
     except ValidationError as e:
         error = ErrorResponse(
             error={
@@ -130,6 +253,9 @@ async def invoke_tool(request: Request) -> JSONResponse:
             error={"code": "INTERNAL_SERVER_ERROR", "message": "An internal server error occurred."}
         )
         return JSONResponse(error.model_dump(), status_code=500)
+    finally:
+        if token is not None:
+            request_context.reset(token)
 
 
 def setup_rest_routes() -> list[Route]:
@@ -0,0 +1,423 @@
+"""
+Cache of inference results.
+
+Clients that retry a request send the same image again, and running it through
+the models again would give the same results. The result cache keeps the
+results of recently processed images, keyed by a hash of the decoded image and
+by the models that processed it, so that a repeated image is answered without
+running inference. Hashing the decoded pixels, rather than the file, also
+matches an image that was fetched again or re-encoded without changes.
+
+The cache is bounded by its number of entries (`result_cache_size`) and by the
+size of the cached results (`result_cache_max_mb`), evicts the least recently
+used results first, and drops results older than `result_cache_ttl_s`, if set.
+A call can bypass the cache with the `bypass_cache` tool argument or a
+`Cache-Control: no-cache` request header; its results are then neither read
+from nor stored in the cache.
+
+The results are held in the memory of the worker by default. With
+`result_cache_backend` set to "sqlite", they are stored in a SQLite database at
+`result_cache_path` instead, which all workers of a host share, so that a retry
+routed to another worker is still a hit, and which is kept across restarts.
+Since results can then outlive the process that computed them, every key also
+covers the versions of the server and of the inference packages, and the
+cascade settings, so that an upgrade or a configuration change does not serve
+stale results.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Sequence, TypeVar
+
+import anyio
+import numpy as np
+
+from .context import request_context
+from .settings import settings
+
+_logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Images up to this size are hashed on the event loop, which takes less time
+# than handing them to a worker thread. Larger ones, such as full camera frames
+# that take tens of milliseconds to hash, are hashed in a worker thread.
+_INLINE_HASH_BYTES = 256 * 1024
+# The packages that provide the models and run them.
+_INFERENCE_PACKAGES = ("fast-alpr", "fast-plate-ocr", "open-image-models", "onnxruntime")
+
+
+@functools.cache
+def _package_versions() -> tuple[str, ...]:
+    """Returns the installed versions of the inference packages."""
+    versions = []
+    for package in _INFERENCE_PACKAGES:
+        try:
+            versions.append(f"{package}={version(package)}")
+        except PackageNotFoundError:
+            versions.append(f"{package}=none")
+    return tuple(versions)
+
+
+def results_fingerprint() -> str:
+    """Returns a hash of the versions and settings that the results of any image depend on."""
+    parts = (
+        settings.pkg_version,
+        *_package_versions(),
+        settings.cascade_policy,
+        settings.cascade_min_confidence,
+    )
+    return hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=8).hexdigest()
+
+
+def image_digest(frame: np.ndarray) -> bytes:
+    """Returns a fast hash of a decoded image, covering its shape and its pixels."""
+    digest = hashlib.blake2b(str(frame.shape).encode(), digest_size=16)
+    digest.update(np.ascontiguousarray(frame).data)
+    return digest.digest()
+
+
+async def image_digests(frames: Sequence[np.ndarray]) -> list[bytes]:
+    """Returns the hashes of several decoded images, off the event loop if they are large."""
+    if sum(np.asarray(frame).nbytes for frame in frames) <= _INLINE_HASH_BYTES:
+        return [image_digest(frame) for frame in frames]
+    return await anyio.to_thread.run_sync(lambda: [image_digest(frame) for frame in frames])
+
+
+def _expiry(now: float) -> Optional[float]:
+    return now + settings.result_cache_ttl_s if settings.result_cache_ttl_s > 0 else None
+
+
+class MemoryResultStore:
+    """Keeps cached results in an LRU dictionary in the memory of the worker."""
+
+    # Whether the methods of the store block, and must run in a worker thread.
+    blocking = False
+
+    def __init__(self) -> None:
+        self._results: OrderedDict[str, tuple[str, Optional[float]]] = OrderedDict()
+        self._bytes = 0
+
+    def get_many(self, keys: Sequence[str]) -> list[Optional[str]]:
+        """Returns the cached results of each key, or None for those that are not cached."""
+        now = time.time()
+        values: list[Optional[str]] = []
+        for key in keys:
+            entry = self._results.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= now:
+                self._pop(key)
+                entry = None
+            if entry is not None:
+                self._results.move_to_end(key)
+            values.append(entry[0] if entry is not None else None)
+        return values
+
+    def put_many(self, items: Sequence[tuple[str, str]]) -> None:
+        """Caches the results of each key, evicting the least recently used results if needed."""
+        expires = _expiry(time.time())
+        for key, value in items:
+            self._pop(key)
+            self._results[key] = (value, expires)
+            self._bytes += len(value)
+        max_bytes = settings.result_cache_max_mb * 2**20
+        while len(self._results) > settings.result_cache_size or self._bytes > max_bytes:
+            _, (evicted, _) = self._results.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def _pop(self, key: str) -> None:
+        previous = self._results.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous[0])
+
+    def size(self) -> tuple[int, int]:
+        """Returns the number of cached results and their size in bytes."""
+        return len(self._results), self._bytes
+
+    def refresh_size(self) -> tuple[int, int]:
+        """Returns the number of cached results and their size in bytes, which are current."""
+        return self.size()
+
+    def clear(self) -> None:
+        """Drops all cached results."""
+        self._results.clear()
+        self._bytes = 0
+
+    def close(self) -> None:
+        """Does nothing; the results are lost with the worker."""
+
+
+class SqliteResultStore:
+    """Keeps cached results in a SQLite database that the workers of a host share."""
+
+    blocking = True
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path).expanduser()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        # The size of the database as of the last time this worker wrote to it.
+        self._size = (0, 0)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection must not be used across a fork, so each worker opens its own.
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            # With write-ahead logging, workers read while another one writes.
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, "
+                    "value TEXT NOT NULL, size INTEGER NOT NULL, expires REAL, "
+                    "accessed REAL NOT NULL)"
+                )
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+                )
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS results_expires ON results (expires)"
+                )
+            self._connection = connection
+            self._pid = os.getpid()
+            _logger.info(f"Opened the result cache database at {self.path}.")
+        return self._connection
+
+    def get_many(self, keys: Sequence[str]) -> list[Optional[str]]:
+        """Returns the cached results of each key, or None for those that are not cached."""
+        now = time.time()
+        placeholders = ", ".join("?" * len(keys))
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                rows = dict(
+                    connection.execute(
+                        f"SELECT key, value FROM results WHERE key IN ({placeholders}) "
+                        "AND (expires IS NULL OR expires > ?)",
+                        (*keys, now),
+                    )
+                )
+                if rows:
+                    connection.executemany(
+                        "UPDATE results SET accessed = ? WHERE key = ?",
+                        [(now, key) for key in rows],
+                    )
+        return [rows.get(key) for key in keys]
+
+    def put_many(self, items: Sequence[tuple[str, str]]) -> None:
+        """Caches the results of each key, evicting the least recently used results if needed."""
+        now = time.time()
+        expires = _expiry(now)
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                    [(key, value, len(value), expires, now) for key, value in items],
+                )
+                self._size = self._evict(connection, now)
+
+    @staticmethod
+    def _count(connection: sqlite3.Connection) -> tuple[int, int]:
+        count, total = connection.execute("SELECT COUNT(*), TOTAL(size) FROM results").fetchone()
+        return count, int(total)
+
+    @classmethod
+    def _evict(cls, connection: sqlite3.Connection, now: float) -> tuple[int, int]:
+        """
+        Deletes the expired results, and the least recently used ones beyond the limits.
+
+        Returns the number of results left and their size in bytes.
+        """
+        connection.execute("DELETE FROM results WHERE expires <= ?", (now,))
+        max_bytes = settings.result_cache_max_mb * 2**20
+        count, total = cls._count(connection)
+        if count <= settings.result_cache_size and total <= max_bytes:
+            return count, total
+        connection.execute(
+            "DELETE FROM results WHERE key IN (SELECT key FROM (SELECT key, "
+            "ROW_NUMBER() OVER recent AS n, SUM(size) OVER recent AS total FROM results "
+            "WINDOW recent AS (ORDER BY accessed DESC, rowid DESC)) WHERE n > ? OR total > ?)",
+            (settings.result_cache_size, max_bytes),
+        )
+        return cls._count(connection)
+
+    def size(self) -> tuple[int, int]:
+        """
+        Returns the number of cached results and their size in bytes.
+
+        The database is not queried, so the size is as of the last time this worker
+        wrote to it or refreshed it, and does not reflect the writes of other workers.
+        """
+        return self._size
+
+    def refresh_size(self) -> tuple[int, int]:
+        """Returns the number of cached results and their size in bytes, read from the database."""
+        with self._lock:
+            self._size = self._count(self._connect())
+        return self._size
+
+    def clear(self) -> None:
+        """Drops all cached results, also those of the other workers."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM results")
+            self._size = (0, 0)
+
+    def close(self) -> None:
+        """Closes the database connection of this worker; the results are kept."""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+class ResultCache:
+    """A cache of inference results, bounded by entry count and bytes."""
+
+    def __init__(self) -> None:
+        """Initializes the cache; its store is created from the settings on first use."""
+        self._store: Optional[MemoryResultStore | SqliteResultStore] = None
+        self._store_config: Optional[tuple[str, str]] = None
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache is enabled, which it is with a positive `result_cache_size`."""
+        return settings.result_cache_size > 0
+
+    def _get_store(self) -> MemoryResultStore | SqliteResultStore:
+        config = (settings.result_cache_backend, settings.result_cache_path)
+        if self._store is None or self._store_config != config:
+            if self._store is not None:
+                self._store.close()
+            if settings.result_cache_backend == "sqlite":
+                self._store = SqliteResultStore(settings.result_cache_path)
+            else:
+                self._store = MemoryResultStore()
+            self._store_config = config
+        return self._store
+
+    async def _call(self, func: Callable[..., T], *args: object) -> T:
+        """Calls a method of the store, in a worker thread if it blocks."""
+        if self._get_store().blocking:
+            return await anyio.to_thread.run_sync(func, *args)
+        return func(*args)
+
+    async def start(self) -> None:
+        """Opens the store, so that a misconfiguration shows at startup."""
+        if self.enabled and settings.result_cache_backend == "sqlite":
+            await anyio.to_thread.run_sync(self._get_store().refresh_size)
+            _logger.info(f"Reusing the result cache at {settings.result_cache_path}.")
+
+    async def aclose(self) -> None:
+        """Closes the store; results in a shared store are kept for the next start."""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    async def get(self, key: str) -> Optional[object]:
+        """Returns the cached results of a key, or None."""
+        (value,) = await self._call(self._get_store().get_many, [key])
+        return json.loads(value) if value is not None else None
+
+    async def put(self, key: str, results: object) -> None:
+        """Caches the results of a key, evicting the least recently used results if needed."""
+        await self._put_many([(key, json.dumps(results))])
+
+    async def _put_many(self, items: list[tuple[str, str]]) -> None:
+        # The results are stored as JSON, which also keeps them from being
+        # modified by the callers they are returned to.
+        max_bytes = settings.result_cache_max_mb * 2**20
+        items = [(key, value) for key, value in items if len(value) <= max_bytes]
+        if items:
+            await self._call(self._get_store().put_many, items)
+
+    async def run(
+        self,
+        frames: Sequence[np.ndarray],
+        key_parts: Sequence[tuple],
+        run: Callable[[list[int]], Awaitable[list[Any]]],
+    ) -> list[Any]:
+        """
+        Returns the results of several images, running only those that are not cached.
+
+        Args:
+            frames: The decoded images.
+            key_parts: What else the results of each image depend on, such as the
+                models that process it. The key of an image is made of these parts,
+                the hash of the image, and the fingerprint of the versions and
+                settings (see `results_fingerprint`).
+            run: A function that runs the images at the given indices and returns
+                their results, in the same order.
+
+        Returns:
+            The results of each image, in the order of `frames`.
+        """
+        if not self.enabled or request_context.get().bypass_cache:
+            if self.enabled:
+                self.bypassed += len(frames)
+            return await run(list(range(len(frames))))
+
+        fingerprint = results_fingerprint()
+        keys = [
+            "|".join([fingerprint, *map(str, parts), digest.hex()])
+            for digest, parts in zip(await image_digests(frames), key_parts, strict=True)
+        ]
+        try:
+            values = await self._call(self._get_store().get_many, keys)
+        except sqlite3.Error:
+            # A failing cache must not fail inference; the images are run instead.
+            _logger.warning("Could not read cached inference results.", exc_info=True)
+            self.errors += 1
+            values = [None] * len(keys)
+
+        outputs: list[Any] = [json.loads(value) if value is not None else None for value in values]
+        missing = [index for index, output in enumerate(outputs) if output is None]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            for index, results in zip(missing, await run(missing), strict=True):
+                outputs[index] = results
+            try:
+                await self._put_many(
+                    [(keys[index], json.dumps(outputs[index])) for index in missing]
+                )
+            except sqlite3.Error:
+                _logger.warning("Could not cache inference results.", exc_info=True)
+                self.errors += 1
+        return outputs
+
+    def clear(self) -> None:
+        """Drops all cached results."""
+        if self._store is not None:
+            self._store.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the cache size and hit counts, without blocking on the store."""
+        lookups = self.hits + self.misses
+        entries, size = self._store.size() if self._store is not None else (0, 0)
+        return {
+            "backend": settings.result_cache_backend,
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "errors": self.errors,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
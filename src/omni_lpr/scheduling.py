@@ -0,0 +1,197 @@
+"""
+Fair-share scheduling of inference work.
+
+A fixed number of inference dispatches run at once. When all of them are
+taken, waiting dispatches are served by strict priority between the priority
+classes (realtime before batch), and by weighted fair queuing between the
+clients of the same class. Fair queuing uses start-time fair queuing tags: each
+dispatch is tagged with a virtual finish time of `start + cost / weight`, where
+`start` is the later of the class's virtual time and the finish tag of the
+client's previous dispatch, and the waiting dispatch with the smallest tag is
+served first. A client that sends a burst of work therefore only gets its
+weighted share of the capacity while others are waiting.
+"""
+
+import heapq
+import itertools
+import logging
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import Any, AsyncIterator, Sequence
+
+import anyio
+
+from .context import PRIORITY_CLASSES, RequestContext, request_context
+from .settings import settings
+
+_logger = logging.getLogger(__name__)
+
+# The number of clients whose finish tags are kept while all of them still delay
+# their clients; the tags closest to the virtual time are dropped first.
+_MAX_FINISH_TAGS = 4096
+
+
+class _Waiter:
+    """A dispatch that waits for a slot."""
+
+    __slots__ = ("abandoned", "event", "granted", "start_tag")
+
+    def __init__(self, start_tag: float) -> None:
+        self.event = anyio.Event()
+        self.start_tag = start_tag
+        self.granted = False
+        self.abandoned = False
+
+
+class FairScheduler:
+    """
+    Grants inference slots by priority class and weighted fair share.
+
+    The number of slots is read from `scheduler_max_concurrency`, where 0
+    disables scheduling. The client weights are read from
+    `scheduler_client_weights`; clients without a weight have a weight of 1.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the scheduler with no running or waiting dispatches."""
+        self._active = 0
+        self._queues: dict[str, list[tuple[float, int, _Waiter]]] = {
+            priority: [] for priority in PRIORITY_CLASSES
+        }
+        self._virtual_time: dict[str, float] = dict.fromkeys(PRIORITY_CLASSES, 0.0)
+        self._finish_tags: dict[tuple[str, str], float] = {}
+        self._prune_at = _MAX_FINISH_TAGS
+        self._sequence = itertools.count()
+        self.granted: dict[str, int] = dict.fromkeys(PRIORITY_CLASSES, 0)
+
+    def _tag(self, priority: str, client_id: str, cost: float) -> tuple[float, float]:
+        """Returns the start and finish tags of a new dispatch and records its finish tag."""
+        weight = settings.scheduler_client_weights.get(client_id, 1.0)
+        start = max(self._virtual_time[priority], self._finish_tags.get((priority, client_id), 0.0))
+        finish = start + cost / weight
+        self._finish_tags[(priority, client_id)] = finish
+        if len(self._finish_tags) > self._prune_at:
+            self._prune_finish_tags()
+        return start, finish
+
+    def _prune_finish_tags(self) -> None:
+        """
+        Drops the finish tags at or below the virtual time of their class.
+
+        Such a tag no longer delays the next dispatch of its client, so dropping it
+        does not change the schedule. The client IDs come from the requests, so the
+        tags are also capped at `_MAX_FINISH_TAGS`.
+        """
+        tags = {
+            key: finish
+            for key, finish in self._finish_tags.items()
+            if finish > self._virtual_time[key[0]]
+        }
+        if len(tags) > _MAX_FINISH_TAGS:
+            tags = dict(heapq.nlargest(_MAX_FINISH_TAGS, tags.items(), key=lambda item: item[1]))
+        self._finish_tags = tags
+        self._prune_at = max(2 * len(tags), _MAX_FINISH_TAGS)
+
+    def _grant_next(self) -> None:
+        """Hands free slots to the waiting dispatches that are next in line."""
+        for priority in PRIORITY_CLASSES:
+            queue = self._queues[priority]
+            while queue and self._active < settings.scheduler_max_concurrency:
+                _, _, waiter = heapq.heappop(queue)
+                if waiter.abandoned:
+                    continue
+                self._virtual_time[priority] = max(self._virtual_time[priority], waiter.start_tag)
+                self._active += 1
+                self.granted[priority] += 1
+                waiter.granted = True
+                waiter.event.set()
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._grant_next()
+        if not self._active and not any(self._queues.values()):
+            # Once idle, no client is behind the others, so the virtual times
+            # catch up with all finish tags, which can then be dropped.
+            for (priority, _), finish in self._finish_tags.items():
+                self._virtual_time[priority] = max(self._virtual_time[priority], finish)
+            self._finish_tags.clear()
+
+    def slot(self, cost: float = 1.0) -> AbstractAsyncContextManager[None]:
+        """
+        Holds an inference slot for the duration of the `async with` block.
+
+        The priority class and client are taken from the current request context.
+
+        Args:
+            cost: The relative amount of work of the dispatch, such as its number
+                of images.
+        """
+        context = request_context.get()
+        return self._hold({(self._priority(context), context.client_id): cost})
+
+    def batch_slot(self, contexts: Sequence[RequestContext]) -> AbstractAsyncContextManager[None]:
+        """
+        Holds an inference slot for a batch of items from several tool calls.
+
+        The batch waits in the highest priority class among its items, and each
+        client is charged, in the class of its calls, for its own items only.
+
+        Args:
+            contexts: The request context of each item of the batch.
+        """
+        charges: dict[tuple[str, str], float] = {}
+        for context in contexts:
+            key = (self._priority(context), context.client_id)
+            charges[key] = charges.get(key, 0.0) + 1.0
+        return self._hold(charges)
+
+    @staticmethod
+    def _priority(context: RequestContext) -> str:
+        """Returns the priority class of a request context."""
+        return context.priority or settings.scheduler_default_priority
+
+    @asynccontextmanager
+    async def _hold(self, charges: dict[tuple[str, str], float]) -> AsyncIterator[None]:
+        """Holds a slot for a dispatch that charges a cost to each (class, client) pair."""
+        if settings.scheduler_max_concurrency <= 0:
+            yield
+            return
+
+        tags = {key: self._tag(*key, cost) for key, cost in charges.items()}
+        priority = min((key[0] for key in tags), key=PRIORITY_CLASSES.index)
+        # The dispatch goes as early as the earliest of its clients in that class.
+        start, finish = min(tag for key, tag in tags.items() if key[0] == priority)
+
+        waiter = _Waiter(start)
+        heapq.heappush(self._queues[priority], (finish, next(self._sequence), waiter))
+        self._grant_next()
+        if not waiter.granted:
+            clients = ", ".join(sorted({client_id for _, client_id in tags}))
+            _logger.debug(f"Dispatch of client(s) '{clients}' queued as {priority}.")
+            try:
+                await waiter.event.wait()
+            except BaseException:
+                # A slot that was granted while the wait was being cancelled is
+                # passed on; otherwise, the waiter is skipped when its turn comes.
+                if waiter.granted:
+                    self._release()
+                else:
+                    waiter.abandoned = True
+                raise
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the number of running dispatches and per-class statistics."""
+        return {
+            "active": self._active,
+            "classes": {
+                priority: {
+                    "queue_depth": sum(1 for *_, w in self._queues[priority] if not w.abandoned),
+                    "granted": self.granted[priority],
+                }
+                for priority in PRIORITY_CLASSES
+            },
+        }
@@ -1,7 +1,8 @@
 from importlib.metadata import PackageNotFoundError, version
-from typing import Literal
+from typing import Annotated, Literal, Optional
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import PositiveFloat, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 
 
 def get_pkg_version() -> str:
@@ -22,10 +23,114 @@ class ServerSettings(BaseSettings):
     port: int = 8000
     log_level: str = "INFO"
     max_image_size_mb: int = 5
+    # Decodes JPEG images for the detectors at a reduced scale that still covers
+    # the input size of the detector. The plates are then read at that scale too.
+    reduced_decode: bool = False
+    # The number of images decoded at once, in worker threads of their own.
+    decode_concurrency: int = 4
+    # The shared HTTP client that fetches the images of the `_from_path` tools.
+    fetch_max_connections: int = 100
+    fetch_max_connections_per_host: int = 10
+    fetch_timeout_s: float = 10.0
+    fetch_connect_timeout_s: float = 5.0
+    # How long idle connections are kept open for reuse.
+    fetch_keepalive_s: float = 30.0
+    # Needs the `http2` extra.
+    fetch_http2: bool = False
+    # The memory that the cache of fetched images may take. 0 disables the cache.
+    fetch_cache_max_mb: int = 64
+    # A directory that images evicted from the fetch cache are spilled to.
+    fetch_cache_dir: Optional[str] = None
+    fetch_cache_disk_max_mb: int = 1024
+    # The number of images whose inference results are cached. 0 disables the cache.
+    result_cache_size: int = 256
+    result_cache_max_mb: int = 64
+    # How long results stay cached. 0 keeps them until they are evicted.
+    result_cache_ttl_s: float = 0.0
+    # "sqlite" stores the results in a database at `result_cache_path` that the
+    # workers of a host share, and that is kept across restarts.
+    result_cache_backend: Literal["memory", "sqlite"] = "memory"
+    result_cache_path: str = "~/.cache/omni-lpr/results.sqlite3"
+    # Reuses the results of a recent frame of the same source for a frame whose
+    # perceptual hash differs from it in at most `near_duplicate_max_distance` bits.
+    near_duplicate_detection: bool = False
+    near_duplicate_max_distance: int = 4
+    # The number of recent frames of each source that new frames are matched against.
+    near_duplicate_window: int = 8
+    near_duplicate_max_age_s: float = 30.0
     model_cache_size: int = 16
+    # The estimated memory that cached models may take. 0 disables the limit.
+    model_cache_max_mb: int = 2048
+    # Keeps the models of the default detector and OCR model loaded.
+    model_cache_pin_defaults: bool = False
+    # Unloads models that have not been used for this long. 0 disables it.
+    model_idle_ttl_s: float = 0.0
     execution_device: Literal["auto", "cpu", "cuda", "openvino"] = "auto"
     default_ocr_model: str = "cct-xs-v1-global-model"
     default_detector_model: str = "yolo-v9-t-384-license-plate-end2end"
+    # The precision of the models of calls that do not choose one. "int8" runs
+    # dynamic-quantized variants of the models, produced on first use.
+    model_precision: Literal["fp32", "int8"] = "fp32"
+    quantized_model_dir: str = "~/.cache/omni-lpr/quantized"
+    # A larger detector that re-runs the frames the requested detector handled
+    # poorly (see `cascade_policy`). None disables the cascade.
+    cascade_detector_model: Optional[str] = None
+    cascade_policy: Literal["empty", "low_confidence"] = "low_confidence"
+    cascade_min_confidence: float = 0.6
+    # A batch size of 1 disables micro-batching and runs each request on its own.
+    inference_batch_max_size: int = 1
+    inference_batch_max_wait_ms: float = 5.0
+    # "process" runs inference in a pool of worker processes instead of threads,
+    # and "sidecar" forwards it to the inference sidecar over a Unix socket.
+    inference_backend: Literal["thread", "process", "sidecar"] = "thread"
+    inference_processes: int = 2
+    # The directory of the socket is created private to the user running the sidecar.
+    inference_socket_path: str = "~/.cache/omni-lpr/inference.sock"
+    batch_tool_max_images: int = 64
+    batch_tool_concurrency: int = 8
+    # Per-tool admission control. A concurrency of 0 disables it.
+    admission_max_concurrency: int = 16
+    admission_max_queue: int = 64
+    admission_queue_timeout_s: float = 30.0
+    # Fair-share scheduling of inference dispatches. A concurrency of 0 disables it.
+    scheduler_max_concurrency: int = 8
+    scheduler_default_priority: Literal["realtime", "batch"] = "realtime"
+    # "<client_id>=<weight>" pairs; clients without a weight have a weight of 1.
+    scheduler_client_weights: Annotated[dict[str, PositiveFloat], NoDecode] = {}
+    # ONNX Runtime session options. A thread count of 0 keeps ONNX Runtime's default.
+    ort_intra_op_threads: int = 0
+    ort_inter_op_threads: int = 0
+    ort_execution_mode: Literal["sequential", "parallel"] = "sequential"
+    ort_graph_optimization_level: Literal["disable", "basic", "extended", "all"] = "all"
+    # Directory for caching optimized model files. None disables the cache.
+    ort_optimized_model_dir: Optional[str] = None
+    # "<detector_model>:<ocr_model>" combinations to load and warm up at startup.
+    preload_models: Annotated[list[str], NoDecode] = []
+    warmup_iterations: int = 3
+
+    @field_validator("preload_models", mode="before")
+    @classmethod
+    def split_preload_models(cls, v: object) -> object:
+        """Accepts a comma-separated string, as given in environment variables."""
+        if isinstance(v, str):
+            return [entry.strip() for entry in v.split(",") if entry.strip()]
+        return v
+
+    @field_validator("scheduler_client_weights", mode="before")
+    @classmethod
+    def parse_client_weights(cls, v: object) -> object:
+        """Accepts comma-separated `<client_id>=<weight>` pairs, as in environment variables."""
+        if isinstance(v, str):
+            weights = {}
+            for pair in filter(None, (pair.strip() for pair in v.split(","))):
+                client_id, sep, weight = pair.rpartition("=")
+                if not sep or not client_id.strip():
+                    raise ValueError(
+                        f"Invalid client weight '{pair}'. Expected '<client_id>=<weight>'."
+                    )
+                weights[client_id.strip()] = float(weight)
+            return weights
+        return v
 
 
 # Singleton instance
@@ -0,0 +1,305 @@
+"""
+Inference sidecar served over a Unix domain socket.
+
+A single sidecar process owns all models of a host, and the HTTP server
+processes forward decoded images to it instead of loading their own copies of
+the models. This keeps model memory and warm-up time independent of the
+number of HTTP worker processes.
+
+Every message on the socket is prefixed with its length as a 4-byte big-endian
+integer. A request is a JSON header naming the operation (see
+`inference_pool.OPERATIONS`), its arguments, and the shape and dtype of each
+frame, followed by one message with the raw bytes of each frame. The response
+is a single JSON message with a status and a value. The results are made of
+dataclasses and NumPy arrays, which are encoded as tagged JSON objects, and the
+client only rebuilds the result types it knows (see `_result_types`), so that
+nothing it receives is executed. The socket is only accessible to the user
+running the sidecar, and the client refuses a sidecar run by another user.
+"""
+
+import dataclasses
+import functools
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import click
+import numpy as np
+
+from .inference_pool import OPERATIONS
+from .settings import settings
+
+_logger = logging.getLogger(__name__)
+
+_LENGTH = struct.Struct(">I")
+# The `struct ucred` (pid, uid, gid) returned by the SO_PEERCRED socket option.
+_PEER_CREDENTIALS = struct.Struct("3i")
+
+
+def _send_message(sock: socket.socket, payload: bytes | memoryview) -> None:
+    """Sends a length-prefixed message."""
+    sock.sendall(_LENGTH.pack(len(payload)))
+    sock.sendall(payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytearray]:
+    """Receives exactly `size` bytes, or returns None if the peer closed the socket."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            return None
+        received += count
+    return buffer
+
+
+def _recv_message(sock: socket.socket) -> Optional[bytearray]:
+    """Receives a length-prefixed message, or returns None at the end of the stream."""
+    header = _recv_exact(sock, _LENGTH.size)
+    if header is None:
+        return None
+    return _recv_exact(sock, _LENGTH.unpack(header)[0])
+
+
+@functools.cache
+def _result_types() -> dict[str, type]:
+    """Returns the result types of the inference operations, by name."""
+    from fast_alpr import ALPRResult, OcrResult
+    from fast_plate_ocr.core.types import PlatePrediction
+    from open_image_models.detection.core.base import BoundingBox, DetectionResult
+
+    return {
+        cls.__name__: cls
+        for cls in (ALPRResult, OcrResult, PlatePrediction, DetectionResult, BoundingBox)
+    }
+
+
+def _encode_value(value: object) -> object:
+    """Encodes the parts of a result that JSON does not support (the `json.dumps` default)."""
+    if isinstance(value, np.ndarray):
+        return {"__ndarray__": value.tolist(), "dtype": value.dtype.str}
+    if isinstance(value, np.generic):
+        return value.item()
+    name = type(value).__name__
+    if dataclasses.is_dataclass(value) and _result_types().get(name) is type(value):
+        fields = {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+        return {"__type__": name, **fields}
+    raise TypeError(f"Cannot send a value of type {name} to the inference client.")
+
+
+def _decode_value(obj: dict[str, Any]) -> object:
+    """Rebuilds the arrays and result types of a response (the `json.loads` object hook)."""
+    if "__ndarray__" in obj:
+        return np.array(obj["__ndarray__"], dtype=np.dtype(obj["dtype"]))
+    name = obj.pop("__type__", None)
+    if name is None:
+        return obj
+    cls = _result_types().get(name)
+    if cls is None:
+        raise ValueError(f"Unknown result type '{name}' in the inference sidecar response.")
+    return cls(**obj)
+
+
+# --- Server side ---
+
+
+class _InferenceRequestHandler(socketserver.BaseRequestHandler):
+    """Serves inference requests of one client connection until it is closed."""
+
+    def handle(self) -> None:
+        while True:
+            header = _recv_message(self.request)
+            if header is None:
+                return
+            try:
+                request = json.loads(header)
+                frames = None
+                if request["frames"] is not None:
+                    frames = []
+                    for spec in request["frames"]:
+                        data = _recv_message(self.request)
+                        if data is None:
+                            return
+                        frames.append(
+                            np.frombuffer(data, dtype=np.dtype(spec["dtype"])).reshape(
+                                spec["shape"]
+                            )
+                        )
+                value = self._run(request["operation"], request["args"], frames)
+                response = json.dumps({"status": "ok", "value": value}, default=_encode_value)
+            except Exception as e:
+                _logger.exception("Inference request failed.")
+                response = json.dumps({"status": "error", "value": f"{type(e).__name__}: {e}"})
+            _send_message(self.request, response.encode())
+
+    @staticmethod
+    def _run(operation: str, args: list[Any], frames: Optional[list[np.ndarray]]) -> object:
+        fn = OPERATIONS.get(operation)
+        if fn is None:
+            raise ValueError(f"Unknown operation '{operation}'.")
+        return fn(*args) if frames is None else fn(*args, frames)
+
+
+class InferenceSidecarServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A Unix socket server that runs inference with one connection thread per client."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str) -> None:
+        """Binds the server, replacing a stale socket file left by a previous run."""
+        socket_path = os.path.expanduser(socket_path)
+        # The directory is private to the user, unless it already exists.
+        Path(socket_path).parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _InferenceRequestHandler)
+        os.chmod(socket_path, 0o600)
+        self.socket_path = socket_path
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+# --- Client side ---
+
+
+class SidecarClient:
+    """
+    Forwards inference operations to the inference sidecar.
+
+    Each thread uses its own connection, so concurrent requests from the worker
+    threads of a server process are served concurrently by the sidecar.
+    """
+
+    def __init__(self, socket_path: str) -> None:
+        """Initializes the client. Connections are opened on first use."""
+        self.socket_path = os.path.expanduser(socket_path)
+        self._local = threading.local()
+        self._connections: set[socket.socket] = set()
+        self._lock = threading.Lock()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.socket_path)
+                self._check_peer(sock)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+            with self._lock:
+                self._connections.add(sock)
+        return sock
+
+    def _check_peer(self, sock: socket.socket) -> None:
+        """
+        Checks that the sidecar runs as the user of this process, or as root.
+
+        Another user could otherwise bind the socket path first and answer the
+        requests. The check needs SO_PEERCRED, which only Linux provides.
+        """
+        if not hasattr(socket, "SO_PEERCRED"):
+            return
+        credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEER_CREDENTIALS.size)
+        _, uid, _ = _PEER_CREDENTIALS.unpack(credentials)
+        if uid not in (os.getuid(), 0):
+            raise PermissionError(
+                f"The inference sidecar at {self.socket_path} runs as user {uid}, "
+                f"not as user {os.getuid()}."
+            )
+
+    def _discard_connection(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            self._local.sock = None
+            with self._lock:
+                self._connections.discard(sock)
+            sock.close()
+
+    def run(
+        self, operation: str, *args: object, frames: Optional[Sequence[np.ndarray]] = None
+    ) -> object:
+        """
+        Runs an operation in the sidecar and blocks until its result is available.
+
+        The frames, if given, are passed to the operation after the other
+        positional arguments.
+        """
+        arrays = None if frames is None else [np.ascontiguousarray(frame) for frame in frames]
+        header = {
+            "operation": operation,
+            "args": list(args),
+            "frames": None
+            if arrays is None
+            else [{"shape": array.shape, "dtype": array.dtype.str} for array in arrays],
+        }
+        try:
+            sock = self._connection()
+            _send_message(sock, json.dumps(header).encode())
+            for array in arrays or ():
+                _send_message(sock, array.data.cast("B"))
+            response = _recv_message(sock)
+        except OSError:
+            # The connection is in an unknown state, so the next call reconnects.
+            self._discard_connection()
+            raise
+        if response is None:
+            self._discard_connection()
+            raise ConnectionError("The inference sidecar closed the connection.")
+
+        message = json.loads(response, object_hook=_decode_value)
+        if message["status"] == "error":
+            raise RuntimeError(f"Inference sidecar error: {message['value']}")
+        return message["value"]
+
+    def shutdown(self) -> None:
+        """Closes all connections to the sidecar."""
+        with self._lock:
+            connections, self._connections = self._connections, set()
+        for sock in connections:
+            sock.close()
+
+
+@click.command()
+@click.option(
+    "--socket-path",
+    default=None,
+    help="The Unix socket path to listen on.",
+    envvar="INFERENCE_SOCKET_PATH",
+)
+@click.option("--log-level", default=None, help="The log level to use.", envvar="LOG_LEVEL")
+def main(socket_path: str | None, log_level: str | None) -> int:
+    """Entrypoint for the omni-lpr inference sidecar."""
+    from .__main__ import setup_logging
+
+    if socket_path:
+        settings.inference_socket_path = socket_path
+    if log_level:
+        settings.log_level = log_level
+    # The sidecar always runs the models in-process.
+    settings.inference_backend = "thread"
+
+    setup_logging(settings.log_level)
+    with InferenceSidecarServer(settings.inference_socket_path) as server:
+        _logger.info(f"Inference sidecar listening on {settings.inference_socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            _logger.info("Inference sidecar shutting down...")
+    return 0
+
+
+if __name__ == "__main__":
+    main()
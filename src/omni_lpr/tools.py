@@ -1,44 +1,80 @@
 import base64
-import io
 import json
 import logging
-from dataclasses import asdict
-from functools import partial
+import re
+from contextlib import AbstractAsyncContextManager, nullcontext
+from dataclasses import asdict, replace
+from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Annotated,
     Any,
+    Awaitable,
+    Callable,
     Literal,
     Optional,
+    Sequence,
     Type,
+    TypeVar,
+    cast,
     get_args,
 )
 
 import anyio
+import cv2
 import httpx
 import mcp.types as types
 import numpy as np
-from PIL import Image, UnidentifiedImageError
-from async_lru import alru_cache
+from PIL import UnidentifiedImageError
 from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    PositiveInt,
     ValidationError,
-    ValidationInfo,
     field_validator,
+    model_validator,
 )
 from pydantic_core import PydanticCustomError
 
+from .admission import AdmissionController
+from .batching import BatchScheduler
+from .cascade import CascadeStage, CascadeStats, needs_escalation
+from .context import PriorityClass, request_context
+from .deadlines import check_deadline, enforce_deadline
+from .decoding import DecodePool
 from .errors import ErrorCode, ToolLogicError
+from .fetching import ImageFetcher
+from .inference_pool import RemoteALPR, RemoteRecognizer, get_inference_pool
+from .model_manager import ModelManager
+from .near_duplicates import NearDuplicateIndex
+from .ort_sessions import (
+    build_session_options,
+    estimate_session_bytes,
+    execution_providers,
+    make_terminable,
+    run_terminable,
+    session_source,
+)
+from .quantization import MODEL_PRECISIONS, ModelPrecision, model_file, variant_name
+from .result_cache import ResultCache
+from .scheduling import FairScheduler
 from .settings import settings
 
 if TYPE_CHECKING:
-    from fast_alpr import ALPR
+    from fast_alpr import ALPR, ALPRResult, BaseDetector, DetectionResult, OcrResult
     from fast_plate_ocr import LicensePlateRecognizer
+    from fast_plate_ocr.core.types import PlatePrediction
+    from fast_plate_ocr.inference.hub import OcrModel as HubOcrModel
+    from open_image_models.detection.core.base import BoundingBox, ObjectDetector
 
 _logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# The confidence threshold that fast-alpr uses for its default detector.
+_DETECTOR_CONF_THRESH = 0.4
+
 
 class ImageFetchError(Exception):
     """Raised when fetching an image from a remote URL fails with an HTTP status.
@@ -52,33 +88,65 @@ class ImageFetchError(Exception):
         self.status_code = status_code
 
 
+class RawImage:
+    """
+    The bytes of an image file.
+
+    The `image_base64` fields hold the image as `RawImage`: Base64 strings are
+    decoded once, during validation, and the REST interface passes uploaded
+    files as `RawImage` directly, so that they reach the image decoder without a
+    Base64 round-trip. The tool schemas still only accept Base64 strings.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RawImage) and self.data == other.data
+
+    def __repr__(self) -> str:
+        return f"RawImage(<{len(self.data)} bytes>)"
+
+
 # --- Reusable Pydantic Types and Validators ---
-def _validate_base64(v: Any, _: ValidationInfo) -> str:
-    """Validator to ensure a string is valid Base64."""
-    if not isinstance(v, str):
-        raise PydanticCustomError("not_base64_string", "A valid Base64 string is required.")
-    if not v:
-        raise ValueError("image_base64 cannot be empty.")
-
-    # Calculate the maximum allowed Base64 string length for a given image size in MB.
-    # Base64 encoding increases the size by a factor of 4/3.
-    max_len = int(settings.max_image_size_mb * 1024 * 1024 * 4 / 3)
-    if len(v) > max_len:
-        raise ValueError(
-            f"Input image is too large. The maximum size is {settings.max_image_size_mb}MB."
-        )
+def _validate_base64(v: Any) -> RawImage:
+    """Validator that decodes a Base64 string, and checks the size of the decoded image."""
+    max_size = settings.max_image_size_mb * 1024 * 1024
+    too_large = f"Input image is too large. The maximum size is {settings.max_image_size_mb}MB."
+    if isinstance(v, RawImage):
+        image = v
+    else:
+        if not isinstance(v, str):
+            raise PydanticCustomError("not_base64_string", "A valid Base64 string is required.")
+        if not v:
+            raise ValueError("image_base64 cannot be empty.")
+        # Base64 encoding increases the size by a factor of 4/3, so oversized
+        # strings are rejected before spending time and memory on decoding them.
+        if len(v) * 3 // 4 > max_size:
+            raise ValueError(too_large)
+        try:
+            image = RawImage(base64.b64decode(v))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid base64 string provided. Error: {e}") from e
 
-    try:
-        base64.b64decode(v)
-    except (ValueError, TypeError) as e:
-        raise ValueError(f"Invalid base64 string provided. Error: {e}") from e
-    return v
+    if not image.data:
+        raise ValueError("The image cannot be empty.")
+    if len(image.data) > max_size:
+        raise ValueError(too_large)
+    return image
 
 
-from pydantic import BeforeValidator
+from pydantic import PlainValidator, WithJsonSchema
 
-# Annotated type for Base64 image strings
-Base64ImageStr = Annotated[str, BeforeValidator(_validate_base64)]
+# Annotated type for images given as Base64 strings, which hold the decoded image.
+Base64Image = Annotated[
+    RawImage, PlainValidator(_validate_base64), WithJsonSchema({"type": "string"})
+]
 
 # --- Define allowed models as Literal types for validation ---
 DetectorModel = Literal[
@@ -94,22 +162,86 @@ OcrModel = Literal["cct-s-v1-global-model", "cct-xs-v1-global-model"]
 
 
 # --- Pydantic Models for Input Validation ---
-# These models are placeholders. The actual models with dynamic default
-# values are defined and used within the setup_tools() function.
-class RecognizePlateArgs(BaseModel):
-    pass
+class BatchImageItem(BaseModel):
+    """A single image of a batch tool call, given as Base64 data or as a path/URL."""
+
+    model_config = ConfigDict(extra="forbid")
+    image_base64: Optional[Base64Image] = None
+    path: Optional[str] = Field(default=None, examples=["https://example.com/car.jpg"])
+
+    @model_validator(mode="after")
+    def exactly_one_source(self) -> "BatchImageItem":
+        if bool(self.image_base64) == bool(self.path and self.path.strip()):
+            raise ValueError("Provide exactly one of 'image_base64' or 'path'.")
+        return self
+
 
+class InferenceCallOptions(BaseModel):
+    """Scheduling options shared by the tools that run inference."""
+
+    priority: Optional[PriorityClass] = Field(
+        default=None,
+        description="The priority class of the call. Overrides the X-Priority header.",
+    )
+    timeout_ms: Optional[PositiveInt] = Field(
+        default=None,
+        description=(
+            "The maximum time the call may take, in milliseconds. An earlier deadline "
+            "set with the X-Request-Timeout-Ms header is kept."
+        ),
+    )
+    bypass_cache: bool = Field(
+        default=False,
+        description="Run inference even if the results of the image are cached, and do not "
+        "cache the results.",
+    )
 
-class RecognizePlateFromPathArgs(BaseModel):
-    pass
 
+# These models are placeholders, which declare the arguments that the tools read.
+# The actual models with dynamic default values are defined and used within the
+# setup_tools() function.
+class RecognizePlateArgs(InferenceCallOptions):
+    image_base64: Base64Image
+    ocr_model: OcrModel
+    precision: ModelPrecision
 
-class DetectAndRecognizePlateArgs(BaseModel):
-    pass
 
+class RecognizePlateFromPathArgs(InferenceCallOptions):
+    path: str
+    ocr_model: OcrModel
+    precision: ModelPrecision
 
-class DetectAndRecognizePlateFromPathArgs(BaseModel):
-    pass
+
+class DetectAndRecognizePlateArgs(InferenceCallOptions):
+    image_base64: Base64Image
+    detector_model: DetectorModel
+    cascade_detector_model: Optional[DetectorModel]
+    ocr_model: OcrModel
+    precision: ModelPrecision
+    source: Optional[str]
+
+
+class DetectAndRecognizePlateFromPathArgs(InferenceCallOptions):
+    path: str
+    detector_model: DetectorModel
+    cascade_detector_model: Optional[DetectorModel]
+    ocr_model: OcrModel
+    precision: ModelPrecision
+    source: Optional[str]
+
+
+class RecognizePlatesBatchArgs(InferenceCallOptions):
+    images: list[BatchImageItem]
+    ocr_model: OcrModel
+    precision: ModelPrecision
+
+
+class DetectAndRecognizePlatesBatchArgs(InferenceCallOptions):
+    images: list[BatchImageItem]
+    detector_model: DetectorModel
+    cascade_detector_model: Optional[DetectorModel]
+    ocr_model: OcrModel
+    precision: ModelPrecision
 
 
 class ListModelsArgs(BaseModel):
@@ -132,6 +264,7 @@ class ToolRegistry:
         self._tools: dict[str, callable] = {}
         self._tool_definitions: list[types.Tool] = []
         self._tool_models: dict[str, Type[BaseModel]] = {}
+        self.admission = AdmissionController()
 
     def register(self, tool_definition: types.Tool, model: Type[BaseModel]):
         """
@@ -186,7 +319,8 @@ class ToolRegistry:
         Executes a tool with already validated Pydantic model arguments.
 
         This method is an internal-facing counterpart to `call`. It bypasses
-        the validation step and directly executes the tool's logic.
+        the validation step and directly executes the tool's logic. Callers are
+        expected to hold an admission slot for the tool (see `admission`).
 
         Args:
             name: The name of the tool to execute.
@@ -198,10 +332,24 @@ class ToolRegistry:
 
         Raises:
             ToolLogicError: If the tool execution fails.
+            DeadlineExceededError: If the call does not finish before its deadline.
         """
         func = self._tools[name]
+        # A priority, timeout, or cache bypass given as a tool argument applies on
+        # top of the ones of the request.
+        context = request_context.get()
+        priority = getattr(validated_args, "priority", None)
+        if priority is not None:
+            context = replace(context, priority=priority)
+        timeout_ms = getattr(validated_args, "timeout_ms", None)
+        if timeout_ms is not None:
+            context = context.with_timeout(timeout_ms)
+        if getattr(validated_args, "bypass_cache", False):
+            context = replace(context, bypass_cache=True)
+        token = request_context.set(context)
         try:
-            return await func(validated_args)
+            async with enforce_deadline(f"tool '{name}'"):
+                return await func(validated_args)
         except ToolLogicError:
             raise  # Don't re-wrap our own errors
         except Exception as e:
@@ -211,6 +359,8 @@ class ToolRegistry:
                 message=error_message,
                 code=ErrorCode.TOOL_LOGIC_ERROR,
             ) from e
+        finally:
+            request_context.reset(token)
 
     async def call(self, name: str, arguments: dict) -> list[types.ContentBlock]:
         """
@@ -220,9 +370,10 @@ class ToolRegistry:
         following steps:
         1. Checks if the tool exists.
         2. Retrieves the associated Pydantic model for the tool.
-        3. Validates the incoming `arguments` dictionary against the model.
-        4. If validation succeeds, it calls the tool's implementation.
-        5. If validation fails, it raises a `ToolLogicError`.
+        3. Waits for an admission slot for the tool.
+        4. Validates the incoming `arguments` dictionary against the model.
+        5. If validation succeeds, it calls the tool's implementation.
+        6. If validation fails, it raises a `ToolLogicError`.
 
         Args:
             name: The name of the tool to call.
@@ -234,6 +385,8 @@ class ToolRegistry:
         Raises:
             ToolLogicError: If the tool is unknown, no validation model is
                             registered, or input validation fails.
+            OverloadedError: If the tool is overloaded.
+            DeadlineExceededError: If the call does not finish before its deadline.
         """
         if name not in self._tools:
             _logger.warning(f"Unknown tool requested: {name}")
@@ -246,17 +399,18 @@ class ToolRegistry:
                 code=ErrorCode.UNKNOWN_ERROR,
             )
 
-        try:
-            validated_args = model(**arguments)
-        except ValidationError as e:
-            _logger.error(f"Input validation failed for tool '{name}': {e}")
-            raise ToolLogicError(
-                message=f"Input validation failed for tool '{name}'.",
-                code=ErrorCode.VALIDATION_ERROR,
-                details=e.errors(),
-            ) from e
+        async with enforce_deadline(f"tool '{name}'"), self.admission.admit(name):
+            try:
+                validated_args = model(**arguments)
+            except ValidationError as e:
+                _logger.error(f"Input validation failed for tool '{name}': {e}")
+                raise ToolLogicError(
+                    message=f"Input validation failed for tool '{name}'.",
+                    code=ErrorCode.VALIDATION_ERROR,
+                    details=e.errors(),
+                ) from e
 
-        return await self.call_validated(name, validated_args)
+            return await self.call_validated(name, validated_args)
 
     def list(self) -> list[types.Tool]:
         """
@@ -269,43 +423,141 @@ class ToolRegistry:
 
 
 tool_registry = ToolRegistry()
+batch_scheduler = BatchScheduler()
+inference_scheduler = FairScheduler()
+model_manager = ModelManager()
+cascade_stats = CascadeStats()
+decode_pool = DecodePool()
+image_fetcher = ImageFetcher()
+result_cache = ResultCache()
+near_duplicates = NearDuplicateIndex()
+
+
+def _build_ocr_recognizer(
+    ocr_model: str, precision: ModelPrecision = "fp32"
+) -> "LicensePlateRecognizer":
+    """Constructs a license plate OCR model of the given precision in the current process."""
+    from fast_plate_ocr import LicensePlateRecognizer
 
+    if settings.ort_optimized_model_dir is None and precision == "fp32":
+        return _with_terminable_sessions(
+            LicensePlateRecognizer(
+                cast("HubOcrModel", ocr_model),
+                device=_ocr_device(),
+                sess_options=build_session_options(),
+            )
+        )
 
-async def _get_ocr_recognizer(ocr_model: str) -> "LicensePlateRecognizer":
-    """
-    Loads and caches a license plate OCR model.
-    The alru_cache decorator handles caching.
-    """
-    _logger.info(f"Loading license plate OCR model: {ocr_model}")
-    from fast_plate_ocr import LicensePlateRecognizer
+    onnx_path, config_path = _download_ocr_model(ocr_model)
+    onnx_path = model_file(ocr_model, onnx_path, precision)
+    with session_source(variant_name(ocr_model, precision), onnx_path) as (
+        model_path,
+        sess_options,
+    ):
+        return _with_terminable_sessions(
+            LicensePlateRecognizer(
+                onnx_model_path=model_path,
+                plate_config_path=config_path,
+                device=_ocr_device(),
+                sess_options=sess_options,
+            )
+        )
+
+
+def _ocr_device() -> Literal["cuda", "cpu", "auto"]:
+    """Returns the OCR device for the execution device."""
+    # fast-plate-ocr does not support 'openvino', so we map it to 'cpu' in that case.
+    device = settings.execution_device
+    return device if device != "openvino" else "cpu"
+
+
+def _session_owners(model: object) -> list[object]:
+    """Returns the objects that hold the ONNX Runtime sessions of an OCR model or detector."""
+    return [model, getattr(model, "detector", None)]
+
+
+def _with_terminable_sessions(model: T) -> T:
+    """Makes the ONNX Runtime runs of an OCR model or detector terminable."""
+    for owner in _session_owners(model):
+        make_terminable(owner)
+    return model
+
+
+def _estimate_model_bytes(model: object) -> int:
+    """Estimates the memory taken by the sessions of an OCR model or detector."""
+    return sum(
+        estimate_session_bytes(getattr(owner, "model", None)) for owner in _session_owners(model)
+    )
+
+
+def _download_ocr_model(ocr_model: str) -> tuple[Path, Path]:
+    """Downloads an OCR model (or finds it in the local cache) and returns its files."""
+    from fast_plate_ocr.inference.hub import download_model
+
+    return download_model(cast("HubOcrModel", ocr_model))
+
+
+def _is_pinned(model_name: str, default_model_name: str, precision: ModelPrecision) -> bool:
+    """Returns whether a model is a default model that is kept loaded."""
+    return (
+        settings.model_cache_pin_defaults
+        and model_name == default_model_name
+        and precision == settings.model_precision
+    )
+
+
+async def _get_ocr_recognizer(
+    ocr_model: str, precision: ModelPrecision = "fp32"
+) -> "LicensePlateRecognizer":
+    """Returns a license plate OCR model, loading it through the model manager if needed."""
+    return await model_manager.get(
+        ("ocr", ocr_model, precision),
+        lambda: _load_ocr_recognizer(ocr_model, precision),
+        estimate_bytes=_estimate_model_bytes,
+        pinned=_is_pinned(ocr_model, settings.default_ocr_model, precision),
+    )
+
+
+async def _load_ocr_recognizer(
+    ocr_model: str, precision: ModelPrecision
+) -> "LicensePlateRecognizer":
+    """Loads a license plate OCR model."""
+    _logger.info(f"Loading license plate OCR model: {variant_name(ocr_model, precision)}")
+    if settings.inference_backend in ("process", "sidecar"):
+        recognizer = await anyio.to_thread.run_sync(
+            RemoteRecognizer, get_inference_pool(), ocr_model, precision
+        )
+        # It has the parts of the recognizer's interface that the tools use.
+        return cast("LicensePlateRecognizer", recognizer)
 
     # The LicensePlateRecognizer is not async, so we run it in a thread
-    return await anyio.to_thread.run_sync(LicensePlateRecognizer, ocr_model)
+    return await anyio.to_thread.run_sync(_build_ocr_recognizer, ocr_model, precision)
 
 
 async def _get_image_from_source(
-    *, image_base64: Optional[str] = None, path: Optional[str] = None
-) -> Image.Image:
+    *, image_base64: Optional[RawImage] = None, path: Optional[str] = None, min_size: int = 0
+) -> tuple[np.ndarray, int]:
     """
-    Retrieves an image from either a Base64 string or a path/URL.
+    Retrieves an image from either validated image data or a path/URL.
 
-    Returns a PIL Image object in RGB format.
+    With a `min_size`, JPEG images are decoded at the smallest scale at which both
+    sides keep at least `min_size` pixels.
+
+    Returns the image as a BGR array, and the factor by which it was reduced.
     """
+    check_deadline("fetching the image")
     image_bytes: Optional[bytes] = None
     source_for_error_msg = ""
 
     if image_base64:
-        source_for_error_msg = "Base64 data"
-        image_bytes = base64.b64decode(image_base64)
+        source_for_error_msg = "the image"
+        image_bytes = image_base64.data
 
     elif path:
         source_for_error_msg = f"path '{path}'"
         if path.startswith(("http://", "https://")):
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(path)
-                    response.raise_for_status()
-                    image_bytes = await response.aread()
+                image_bytes = await image_fetcher.fetch(path)
             except httpx.HTTPStatusError as e:
                 # Raise a specific error so callers can decide how to handle
                 # different HTTP status codes (e.g., 403 forbidden can be
@@ -323,18 +575,118 @@ async def _get_image_from_source(
         raise ValueError("No image source provided.")
 
     try:
-        image = Image.open(io.BytesIO(image_bytes))
-        return image.convert("RGB")
+        return await decode_pool.decode(image_bytes, min_size)
     except UnidentifiedImageError as e:
         raise ValueError(f"Data from {source_for_error_msg} is not a valid image file.") from e
 
 
+def _inference_slot(cost: float = 1.0) -> AbstractAsyncContextManager[None]:
+    """
+    Returns the scheduler slot to hold while a tool call runs inference.
+
+    When batching is enabled, each batch takes its own slot as it runs instead, so
+    that calls waiting for a batch to fill up do not hold slots, which would cap
+    the batch size at the number of slots.
+    """
+    if settings.inference_batch_max_size > 1:
+        return nullcontext()
+    return inference_scheduler.slot(cost)
+
+
+def _recognize_plates_batch(
+    items: Sequence[tuple["LicensePlateRecognizer", np.ndarray]],
+) -> list["PlatePrediction"]:
+    """
+    Runs OCR for a batch of `(recognizer, plate image)` pairs.
+
+    Items are grouped by recognizer, and each group is run through the model as
+    one stacked tensor. Returns one prediction per item, in the order of `items`.
+    """
+    groups: dict[int, list[int]] = {}
+    for index, (recognizer, _) in enumerate(items):
+        groups.setdefault(id(recognizer), []).append(index)
+
+    predictions: list[Any] = [None] * len(items)
+    for indices in groups.values():
+        recognizer = items[indices[0]][0]
+        plates = [items[index][1] for index in indices]
+        group_predictions = recognizer.run(plates, return_confidence=True)
+        for index, prediction in zip(indices, group_predictions, strict=True):
+            predictions[index] = prediction
+    return predictions
+
+
+async def _recognize_plates(
+    recognizer: "LicensePlateRecognizer", ocr_model: str, plates: list[np.ndarray]
+) -> list["PlatePrediction"]:
+    """
+    Runs OCR over several plate images.
+
+    When batching is enabled, the images join the cross-request OCR batch for the
+    OCR model. Otherwise, they are run through the model together in one call.
+    """
+    items = [(recognizer, plate) for plate in plates]
+    if settings.inference_batch_max_size <= 1:
+        return await run_terminable(_recognize_plates_batch, items)
+
+    batcher = batch_scheduler.get(
+        ("ocr", ocr_model),
+        _recognize_plates_batch,
+        max_batch_size=settings.inference_batch_max_size,
+        max_wait_ms=settings.inference_batch_max_wait_ms,
+        slot=inference_scheduler.batch_slot,
+    )
+    return await batcher.submit_many(items)
+
+
+def _prepare_plate_crop(recognizer: "LicensePlateRecognizer", crop: np.ndarray) -> np.ndarray:
+    """Converts a BGR plate crop to the color mode expected by the OCR model."""
+    color_mode = recognizer.config.image_color_mode
+    if color_mode == "grayscale":
+        return cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    if color_mode == "rgb":
+        return cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+    return crop
+
+
+def _to_ocr_result(prediction: "PlatePrediction") -> "OcrResult":
+    """Converts a raw OCR prediction to the OCR result used in ALPR results."""
+    from fast_alpr import OcrResult
+
+    char_probs = prediction.char_probs
+    confidence: float | list[float] = (
+        0.0 if char_probs is None else [float(x) for x in char_probs.tolist()]
+    )
+    return OcrResult(
+        text=prediction.plate,
+        confidence=confidence,
+        region=prediction.region,
+        region_confidence=prediction.region_prob,
+    )
+
+
+def _serialize_ocr_result(res: object) -> object:
+    """Converts an OCR prediction to a JSON-serializable value."""
+    if isinstance(res, str) or not hasattr(res, "plate"):
+        return res
+    char_probs = getattr(res, "char_probs", None)
+    return {
+        "plate": res.plate,
+        "char_probs": char_probs.tolist() if char_probs is not None else None,
+        "region": getattr(res, "region", None),
+        "region_prob": getattr(res, "region_prob", None),
+    }
+
+
 async def _recognize_plate_logic(
-    ocr_model: str, image_base64: Optional[str] = None, path: Optional[str] = None
+    ocr_model: str,
+    image_base64: Optional[RawImage] = None,
+    path: Optional[str] = None,
+    precision: ModelPrecision = "fp32",
 ) -> list[types.ContentBlock]:
     """Core logic to recognize a license plate from an image."""
     try:
-        image_rgb = await _get_image_from_source(image_base64=image_base64, path=path)
+        image_np, _ = await _get_image_from_source(image_base64=image_base64, path=path)
     except ImageFetchError as e:
         # Treat 403 (Forbidden) as a non-fatal condition (e.g., remote host
         # blocks access). Return an empty result for these cases so the
@@ -351,75 +703,319 @@ async def _recognize_plate_logic(
         # registry, so we don't swallow them here.
         raise
 
-    recognizer = await _get_ocr_recognizer(ocr_model)
-    image_np = np.array(image_rgb)
-    result = await anyio.to_thread.run_sync(recognizer.run, image_np)
-
-    _logger.info(f"License plate recognized: {result}")
-
-    serialized_result = []
-    for res in result:
-        if isinstance(res, str):
-            serialized_result.append(res)
-        elif hasattr(res, "plate"):
-            char_probs = getattr(res, "char_probs", None)
-            res_dict = {
-                "plate": res.plate,
-                "char_probs": char_probs.tolist() if char_probs is not None else None,
-                "region": getattr(res, "region", None),
-                "region_prob": getattr(res, "region_prob", None),
-            }
-            serialized_result.append(res_dict)
-        else:
-            serialized_result.append(res)
+    check_deadline("inference")
+
+    async def run(_: list[int]) -> list[list[Any]]:
+        async with _inference_slot():
+            recognizer = await _get_ocr_recognizer(ocr_model, precision)
+            plate = _prepare_plate_crop(recognizer, image_np)
+            # The same path as the batch tool, so the results have the same shape.
+            result = await _recognize_plates(recognizer, ocr_model, [plate])
+        return [[_serialize_ocr_result(res) for res in result]]
 
+    (serialized_result,) = await result_cache.run([image_np], [("ocr", ocr_model, precision)], run)
+
+    _logger.info(f"License plate recognized: {serialized_result}")
     return [types.TextContent(type="text", text=json.dumps(serialized_result))]
 
 
-async def _get_alpr_instance(detector_model: str, ocr_model: str) -> "ALPR":
+def _build_detector(detector_model: str, precision: ModelPrecision = "fp32") -> "BaseDetector":
+    """Constructs a plate detector of the given precision in the current process."""
+    from open_image_models import create_detector
+
+    providers = execution_providers()
+    if settings.ort_optimized_model_dir is None and precision == "fp32":
+        detector = _PlateDetector(
+            create_detector(
+                detector_model,
+                conf_thresh=_DETECTOR_CONF_THRESH,
+                batch_size=_detector_batch_size(),
+                providers=providers,
+                sess_options=build_session_options(),
+            )
+        )
+    else:
+        detector = _build_file_detector(detector_model, precision, providers)
+    return _with_terminable_sessions(detector)
+
+
+def _compose_alpr(detector: "BaseDetector", recognizer: "LicensePlateRecognizer") -> "ALPR":
+    """Composes an ALPR pipeline from a detector and an OCR model, without loading anything."""
+    from fast_alpr import ALPR
+
+    return ALPR(detector=detector, ocr=_RecognizerOCR(recognizer))
+
+
+class _RecognizerOCR:
     """
-    Loads and caches an ALPR instance for a given detector and OCR model.
-    The alru_cache decorator handles caching.
+    The OCR stage of an ALPR pipeline around a shared OCR model.
+
+    It has the same shape as fast-alpr's `DefaultOCR`, which always loads its
+    own copy of the model.
     """
-    _logger.info(
-        f"Loading ALPR instance with detector '{detector_model}', "
-        f"OCR '{ocr_model}', and device '{settings.execution_device}'"
+
+    def __init__(self, recognizer: "LicensePlateRecognizer") -> None:
+        self.ocr_model = recognizer
+
+    def predict(self, cropped_plate: np.ndarray) -> Optional["OcrResult"]:
+        from fast_alpr.default_ocr import DefaultOCR
+
+        return DefaultOCR.predict(self, cropped_plate)
+
+
+def _detector_batch_size() -> int:
+    """
+    Returns the number of frames a detector runs through its model at once.
+
+    Models without a dynamic batch dimension run one frame at a time whatever
+    the batch size, which open-image-models takes care of.
+    """
+    return max(settings.inference_batch_max_size, 1)
+
+
+class _PlateDetector:
+    """
+    A plate detector around an open-image-models detector.
+
+    It has the same shape as fast-alpr's `DefaultDetector`, which can neither
+    load model files nor set the batch size of the model.
+    """
+
+    def __init__(self, detector: "ObjectDetector") -> None:
+        self.detector = detector
+
+    def predict(self, frame: np.ndarray) -> list["DetectionResult"]:
+        return self.detector.predict(frame)
+
+
+def _build_file_detector(
+    detector_model: str, precision: ModelPrecision, providers: Optional[list[str]]
+) -> _PlateDetector:
+    """
+    Constructs a plate detector from its model file.
+
+    The file is the quantized variant of the model for reduced precisions, and is
+    loaded through the optimized model cache when that is enabled.
+    """
+    from open_image_models import create_detector
+    from open_image_models.detection.core.hub import (
+        DETECTION_MODELS,
+        DetectionModelName,
+        download_model,
+    )
+
+    model_name = cast("DetectionModelName", detector_model)
+    spec = DETECTION_MODELS[model_name]
+    onnx_path = model_file(detector_model, download_model(model_name), precision)
+    with session_source(variant_name(detector_model, precision), onnx_path) as (
+        model_path,
+        sess_options,
+    ):
+        return _PlateDetector(
+            create_detector(
+                model_path,
+                backend=spec.backend,
+                class_labels=spec.class_labels,
+                conf_thresh=_DETECTOR_CONF_THRESH,
+                batch_size=_detector_batch_size(),
+                providers=providers,
+                sess_options=sess_options,
+            )
+        )
+
+
+async def _get_detector(detector_model: str, precision: ModelPrecision = "fp32") -> "BaseDetector":
+    """Returns a plate detector, loading it through the model manager if needed."""
+    return await model_manager.get(
+        ("detector", detector_model, precision),
+        lambda: _load_detector(detector_model, precision),
+        estimate_bytes=_estimate_model_bytes,
+        pinned=_is_pinned(detector_model, settings.default_detector_model, precision),
     )
-    from fast_alpr import ALPR
 
-    providers = None
-    # ocr_device does not support 'openvino', so we map it to 'cpu' in that case.
-    ocr_device_for_alpr = (
-        settings.execution_device if settings.execution_device != "openvino" else "cpu"
+
+async def _load_detector(detector_model: str, precision: ModelPrecision) -> "BaseDetector":
+    """Loads a plate detector."""
+    _logger.info(
+        f"Loading plate detector '{variant_name(detector_model, precision)}' "
+        f"on device '{settings.execution_device}'"
     )
+    # The detector constructor is not async, so we run it in a thread
+    return await anyio.to_thread.run_sync(_build_detector, detector_model, precision)
+
+
+async def _get_alpr_instance(
+    detector_model: str, ocr_model: str, precision: ModelPrecision = "fp32"
+) -> "ALPR":
+    """
+    Returns an ALPR pipeline for a given detector, OCR model, and model precision.
+
+    The pipeline is composed of the detector and OCR model of the model manager,
+    so each model is loaded once no matter how many pipelines and tools use it.
+    """
+    if settings.inference_backend in ("process", "sidecar"):
+        return await model_manager.get(
+            ("alpr", detector_model, ocr_model, precision),
+            lambda: anyio.to_thread.run_sync(
+                RemoteALPR, get_inference_pool(), detector_model, ocr_model, precision
+            ),
+        )
+
+    detector = await _get_detector(detector_model, precision)
+    recognizer = await _get_ocr_recognizer(ocr_model, precision)
+    return _compose_alpr(detector, recognizer)
+
+
+def _crop_plate(frame: np.ndarray, bounding_box: "BoundingBox") -> np.ndarray:
+    """Crops a detected plate from a frame, clamping the box to the frame bounds."""
+    x1, y1 = max(bounding_box.x1, 0), max(bounding_box.y1, 0)
+    x2, y2 = min(bounding_box.x2, frame.shape[1]), min(bounding_box.y2, frame.shape[0])
+    return frame[y1:y2, x1:x2]
+
+
+def _detect_plates_batch(alpr: "ALPR", frames: list[np.ndarray]) -> list[list[Any]]:
+    """
+    Runs the plate detector of an ALPR instance over several frames.
+
+    Pipelines of the remote inference backends and local ONNX detectors are
+    called once for the whole batch; a local detector stacks up to
+    `_detector_batch_size()` frames into each session run. Other detectors are
+    called once per frame.
+    """
+    if isinstance(alpr, RemoteALPR):
+        return alpr.detect_batch(frames)
+
+    inner_detector = getattr(alpr.detector, "detector", None)
+    if inner_detector is not None and len(frames) > 1 and hasattr(inner_detector, "batch_size"):
+        detections: list[list[Any]] = inner_detector.predict(frames)
+        return detections
+    return [alpr.detector.predict(frame) for frame in frames]
 
-    if settings.execution_device == "cuda":
-        providers = ["CUDAExecutionProvider", "CPUExecutionProvider"]
-    elif settings.execution_device == "openvino":
-        providers = ["OpenVINOExecutionProvider", "CPUExecutionProvider"]
-    elif settings.execution_device == "cpu":
-        providers = ["CPUExecutionProvider"]
 
-    # The ALPR constructor is not async, so we run it in a thread
-    alpr_constructor = partial(
-        ALPR,
-        detector_model=detector_model,
-        ocr_model=ocr_model,
-        ocr_device=ocr_device_for_alpr,
-        detector_providers=providers,
+def _detect_plates_batch_items(
+    items: Sequence[tuple["ALPR", np.ndarray]],
+) -> list[list["DetectionResult"]]:
+    """
+    Runs plate detection for a batch of `(ALPR instance, frame)` pairs.
+
+    Items are grouped by detector so that each detector sees one batch.
+    Returns one list of detections per item, in the order of `items`.
+    """
+    groups: dict[int, list[int]] = {}
+    for index, (alpr, _) in enumerate(items):
+        # Pipelines of the remote backends have no local detector.
+        groups.setdefault(id(getattr(alpr, "detector", alpr)), []).append(index)
+
+    detections: list[list[DetectionResult]] = [[] for _ in items]
+    for indices in groups.values():
+        alpr = items[indices[0]][0]
+        frames = [items[index][1] for index in indices]
+        for index, frame_detections in zip(
+            indices, _detect_plates_batch(alpr, frames), strict=True
+        ):
+            detections[index] = frame_detections
+    return detections
+
+
+async def _detect_plates(
+    alpr: "ALPR", detector_model: str, ocr_model: str, frames: list[np.ndarray]
+) -> list[list["DetectionResult"]]:
+    """
+    Runs plate detection over several frames.
+
+    When batching is enabled, the frames join the cross-request detection batch for
+    the (detector, OCR) pair. Otherwise, they are detected together in one call.
+    """
+    items = [(alpr, frame) for frame in frames]
+    if settings.inference_batch_max_size <= 1:
+        return await run_terminable(_detect_plates_batch_items, items)
+
+    batcher = batch_scheduler.get(
+        ("detector", detector_model, ocr_model),
+        _detect_plates_batch_items,
+        max_batch_size=settings.inference_batch_max_size,
+        max_wait_ms=settings.inference_batch_max_wait_ms,
+        slot=inference_scheduler.batch_slot,
     )
-    return await anyio.to_thread.run_sync(alpr_constructor)
+    return await batcher.submit_many(items)
+
+
+async def _run_alpr_many(
+    alpr: "ALPR",
+    detector_model: str,
+    ocr_model: str,
+    frames: list[np.ndarray],
+    precision: ModelPrecision = "fp32",
+) -> list[list["ALPRResult"]]:
+    """
+    Runs the ALPR pipeline as two batched stages over several frames.
+
+    All frames are detected together, and the plate crops from every frame are
+    then recognized together. Returns one list of results per frame.
+    """
+    from fast_alpr import ALPRResult
+
+    detections = await _detect_plates(alpr, detector_model, ocr_model, frames)
+    if not any(detections):
+        return [[] for _ in frames]
+
+    recognizer = await _get_ocr_recognizer(ocr_model, precision)
+    crops = [
+        _prepare_plate_crop(recognizer, _crop_plate(frame, detection.bounding_box))
+        for frame, frame_detections in zip(frames, detections, strict=True)
+        for detection in frame_detections
+    ]
+    predictions = iter(await _recognize_plates(recognizer, ocr_model, crops))
+    return [
+        [
+            ALPRResult(detection=detection, ocr=_to_ocr_result(next(predictions)))
+            for detection in frame_detections
+        ]
+        for frame_detections in detections
+    ]
+
+
+async def _run_alpr(
+    alpr: "ALPR",
+    detector_model: str,
+    ocr_model: str,
+    image_np: np.ndarray,
+    precision: ModelPrecision = "fp32",
+) -> list["ALPRResult"]:
+    """
+    Runs the ALPR pipeline on a frame.
+
+    When batching is enabled, detection is batched per (detector, OCR) pair and the
+    detected plate crops join the cross-request OCR batch for the OCR model.
+    """
+    if settings.inference_batch_max_size <= 1:
+        return await run_terminable(alpr.predict, image_np)
+    return (await _run_alpr_many(alpr, detector_model, ocr_model, [image_np], precision))[0]
 
 
 async def _detect_and_recognize_plate_logic(
     detector_model: str,
     ocr_model: str,
-    image_base64: Optional[str] = None,
+    image_base64: Optional[RawImage] = None,
     path: Optional[str] = None,
+    precision: ModelPrecision = "fp32",
+    cascade_detector_model: Optional[str] = None,
+    source: Optional[str] = None,
 ) -> list[types.ContentBlock]:
-    """Core logic to detect and recognize a license plate from an image."""
+    """
+    Core logic to detect and recognize a license plate from an image.
+
+    With a cascade detector, the frame is first run through `detector_model` and
+    only re-run through `cascade_detector_model` if the cascade policy asks for it.
+    With near-duplicate detection, a frame that looks like a recent frame of the
+    same `source` reuses its results; frames without a source are always run.
+    """
     try:
-        image_rgb = await _get_image_from_source(image_base64=image_base64, path=path)
+        image_np, factor = await _get_image_from_source(
+            image_base64=image_base64,
+            path=path,
+            min_size=_decode_min_size(detector_model, cascade_detector_model),
+        )
     except ImageFetchError as e:
         if e.status_code == 403:
             _logger.warning("Failed to load image for detection: %s. Returning empty result.", e)
@@ -430,29 +1026,273 @@ async def _detect_and_recognize_plate_logic(
         # tool failures to the caller.
         raise
 
-    alpr = await _get_alpr_instance(detector_model, ocr_model)
-    image_np = np.array(image_rgb)
-    results = await anyio.to_thread.run_sync(alpr.predict, image_np)
+    check_deadline("inference")
 
-    results_dict = [asdict(res) for res in results]
+    async def run_stage(model: str, frames: list[np.ndarray]) -> list[list["ALPRResult"]]:
+        alpr = await _get_alpr_instance(model, ocr_model, precision)
+        return [await _run_alpr(alpr, model, ocr_model, frames[0], precision)]
+
+    async def run(_: list[int]) -> list[list[dict[str, Any]]]:
+        async with _inference_slot():
+            return await _run_cascade(
+                [image_np], [factor], detector_model, cascade_detector_model, run_stage
+            )
+
+    models = (detector_model, cascade_detector_model, ocr_model, precision)
+
+    async def run_cached() -> list[dict[str, Any]]:
+        (results,) = await result_cache.run(
+            [image_np], [("alpr", *models, _DETECTOR_CONF_THRESH, factor)], run
+        )
+        return cast(list[dict[str, Any]], results)
+
+    if source is None:
+        # Without a source, frames of unrelated cameras could match each other.
+        results_dict = await run_cached()
+    else:
+        # The results of a near-duplicate frame only apply to frames of the same size.
+        results_dict = await near_duplicates.run(
+            (source, *models, image_np.shape[:2], factor), image_np, run_cached
+        )
 
     _logger.info(f"ALPR processed. Found {len(results_dict)} plate(s).")
     return [types.TextContent(type="text", text=json.dumps(results_dict))]
 
 
+def _decode_min_size(detector_model: str, cascade_detector_model: Optional[str]) -> int:
+    """
+    Returns the number of pixels that both sides of a decoded image must keep for
+    the detectors of a call, or 0 if images are decoded at full resolution.
+    """
+    if not settings.reduced_decode:
+        return 0
+    return max(
+        _detector_input_size(model) for model in (detector_model, cascade_detector_model) if model
+    )
+
+
+def _detector_input_size(detector_model: str) -> int:
+    """Returns the input size of a detector, which is part of its name."""
+    match = re.search(r"-(\d+)-license-plate", detector_model)
+    return int(match.group(1)) if match else 0
+
+
+def _scale_result(result: dict[str, Any], factor: int) -> dict[str, Any]:
+    """Maps the bounding box of a serialized result from a reduced image to the original image."""
+    if factor != 1:
+        box = result["detection"]["bounding_box"]
+        result["detection"]["bounding_box"] = {key: value * factor for key, value in box.items()}
+    return result
+
+
+async def _run_cascade(
+    frames: list[np.ndarray],
+    factors: Sequence[int],
+    detector_model: str,
+    cascade_detector_model: Optional[str],
+    run_stage: Callable[[str, list[np.ndarray]], Awaitable[list[list["ALPRResult"]]]],
+) -> list[list[dict[str, Any]]]:
+    """
+    Runs the ALPR pipeline over frames, through the detector cascade if one is set.
+
+    `run_stage` runs the pipeline of a detector over a list of frames. The frames
+    that need escalation after the fast stage are re-run, together, through the
+    cascade detector, whose results replace those of the fast stage unless it finds
+    no plate. Returns the serialized results of each frame, with the
+    bounding boxes scaled by the reduction factor of the frame; with a cascade,
+    each result also reports the stage and detector that produced it.
+    """
+    outputs = await run_stage(detector_model, frames)
+    if not cascade_detector_model or cascade_detector_model == detector_model:
+        return [
+            [_scale_result(asdict(res), factor) for res in results]
+            for results, factor in zip(outputs, factors, strict=True)
+        ]
+
+    stages: list[CascadeStage] = ["fast"] * len(frames)
+    escalate = [index for index, results in enumerate(outputs) if needs_escalation(results)]
+    cascade_stats.record(detector_model, cascade_detector_model, len(frames), len(escalate))
+    if escalate:
+        _logger.debug(
+            f"Escalating {len(escalate)} of {len(frames)} frame(s) to '{cascade_detector_model}'."
+        )
+        check_deadline("escalated inference")
+        escalated = await run_stage(cascade_detector_model, [frames[index] for index in escalate])
+        for index, results in zip(escalate, escalated, strict=True):
+            # A low-confidence plate of the fast stage beats no plate at all.
+            if results:
+                outputs[index] = results
+                stages[index] = "escalated"
+
+    stage_models = {"fast": detector_model, "escalated": cascade_detector_model}
+    return [
+        [
+            {
+                **_scale_result(asdict(res), factor),
+                "stage": stage,
+                "detector_model": stage_models[stage],
+            }
+            for res in results
+        ]
+        for results, stage, factor in zip(outputs, stages, factors, strict=True)
+    ]
+
+
+async def _load_batch_images(
+    items: list["BatchImageItem"], min_size: int = 0
+) -> list[tuple[Optional[np.ndarray], int, Optional[dict]]]:
+    """
+    Loads the images of a batch tool call with bounded concurrency.
+
+    Returns a `(frame, reduction factor, error)` triple per item. Items whose
+    remote host answers with HTTP 403 get neither a frame nor an error, mirroring
+    the single-image tools.
+    """
+    loaded: list[tuple[Optional[np.ndarray], int, Optional[dict]]] = [(None, 1, None)] * len(items)
+    limiter = anyio.Semaphore(settings.batch_tool_concurrency)
+
+    async def load(index: int, item: "BatchImageItem") -> None:
+        async with limiter:
+            try:
+                frame, factor = await _get_image_from_source(
+                    image_base64=item.image_base64, path=item.path, min_size=min_size
+                )
+                loaded[index] = (frame, factor, None)
+            except ImageFetchError as e:
+                if e.status_code == 403:
+                    _logger.warning("Failed to load batch item %d: %s. Returning empty.", index, e)
+                else:
+                    loaded[index] = (None, 1, _batch_item_error(e))
+            except Exception as e:
+                loaded[index] = (None, 1, _batch_item_error(e))
+
+    async with anyio.create_task_group() as tg:
+        for index, item in enumerate(items):
+            tg.start_soon(load, index, item)
+    return loaded
+
+
+def _batch_item_error(error: Exception) -> dict:
+    """Builds the per-item error payload of a batch tool result."""
+    if isinstance(error, ToolLogicError):
+        return error.error.model_dump(mode="json", exclude_none=True)
+    return {"code": ErrorCode.TOOL_LOGIC_ERROR.value, "message": str(error)}
+
+
+async def _batch_logic(
+    items: list["BatchImageItem"],
+    run_frames: Callable[[list[np.ndarray], list[int]], Awaitable[list[list[Any]]]],
+    cache_key: tuple,
+    min_size: int = 0,
+) -> list[types.ContentBlock]:
+    """
+    Core logic shared by the batch tools.
+
+    Loads all images, runs the successfully loaded frames whose results are not
+    cached (under `cache_key`) and their reduction factors through `run_frames`
+    in one batched call, and returns one entry per item holding either its
+    results or its error.
+    """
+    loaded = await _load_batch_images(items, min_size)
+    entries: list[dict[str, Any]] = [
+        {"index": index, "error": error} if error else {"index": index, "results": []}
+        for index, (_, _, error) in enumerate(loaded)
+    ]
+
+    indices = [index for index, (frame, _, _) in enumerate(loaded) if frame is not None]
+    frames = [frame for frame, _, _ in loaded if frame is not None]
+    factors = [factor for frame, factor, _ in loaded if frame is not None]
+    if indices:
+        check_deadline("inference")
+
+        async def run(positions: list[int]) -> list[list[Any]]:
+            async with _inference_slot(cost=len(positions)):
+                return await run_frames(
+                    [frames[position] for position in positions],
+                    [factors[position] for position in positions],
+                )
+
+        try:
+            outputs = await result_cache.run(
+                frames, [(*cache_key, factor) for factor in factors], run
+            )
+        except Exception as e:
+            _logger.exception("Batched inference failed for %d image(s).", len(indices))
+            for index in indices:
+                entries[index] = {"index": index, "error": _batch_item_error(e)}
+        else:
+            for index, results in zip(indices, outputs, strict=True):
+                entries[index]["results"] = results
+
+    failed = sum(1 for entry in entries if "error" in entry)
+    _logger.info(f"Batch processed {len(items)} image(s) with {failed} error(s).")
+    return [types.TextContent(type="text", text=json.dumps(entries))]
+
+
+async def _recognize_plates_batch_logic(
+    ocr_model: str, items: list["BatchImageItem"], precision: ModelPrecision = "fp32"
+) -> list[types.ContentBlock]:
+    """Core logic to recognize license plates from a list of pre-cropped images."""
+
+    async def run_frames(frames: list[np.ndarray], _: list[int]) -> list[list[Any]]:
+        recognizer = await _get_ocr_recognizer(ocr_model, precision)
+        plates = [_prepare_plate_crop(recognizer, frame) for frame in frames]
+        predictions = await _recognize_plates(recognizer, ocr_model, plates)
+        return [[_serialize_ocr_result(prediction)] for prediction in predictions]
+
+    return await _batch_logic(items, run_frames, ("ocr", ocr_model, precision))
+
+
+async def _detect_and_recognize_plates_batch_logic(
+    detector_model: str,
+    ocr_model: str,
+    items: list["BatchImageItem"],
+    precision: ModelPrecision = "fp32",
+    cascade_detector_model: Optional[str] = None,
+) -> list[types.ContentBlock]:
+    """Core logic to detect and recognize license plates in a list of images."""
+
+    async def run_stage(model: str, frames: list[np.ndarray]) -> list[list["ALPRResult"]]:
+        alpr = await _get_alpr_instance(model, ocr_model, precision)
+        return await _run_alpr_many(alpr, model, ocr_model, frames, precision)
+
+    async def run_frames(frames: list[np.ndarray], factors: list[int]) -> list[list[Any]]:
+        return await _run_cascade(
+            frames, factors, detector_model, cascade_detector_model, run_stage
+        )
+
+    return await _batch_logic(
+        items,
+        run_frames,
+        (
+            "alpr",
+            detector_model,
+            cascade_detector_model,
+            ocr_model,
+            precision,
+            _DETECTOR_CONF_THRESH,
+        ),
+        _decode_min_size(detector_model, cascade_detector_model),
+    )
+
+
 # --- Tool-specific wrapper functions ---
 
 
 async def recognize_plate_base64_tool(args: "RecognizePlateArgs") -> list[types.ContentBlock]:
     """Tool wrapper for recognizing a plate from a Base64 image."""
-    return await _recognize_plate_logic(ocr_model=args.ocr_model, image_base64=args.image_base64)
+    return await _recognize_plate_logic(
+        ocr_model=args.ocr_model, image_base64=args.image_base64, precision=args.precision
+    )
 
 
 async def recognize_plate_path_tool(
     args: "RecognizePlateFromPathArgs",
 ) -> list[types.ContentBlock]:
     """Tool wrapper for recognizing a plate from an image path or URL."""
-    return await _recognize_plate_logic(ocr_model=args.ocr_model, path=args.path)
+    return await _recognize_plate_logic(
+        ocr_model=args.ocr_model, path=args.path, precision=args.precision
+    )
 
 
 async def detect_and_recognize_plate_base64_tool(
@@ -463,6 +1303,9 @@ async def detect_and_recognize_plate_base64_tool(
         detector_model=args.detector_model,
         ocr_model=args.ocr_model,
         image_base64=args.image_base64,
+        precision=args.precision,
+        cascade_detector_model=args.cascade_detector_model,
+        source=args.source,
     )
 
 
@@ -471,38 +1314,48 @@ async def detect_and_recognize_plate_path_tool(
 ) -> list[types.ContentBlock]:
     """Tool wrapper for detecting and recognizing a plate from an image path or URL."""
     return await _detect_and_recognize_plate_logic(
-        detector_model=args.detector_model, ocr_model=args.ocr_model, path=args.path
+        detector_model=args.detector_model,
+        ocr_model=args.ocr_model,
+        path=args.path,
+        precision=args.precision,
+        cascade_detector_model=args.cascade_detector_model,
+        source=args.source,
+    )
+
+
+async def recognize_plates_batch_tool(
+    args: "RecognizePlatesBatchArgs",
+) -> list[types.ContentBlock]:
+    """Tool wrapper for recognizing plates from a list of images."""
+    return await _recognize_plates_batch_logic(
+        ocr_model=args.ocr_model, items=args.images, precision=args.precision
+    )
+
+
+async def detect_and_recognize_plates_batch_tool(
+    args: "DetectAndRecognizePlatesBatchArgs",
+) -> list[types.ContentBlock]:
+    """Tool wrapper for detecting and recognizing plates in a list of images."""
+    return await _detect_and_recognize_plates_batch_logic(
+        detector_model=args.detector_model,
+        ocr_model=args.ocr_model,
+        items=args.images,
+        precision=args.precision,
+        cascade_detector_model=args.cascade_detector_model,
     )
 
 
 async def list_models(_: ListModelsArgs) -> list[types.ContentBlock]:
-    """Lists available detector and OCR models."""
+    """Lists available detector and OCR models and the precisions they can run at."""
     models = {
         "detector_models": list(get_args(DetectorModel)),
         "ocr_models": list(get_args(OcrModel)),
+        "precisions": list(MODEL_PRECISIONS),
+        "default_precision": settings.model_precision,
     }
     return [types.TextContent(type="text", text=json.dumps(models))]
 
 
-def setup_cache():
-    """
-    Sets up the cache for model loading functions.
-
-    This function must be called after the settings are finalized (e.g., after
-    CLI overrides are applied) but before any tool is called. It re-wraps the
-    model loading functions with an `alru_cache` decorator configured with the
-    `model_cache_size` from the settings.
-    """
-    global _get_ocr_recognizer, _get_alpr_instance
-    if hasattr(_get_ocr_recognizer, "__wrapped__"):
-        _get_ocr_recognizer = _get_ocr_recognizer.__wrapped__
-    if hasattr(_get_alpr_instance, "__wrapped__"):
-        _get_alpr_instance = _get_alpr_instance.__wrapped__
-
-    _get_ocr_recognizer = alru_cache(maxsize=settings.model_cache_size)(_get_ocr_recognizer)
-    _get_alpr_instance = alru_cache(maxsize=settings.model_cache_size)(_get_alpr_instance)
-
-
 def setup_tools():
     """
     Initializes and registers all the tools for the application.
@@ -522,21 +1375,30 @@ def setup_tools():
         RecognizePlateArgs, \
         RecognizePlateFromPathArgs, \
         DetectAndRecognizePlateArgs, \
-        DetectAndRecognizePlateFromPathArgs
+        DetectAndRecognizePlateFromPathArgs, \
+        RecognizePlatesBatchArgs, \
+        DetectAndRecognizePlatesBatchArgs
 
-    class RecognizePlateArgs(BaseModel):
+    # The settings hold the model names as strings, which the models validate.
+    default_ocr_model = cast(OcrModel, settings.default_ocr_model)
+    default_detector_model = cast(DetectorModel, settings.default_detector_model)
+    default_cascade_detector_model = cast(Optional[DetectorModel], settings.cascade_detector_model)
+
+    class RecognizePlateArgs(InferenceCallOptions):
         """Input arguments for recognizing text from a license plate image."""
 
         model_config = ConfigDict(extra="forbid")
-        image_base64: Base64ImageStr
-        ocr_model: OcrModel = Field(default=settings.default_ocr_model)
+        image_base64: Base64Image
+        ocr_model: OcrModel = Field(default=default_ocr_model)
+        precision: ModelPrecision = Field(default=settings.model_precision)
 
-    class RecognizePlateFromPathArgs(BaseModel):
+    class RecognizePlateFromPathArgs(InferenceCallOptions):
         """Input arguments for recognizing text from a license plate image path."""
 
         model_config = ConfigDict(extra="forbid")
         path: str = Field(..., examples=["https://example.com/plate.jpg"])
-        ocr_model: OcrModel = Field(default=settings.default_ocr_model)
+        ocr_model: OcrModel = Field(default=default_ocr_model)
+        precision: ModelPrecision = Field(default=settings.model_precision)
 
         @field_validator("path")
         @classmethod
@@ -545,21 +1407,53 @@ def setup_tools():
                 raise ValueError("Path cannot be empty.")
             return v
 
-    class DetectAndRecognizePlateArgs(BaseModel):
+    class DetectAndRecognizePlateArgs(InferenceCallOptions):
         """Input arguments for detecting and recognizing a license plate from an image."""
 
         model_config = ConfigDict(extra="forbid")
-        image_base64: Base64ImageStr
-        detector_model: DetectorModel = Field(default=settings.default_detector_model)
-        ocr_model: OcrModel = Field(default=settings.default_ocr_model)
+        image_base64: Base64Image
+        detector_model: DetectorModel = Field(default=default_detector_model)
+        cascade_detector_model: Optional[DetectorModel] = Field(
+            default=default_cascade_detector_model,
+            description=(
+                "A larger detector that re-runs the images in which `detector_model` found no "
+                "plate (or, with the low_confidence cascade policy, a low-confidence plate)."
+            ),
+        )
+        ocr_model: OcrModel = Field(default=default_ocr_model)
+        precision: ModelPrecision = Field(default=settings.model_precision)
+        source: Optional[str] = Field(
+            default=None,
+            description=(
+                "An identifier of the camera that the image comes from. With near-duplicate "
+                "detection, an image that looks like a recent image of the same source reuses "
+                "its results. Images without a source are always run."
+            ),
+        )
 
-    class DetectAndRecognizePlateFromPathArgs(BaseModel):
+    class DetectAndRecognizePlateFromPathArgs(InferenceCallOptions):
         """Input arguments for detecting and recognizing a license plate from a path."""
 
         model_config = ConfigDict(extra="forbid")
         path: str = Field(..., examples=["https://example.com/car.jpg"])
-        detector_model: DetectorModel = Field(default=settings.default_detector_model)
-        ocr_model: OcrModel = Field(default=settings.default_ocr_model)
+        detector_model: DetectorModel = Field(default=default_detector_model)
+        cascade_detector_model: Optional[DetectorModel] = Field(
+            default=default_cascade_detector_model,
+            description=(
+                "A larger detector that re-runs the images in which `detector_model` found no "
+                "plate (or, with the low_confidence cascade policy, a low-confidence plate)."
+            ),
+        )
+        ocr_model: OcrModel = Field(default=default_ocr_model)
+        precision: ModelPrecision = Field(default=settings.model_precision)
+        source: Optional[str] = Field(
+            default=None,
+            description=(
+                "An identifier of the camera that the image comes from. With near-duplicate "
+                "detection, an image that looks like a recent image of the same source reuses "
+                "its results. Images without a source are always run."
+            ),
+        )
 
         @field_validator("path")
         @classmethod
@@ -568,6 +1462,34 @@ def setup_tools():
                 raise ValueError("Path cannot be empty.")
             return v
 
+    class RecognizePlatesBatchArgs(InferenceCallOptions):
+        """Input arguments for recognizing text from a list of license plate images."""
+
+        model_config = ConfigDict(extra="forbid")
+        images: list[BatchImageItem] = Field(
+            ..., min_length=1, max_length=settings.batch_tool_max_images
+        )
+        ocr_model: OcrModel = Field(default=default_ocr_model)
+        precision: ModelPrecision = Field(default=settings.model_precision)
+
+    class DetectAndRecognizePlatesBatchArgs(InferenceCallOptions):
+        """Input arguments for detecting and recognizing license plates in a list of images."""
+
+        model_config = ConfigDict(extra="forbid")
+        images: list[BatchImageItem] = Field(
+            ..., min_length=1, max_length=settings.batch_tool_max_images
+        )
+        detector_model: DetectorModel = Field(default=default_detector_model)
+        cascade_detector_model: Optional[DetectorModel] = Field(
+            default=default_cascade_detector_model,
+            description=(
+                "A larger detector that re-runs the images in which `detector_model` found no "
+                "plate (or, with the low_confidence cascade policy, a low-confidence plate)."
+            ),
+        )
+        ocr_model: OcrModel = Field(default=default_ocr_model)
+        precision: ModelPrecision = Field(default=settings.model_precision)
+
     # --- Tool Registration ---
 
     # Tool 1: recognize_plate
@@ -587,7 +1509,10 @@ def setup_tools():
     recognize_plate_from_path_tool_definition = types.Tool(
         name="recognize_plate_from_path",
         title="Recognize License Plate from Path",
-        description="Recognizes text from a pre-cropped license plate image located at a given URL or local file path.",
+        description=(
+            "Recognizes text from a pre-cropped license plate image located at a given URL "
+            "or local file path."
+        ),
         inputSchema=RecognizePlateFromPathArgs.model_json_schema(),
     )
     tool_registry.register_tool(
@@ -613,7 +1538,9 @@ def setup_tools():
     detect_and_recognize_plate_from_path_tool_definition = types.Tool(
         name="detect_and_recognize_plate_from_path",
         title="Detect and Recognize License Plate from Path",
-        description="Detects and recognizes license plates in an image at a given URL or local file path.",
+        description=(
+            "Detects and recognizes license plates in an image at a given URL or local file path."
+        ),
         inputSchema=DetectAndRecognizePlateFromPathArgs.model_json_schema(),
     )
     tool_registry.register_tool(
@@ -622,7 +1549,39 @@ def setup_tools():
         func=detect_and_recognize_plate_path_tool,
     )
 
-    # Tool 5: list_models
+    # Tool 5: recognize_plates_batch
+    recognize_plates_batch_tool_definition = types.Tool(
+        name="recognize_plates_batch",
+        title="Recognize License Plates in Batch",
+        description=(
+            "Recognizes text from a list of pre-cropped license plate images, given as Base64 "
+            "data or paths/URLs, and returns a result or an error per image."
+        ),
+        inputSchema=RecognizePlatesBatchArgs.model_json_schema(),
+    )
+    tool_registry.register_tool(
+        tool_definition=recognize_plates_batch_tool_definition,
+        model=RecognizePlatesBatchArgs,
+        func=recognize_plates_batch_tool,
+    )
+
+    # Tool 6: detect_and_recognize_plates_batch
+    detect_and_recognize_plates_batch_tool_definition = types.Tool(
+        name="detect_and_recognize_plates_batch",
+        title="Detect and Recognize License Plates in Batch",
+        description=(
+            "Detects and recognizes license plates in a list of images, given as Base64 data "
+            "or paths/URLs, and returns the results or an error per image."
+        ),
+        inputSchema=DetectAndRecognizePlatesBatchArgs.model_json_schema(),
+    )
+    tool_registry.register_tool(
+        tool_definition=detect_and_recognize_plates_batch_tool_definition,
+        model=DetectAndRecognizePlatesBatchArgs,
+        func=detect_and_recognize_plates_batch_tool,
+    )
+
+    # Tool 7: list_models
     list_models_tool_definition = types.Tool(
         name="list_models",
         title="List Available Models",
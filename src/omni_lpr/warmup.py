@@ -0,0 +1,119 @@
+"""
+Startup model preloading and warm-up.
+
+Loading a model (and downloading it on first use) and the first inference runs
+through ONNX Runtime are much slower than later calls. Preloading the configured
+detector and OCR model combinations at startup, and running a few inferences on
+a synthetic image, moves that cost out of the first requests. The readiness
+state tracks the progress, so that load balancers only route traffic to the
+server once it is warm.
+"""
+
+import logging
+import time
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from . import tools
+from .settings import settings
+
+_logger = logging.getLogger(__name__)
+
+# The synthetic images are random noise, so that the detector runs its full
+# post-processing even though it is unlikely to find a plate.
+_WARMUP_FRAME_SHAPE = (480, 640, 3)
+_WARMUP_PLATE_SHAPE = (64, 128, 3)
+
+
+class Readiness:
+    """Tracks whether the server has finished warming up its models."""
+
+    def __init__(self) -> None:
+        """Initializes the state as not ready."""
+        self.status = "starting"
+        self.error: Optional[str] = None
+        self.warmed_up: list[str] = []
+        self.duration_s: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the warm-up has finished successfully."""
+        return self.status == "ready"
+
+    def to_dict(self) -> dict:
+        """Returns the state as a JSON-serializable dictionary."""
+        state: dict[str, Any] = {"status": self.status, "models": self.warmed_up}
+        if self.duration_s is not None:
+            state["duration_s"] = round(self.duration_s, 3)
+        if self.error is not None:
+            state["error"] = self.error
+        return state
+
+
+# Singleton instance
+readiness = Readiness()
+
+
+def parse_model_combination(entry: str) -> tuple[str, str]:
+    """
+    Splits a `<detector_model>:<ocr_model>` preload entry.
+
+    Raises:
+        ValueError: If the entry does not name both models.
+    """
+    detector_model, sep, ocr_model = entry.strip().partition(":")
+    if not sep or not detector_model or not ocr_model:
+        raise ValueError(
+            f"Invalid preload entry '{entry}'. Expected '<detector_model>:<ocr_model>'."
+        )
+    return detector_model, ocr_model
+
+
+async def warm_up_models(
+    combinations: Sequence[str], iterations: int, state: Readiness = readiness
+) -> None:
+    """
+    Preloads model combinations and runs warm-up inferences on them.
+
+    Both the full ALPR pipeline (used by the detection tools) and the standalone
+    OCR model (used by the recognition tools) are loaded for each combination.
+    Failures are recorded in the readiness state rather than raised, so that the
+    server keeps serving liveness checks.
+
+    Args:
+        combinations: The `<detector_model>:<ocr_model>` entries to preload.
+        iterations: The number of warm-up inferences per model.
+        state: The readiness state to update.
+    """
+    state.status = "warming_up"
+    started = time.perf_counter()
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, _WARMUP_FRAME_SHAPE, dtype=np.uint8)
+    plate = rng.integers(0, 256, _WARMUP_PLATE_SHAPE, dtype=np.uint8)
+
+    try:
+        for entry in combinations:
+            detector_model, ocr_model = parse_model_combination(entry)
+            _logger.info(f"Warming up detector '{detector_model}' and OCR '{ocr_model}'.")
+            precision = settings.model_precision
+            alpr = await tools._get_alpr_instance(detector_model, ocr_model, precision)
+            recognizer = await tools._get_ocr_recognizer(ocr_model, precision)
+            plate_input = tools._prepare_plate_crop(recognizer, plate)
+            for _ in range(iterations):
+                await tools._run_alpr(alpr, detector_model, ocr_model, frame, precision)
+                await tools._recognize_plates(recognizer, ocr_model, [plate_input])
+            state.warmed_up.append(f"{detector_model}:{ocr_model}")
+    except Exception as e:
+        _logger.exception("Model warm-up failed.")
+        state.status = "failed"
+        state.error = str(e)
+        return
+    finally:
+        state.duration_s = time.perf_counter() - started
+
+    state.status = "ready"
+    _logger.info(
+        f"Warm-up finished for {len(state.warmed_up)} model combination(s) "
+        f"in {state.duration_s:.2f}s."
+    )
@@ -13,7 +13,23 @@ from starlette.types import Receive, Scope, Send
 from omni_lpr.event_store import InMemoryEventStore
 from omni_lpr.mcp import app as mcp_app
 from omni_lpr.rest import api_spec, setup_rest_routes
-from omni_lpr.tools import setup_cache, setup_tools, tool_registry
+from omni_lpr.tools import (
+    model_manager,
+    near_duplicates,
+    result_cache,
+    setup_tools,
+    tool_registry,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    """Keeps the inference results of one test from being served to another."""
+    result_cache.clear()
+    near_duplicates.clear()
+    yield
+    result_cache.clear()
+    near_duplicates.clear()
 
 
 @pytest.fixture
@@ -49,7 +65,7 @@ def create_test_app(with_tools: bool = True) -> Starlette:
         tool_registry._tool_definitions.clear()
         tool_registry._tool_models.clear()
         setup_tools()
-        setup_cache()
+        model_manager.clear()
     else:
         tool_registry._tools.clear()
         tool_registry._tool_definitions.clear()
@@ -57,9 +73,11 @@ def create_test_app(with_tools: bool = True) -> Starlette:
 
     # 5. Set up routes on the isolated app
     # We need to re-import the health_check to avoid scope issues
-    from omni_lpr.__main__ import health_check
+    from omni_lpr.__main__ import health_check, metrics, readiness_check
 
     health_route = Route("/api/health", endpoint=health_check, methods=["GET"])
+    ready_route = Route("/api/ready", endpoint=readiness_check, methods=["GET"])
+    metrics_route = Route("/api/metrics", endpoint=metrics, methods=["GET"])
 
     api_v1_app = Starlette()
     api_v1_app.router.routes.extend(setup_rest_routes())
@@ -69,6 +87,8 @@ def create_test_app(with_tools: bool = True) -> Starlette:
         [
             Mount("/mcp/", app=handle_streamable_http),
             health_route,
+            ready_route,
+            metrics_route,
             Mount("/api/v1", app=api_v1_app),
         ]
     )
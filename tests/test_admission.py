@@ -0,0 +1,87 @@
+import anyio
+import pytest
+
+from omni_lpr.admission import AdmissionController, OverloadedError
+from omni_lpr.errors import ErrorCode
+from omni_lpr.settings import settings
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    def apply(max_concurrency, max_queue, queue_timeout_s=5.0):
+        monkeypatch.setattr(settings, "admission_max_concurrency", max_concurrency)
+        monkeypatch.setattr(settings, "admission_max_queue", max_queue)
+        monkeypatch.setattr(settings, "admission_queue_timeout_s", queue_timeout_s)
+
+    return apply
+
+
+@pytest.mark.asyncio
+async def test_admission_queues_calls_beyond_concurrency(limits):
+    limits(max_concurrency=1, max_queue=1)
+    controller = AdmissionController()
+    order = []
+
+    async def call(name):
+        async with controller.admit("tool"):
+            order.append(f"start {name}")
+            await anyio.sleep(0.01)
+            order.append(f"end {name}")
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(call, "a")
+        await anyio.sleep(0)
+        tg.start_soon(call, "b")
+
+    assert order == ["start a", "end a", "start b", "end b"]
+    stats = controller.stats()["tool"]
+    assert stats["admitted"] == 2
+    assert stats["rejected"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_rejects_when_queue_is_full(limits):
+    limits(max_concurrency=1, max_queue=0)
+    controller = AdmissionController()
+
+    async with controller.admit("tool"):
+        with pytest.raises(OverloadedError) as exc_info:
+            async with controller.admit("tool"):
+                pass
+        # Other tools have their own slots.
+        async with controller.admit("other"):
+            pass
+
+    assert exc_info.value.error.code == ErrorCode.OVERLOADED
+    assert exc_info.value.retry_after >= 1
+    assert controller.stats()["tool"]["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_admission_rejects_after_queue_timeout(limits):
+    limits(max_concurrency=1, max_queue=4, queue_timeout_s=0.01)
+    controller = AdmissionController()
+
+    async with controller.admit("tool"):
+        with pytest.raises(OverloadedError, match="timed out in queue"):
+            async with controller.admit("tool"):
+                pass
+
+    assert controller.stats()["tool"]["queue_depth"] == 0
+    # The slot is free again once the first call finishes.
+    async with controller.admit("tool"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_admission_can_be_disabled(limits):
+    limits(max_concurrency=0, max_queue=0)
+    controller = AdmissionController()
+
+    async with controller.admit("tool"):
+        async with controller.admit("tool"):
+            pass
+
+    assert controller.stats() == {}
@@ -0,0 +1,142 @@
+from contextlib import asynccontextmanager
+
+import anyio
+import pytest
+
+from omni_lpr.batching import BatchScheduler, MicroBatcher
+from omni_lpr.context import RequestContext, request_context
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_coalesces_concurrent_submissions():
+    batches = []
+
+    def batch_fn(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=50)
+    results = {}
+
+    async def submit(value):
+        results[value] = await batcher.submit(value)
+
+    async with anyio.create_task_group() as tg:
+        for value in range(4):
+            tg.start_soon(submit, value)
+
+    assert results == {0: 0, 1: 2, 2: 4, 3: 6}
+    assert batches == [[0, 1, 2, 3]]
+    assert batcher.batches_run == 1
+    assert batcher.items_processed == 4
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_flushes_partial_batch_after_wait():
+    batcher = MicroBatcher(lambda items: [item + 1 for item in items], max_batch_size=8,
+                           max_wait_ms=1)
+    assert await batcher.submit(41) == 42
+    assert batcher.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_submit_many_spans_batches():
+    batches = []
+
+    def batch_fn(items):
+        batches.append(list(items))
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait_ms=1)
+    assert await batcher.submit_many(["a", "b", "c"]) == ["A", "B", "C"]
+    assert batches == [["a", "b"], ["c"]]
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_propagates_errors_to_all_items():
+    def batch_fn(items):
+        raise RuntimeError("inference failed")
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait_ms=50)
+    errors = []
+
+    async def submit(value):
+        try:
+            await batcher.submit(value)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(submit, 1)
+        tg.start_soon(submit, 2)
+
+    assert errors == ["inference failed", "inference failed"]
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_drops_cancelled_items():
+    batches = []
+
+    def batch_fn(items):
+        batches.append(list(items))
+        return items
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=20)
+
+    async def cancelled_submit():
+        with anyio.move_on_after(0.001):
+            await batcher.submit("cancelled")
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(cancelled_submit)
+        await anyio.sleep(0.005)
+        assert batcher.queue_depth == 0
+        tg.start_soon(batcher.submit, "kept")
+
+    assert batches == [["kept"]]
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_rejects_mismatched_result_count():
+    batcher = MicroBatcher(lambda items: [], max_batch_size=1, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="returned 0 results for 1 items"):
+        await batcher.submit("x")
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_holds_a_slot_per_batch():
+    slots = []
+
+    @asynccontextmanager
+    async def slot(contexts):
+        slots.append([context.client_id for context in contexts])
+        yield
+
+    batcher = MicroBatcher(lambda items: items, max_batch_size=3, max_wait_ms=50, slot=slot)
+
+    async def submit(client_id, items):
+        request_context.set(RequestContext(client_id))
+        return await batcher.submit_many(items)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(submit, "a", [1, 2])
+        tg.start_soon(submit, "b", [3, 4, 5])
+
+    assert slots == [["a", "a", "b"], ["b", "b"]]
+
+
+def test_micro_batcher_requires_positive_batch_size():
+    with pytest.raises(ValueError):
+        MicroBatcher(lambda items: items, max_batch_size=0, max_wait_ms=1)
+
+
+def test_batch_scheduler_reuses_batcher_per_key():
+    scheduler = BatchScheduler()
+    fn = lambda items: items  # noqa: E731
+    first = scheduler.get(("alpr", "det", "ocr"), fn, max_batch_size=4, max_wait_ms=5)
+    assert scheduler.get(("alpr", "det", "ocr"), fn, max_batch_size=4, max_wait_ms=5) is first
+    assert scheduler.get(("alpr", "other", "ocr"), fn, max_batch_size=4, max_wait_ms=5) is not first
+    assert set(scheduler.stats()) == {"alpr/det/ocr", "alpr/other/ocr"}
+
+    scheduler.clear()
+    assert scheduler.stats() == {}
@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from omni_lpr import tools
+from omni_lpr.cascade import CascadeStats, needs_escalation
+from omni_lpr.settings import settings
+
+
+def _result(confidence):
+    return SimpleNamespace(detection=SimpleNamespace(confidence=confidence), ocr=None)
+
+
+@pytest.fixture
+def cascade_policy(monkeypatch):
+    monkeypatch.setattr(settings, "cascade_min_confidence", 0.6)
+
+    def set_policy(policy):
+        monkeypatch.setattr(settings, "cascade_policy", policy)
+
+    return set_policy
+
+
+def test_empty_policy_escalates_frames_without_plates(cascade_policy):
+    cascade_policy("empty")
+    assert needs_escalation([])
+    assert not needs_escalation([_result(0.1)])
+
+
+def test_low_confidence_policy_also_escalates_uncertain_plates(cascade_policy):
+    cascade_policy("low_confidence")
+    assert needs_escalation([])
+    assert needs_escalation([_result(0.9), _result(0.5)])
+    assert not needs_escalation([_result(0.9), _result(0.6)])
+
+
+def test_cascade_stats_report_escalation_rate():
+    stats = CascadeStats()
+    stats.record("small", "large", frames=3, escalated=1)
+    stats.record("small", "large", frames=1, escalated=0)
+
+    assert stats.stats() == {"small->large": {"frames": 4, "escalated": 1, "escalation_rate": 0.25}}
+
+
+@pytest.mark.asyncio
+async def test_run_cascade_reruns_only_escalated_frames(cascade_policy, monkeypatch, mocker):
+    cascade_policy("low_confidence")
+    monkeypatch.setattr(tools, "cascade_stats", CascadeStats())
+    mocker.patch(
+        "omni_lpr.tools.asdict", side_effect=lambda res: {"confidence": res.detection.confidence}
+    )
+    frames = [np.full((2, 2), value, dtype=np.uint8) for value in range(3)]
+    fast_results = {0: [_result(0.9)], 1: [], 2: [_result(0.3)]}
+    calls = []
+
+    async def run_stage(model, stage_frames):
+        calls.append((model, [int(frame[0, 0]) for frame in stage_frames]))
+        if model == "small":
+            return [fast_results[int(frame[0, 0])] for frame in stage_frames]
+        return [[_result(0.8)] for _ in stage_frames]
+
+    outputs = await tools._run_cascade(frames, [1, 1, 1], "small", "large", run_stage)
+
+    assert calls == [("small", [0, 1, 2]), ("large", [1, 2])]
+    assert outputs == [
+        [{"confidence": 0.9, "stage": "fast", "detector_model": "small"}],
+        [{"confidence": 0.8, "stage": "escalated", "detector_model": "large"}],
+        [{"confidence": 0.8, "stage": "escalated", "detector_model": "large"}],
+    ]
+    assert tools.cascade_stats.stats()["small->large"]["escalated"] == 2
+
+
+@pytest.mark.asyncio
+async def test_run_cascade_keeps_fast_results_when_escalation_finds_nothing(
+    cascade_policy, monkeypatch, mocker
+):
+    cascade_policy("low_confidence")
+    monkeypatch.setattr(tools, "cascade_stats", CascadeStats())
+    mocker.patch(
+        "omni_lpr.tools.asdict", side_effect=lambda res: {"confidence": res.detection.confidence}
+    )
+
+    async def run_stage(model, stage_frames):
+        if model == "small":
+            return [[_result(0.3)] for _ in stage_frames]
+        return [[] for _ in stage_frames]
+
+    outputs = await tools._run_cascade([np.zeros((2, 2))], [1], "small", "large", run_stage)
+
+    assert outputs == [[{"confidence": 0.3, "stage": "fast", "detector_model": "small"}]]
+    assert tools.cascade_stats.stats()["small->large"]["escalated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_cascade_without_cascade_detector_runs_one_stage(mocker):
+    mocker.patch(
+        "omni_lpr.tools.asdict", side_effect=lambda res: {"confidence": res.detection.confidence}
+    )
+    calls = []
+
+    async def run_stage(model, stage_frames):
+        calls.append(model)
+        return [[] for _ in stage_frames]
+
+    outputs = await tools._run_cascade([np.zeros((2, 2))], [1], "small", None, run_stage)
+
+    assert calls == ["small"]
+    assert outputs == [[]]
@@ -0,0 +1,85 @@
+import time
+from contextlib import contextmanager
+
+import anyio
+import mcp.types as types
+import pytest
+
+from omni_lpr.context import RequestContext, request_context
+from omni_lpr.deadlines import DeadlineExceededError, check_deadline, enforce_deadline
+from omni_lpr.errors import ErrorCode
+from omni_lpr.tools import InferenceCallOptions, ToolRegistry
+
+
+@contextmanager
+def deadline(timeout_ms):
+    token = request_context.set(RequestContext().with_timeout(timeout_ms))
+    try:
+        yield
+    finally:
+        request_context.reset(token)
+
+
+def test_request_context_timeout_header():
+    context = RequestContext.from_headers({"x-request-timeout-ms": "250"}, "1.2.3.4")
+    assert 0 < context.remaining() <= 0.25
+    assert RequestContext.from_headers({}, "1.2.3.4").remaining() is None
+    for value in ("0", "-5", "soon"):
+        with pytest.raises(ValueError, match="X-Request-Timeout-Ms"):
+            RequestContext.from_headers({"x-request-timeout-ms": value}, "1.2.3.4")
+
+
+def test_with_timeout_keeps_earlier_deadline():
+    context = RequestContext().with_timeout(100)
+    assert context.with_timeout(10_000).deadline == context.deadline
+    assert context.with_timeout(1).deadline < context.deadline
+
+
+def test_check_deadline():
+    check_deadline("inference")
+
+    with deadline(1), pytest.raises(DeadlineExceededError) as exc_info:
+        time.sleep(0.002)
+        check_deadline("inference")
+    assert exc_info.value.error.code == ErrorCode.DEADLINE_EXCEEDED
+    assert exc_info.value.error.details == {"stage": "inference"}
+
+
+@pytest.mark.asyncio
+async def test_enforce_deadline_cancels_block():
+    started = time.monotonic()
+    with deadline(20), pytest.raises(DeadlineExceededError):
+        async with enforce_deadline("inference"):
+            await anyio.sleep(5)
+    assert time.monotonic() - started < 1
+
+
+@pytest.mark.asyncio
+async def test_enforce_deadline_passes_on_timeouts_of_the_block():
+    error = TimeoutError("The image server did not answer.")
+    with deadline(10_000), pytest.raises(TimeoutError) as exc_info:
+        async with enforce_deadline("inference"):
+            raise error
+    assert exc_info.value is error
+
+
+@pytest.mark.asyncio
+async def test_enforce_deadline_without_deadline():
+    async with enforce_deadline():
+        await anyio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_timeout_argument_sets_deadline_of_tool_call():
+    registry = ToolRegistry()
+
+    async def slow_tool(_args):
+        await anyio.sleep(5)
+        return []
+
+    definition = types.Tool(name="slow", description="", inputSchema={})
+    registry.register_tool(definition, InferenceCallOptions, slow_tool)
+
+    with pytest.raises(DeadlineExceededError):
+        await registry.call("slow", {"timeout_ms": 20})
+    assert request_context.get().deadline is None
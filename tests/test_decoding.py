@@ -0,0 +1,127 @@
+import io
+import threading
+import time
+
+import anyio
+import numpy as np
+import pytest
+from PIL import Image, UnidentifiedImageError
+
+from omni_lpr import decoding
+from omni_lpr.decoding import DecodePool, decode_image, reduction_factor
+from omni_lpr.settings import settings
+
+
+def _encode(image: Image.Image, image_format: str) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "image_format, size, min_size, expected",
+    [
+        ("JPEG", (4000, 3000), 608, 4),
+        ("JPEG", (4000, 3000), 256, 8),
+        ("JPEG", (1920, 1080), 608, 1),
+        ("JPEG", (4000, 3000), 0, 1),
+        ("PNG", (4000, 3000), 256, 1),
+    ],
+)
+def test_reduction_factor(image_format, size, min_size, expected):
+    assert reduction_factor(image_format, *size, min_size) == expected
+
+
+def test_decode_jpeg_at_reduced_scale():
+    data = _encode(Image.new("RGB", (800, 600), (255, 0, 0)), "JPEG")
+
+    image, factor = decode_image(data, min_size=100)
+
+    assert factor == 4
+    assert image.shape == (150, 200, 3)
+
+
+def test_decode_image_to_bgr_at_full_scale():
+    data = _encode(Image.new("RGB", (64, 32), (255, 0, 0)), "PNG")
+
+    image, factor = decode_image(data, min_size=16)
+
+    assert factor == 1
+    assert image.shape == (32, 64, 3)
+    assert image.dtype == np.uint8
+    assert image[0, 0].tolist() == [0, 0, 255]
+
+
+def test_decode_falls_back_to_pil():
+    data = _encode(Image.new("RGB", (8, 8), (0, 0, 255)), "GIF")
+
+    image, factor = decode_image(data)
+
+    assert factor == 1
+    assert image.shape == (8, 8, 3)
+    assert image[0, 0].tolist() == [255, 0, 0]
+
+
+def test_decode_invalid_data():
+    with pytest.raises(UnidentifiedImageError):
+        decode_image(b"this is not an image")
+
+
+@pytest.mark.asyncio
+async def test_decode_pool_decodes_off_the_event_loop(mocker):
+    threads = []
+
+    def fake_decode(data, min_size):
+        threads.append(threading.get_ident())
+        return np.zeros((1, 1, 3), dtype=np.uint8), 1
+
+    mocker.patch.object(decoding, "decode_image", side_effect=fake_decode)
+    pool = DecodePool()
+
+    image, factor = await pool.decode(b"image")
+
+    assert image.shape == (1, 1, 3)
+    assert factor == 1
+    assert threads and threads[0] != threading.get_ident()
+    assert pool.stats()["decodes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_decode_pool_bounds_concurrency(mocker):
+    mocker.patch.object(settings, "decode_concurrency", 2)
+    running = peak = 0
+    lock = threading.Lock()
+
+    def fake_decode(data, min_size):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return np.zeros((1, 1, 3), dtype=np.uint8), 1
+
+    mocker.patch.object(decoding, "decode_image", side_effect=fake_decode)
+    pool = DecodePool()
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(6):
+            tg.start_soon(pool.decode, b"image")
+
+    assert peak == 2
+    stats = pool.stats()
+    assert stats["decodes"] == 6
+    assert stats["active"] == 0
+    assert stats["concurrency"] == 2
+
+
+@pytest.mark.asyncio
+async def test_decode_pool_counts_failures():
+    pool = DecodePool()
+
+    with pytest.raises(UnidentifiedImageError):
+        await pool.decode(b"this is not an image")
+
+    assert pool.stats()["failures"] == 1
+    assert pool.stats()["decodes"] == 0
@@ -0,0 +1,184 @@
+import hashlib
+import importlib.util
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import anyio
+import httpx
+import pytest
+
+from omni_lpr.fetching import ImageFetcher
+from omni_lpr.settings import settings
+
+
+def _fetcher_with_transport(mocker, handler) -> ImageFetcher:
+    fetcher = ImageFetcher()
+    mocker.patch.object(
+        fetcher,
+        "_create_client",
+        side_effect=lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    return fetcher
+
+
+@pytest.mark.asyncio
+async def test_fetch_reuses_the_client(mocker):
+    fetcher = _fetcher_with_transport(mocker, lambda request: httpx.Response(200, content=b"jpeg"))
+
+    assert await fetcher.fetch("http://store.local/a.jpg") == b"jpeg"
+    assert await fetcher.fetch("http://store.local/b.jpg") == b"jpeg"
+
+    assert fetcher._create_client.call_count == 1
+    assert fetcher.stats()["fetches"] == 2
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fetch_raises_on_error_status(mocker):
+    fetcher = _fetcher_with_transport(mocker, lambda request: httpx.Response(404))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await fetcher.fetch("http://store.local/missing.jpg")
+
+    assert fetcher.stats()["failures"] == 1
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fetch_limits_connections_per_host(mocker):
+    mocker.patch.object(settings, "fetch_max_connections_per_host", 2)
+    running: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request):
+        host = request.url.host
+        running[host] = running.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), running[host])
+        await anyio.sleep(0.01)
+        running[host] -= 1
+        return httpx.Response(200, content=b"jpeg")
+
+    fetcher = _fetcher_with_transport(mocker, handler)
+    async with anyio.create_task_group() as tg:
+        for index in range(5):
+            tg.start_soon(fetcher.fetch, f"http://a.local/{index}.jpg")
+            tg.start_soon(fetcher.fetch, f"http://b.local/{index}.jpg")
+
+    assert peak == {"a.local": 2, "b.local": 2}
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fetch_drops_host_limiters_without_holders(mocker):
+    fetcher = _fetcher_with_transport(mocker, lambda request: httpx.Response(404))
+
+    for index in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            await fetcher.fetch(f"http://host-{index}.local/a.jpg")
+
+    assert fetcher._host_limiters == {}
+    assert fetcher._host_holders == {}
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(importlib.util.find_spec("h2") is not None, reason="h2 is installed")
+async def test_http2_without_h2_fails_at_start(mocker):
+    mocker.patch.object(settings, "fetch_http2", True)
+
+    with pytest.raises(RuntimeError, match="omni-lpr\\[http2\\]"):
+        await ImageFetcher().start()
+
+
+class _SnapshotHandler(BaseHTTPRequestHandler):
+    """Serves in-memory snapshots with an ETag, answering conditional requests with 304."""
+
+    snapshots: dict[str, bytes] = {}
+    requests: list[tuple[str, int]] = []
+
+    def do_GET(self):
+        body = self.snapshots.get(self.path)
+        if body is None:
+            self._reply(404, b"")
+            return
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._reply(304, b"", etag)
+        else:
+            self._reply(200, body, etag)
+
+    def _reply(self, status, body, etag=None):
+        self.requests.append((self.path, status))
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def snapshot_server():
+    _SnapshotHandler.snapshots = {}
+    _SnapshotHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SnapshotHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield _SnapshotHandler, f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_cache_revalidates(snapshot_server):
+    handler, base_url = snapshot_server
+    handler.snapshots["/cam1.jpg"] = b"first"
+    fetcher = ImageFetcher()
+
+    assert await fetcher.fetch(f"{base_url}/cam1.jpg") == b"first"
+    assert await fetcher.fetch(f"{base_url}/cam1.jpg") == b"first"
+    handler.snapshots["/cam1.jpg"] = b"second"
+    assert await fetcher.fetch(f"{base_url}/cam1.jpg") == b"second"
+
+    assert handler.requests == [("/cam1.jpg", 200), ("/cam1.jpg", 304), ("/cam1.jpg", 200)]
+    assert fetcher.stats()["cache"]["hits"] == 1
+    assert fetcher.stats()["cache"]["misses"] == 2
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fetch_cache_evicts_by_size(snapshot_server, mocker):
+    mocker.patch.object(settings, "fetch_cache_max_mb", 1)
+    handler, base_url = snapshot_server
+    handler.snapshots["/a.jpg"] = b"a" * 600_000
+    handler.snapshots["/b.jpg"] = b"b" * 600_000
+    fetcher = ImageFetcher()
+
+    await fetcher.fetch(f"{base_url}/a.jpg")
+    await fetcher.fetch(f"{base_url}/b.jpg")
+    await fetcher.fetch(f"{base_url}/a.jpg")
+
+    assert handler.requests == [("/a.jpg", 200), ("/b.jpg", 200), ("/a.jpg", 200)]
+    assert fetcher.stats()["cache"]["entries"] == 1
+    await fetcher.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fetch_cache_spills_to_disk(snapshot_server, mocker, tmp_path):
+    mocker.patch.object(settings, "fetch_cache_dir", str(tmp_path))
+    handler, base_url = snapshot_server
+    handler.snapshots["/cam1.jpg"] = b"snapshot"
+
+    fetcher = ImageFetcher()
+    await fetcher.fetch(f"{base_url}/cam1.jpg")
+    await fetcher.aclose()
+
+    restarted = ImageFetcher()
+    assert await restarted.fetch(f"{base_url}/cam1.jpg") == b"snapshot"
+
+    assert handler.requests == [("/cam1.jpg", 200), ("/cam1.jpg", 304)]
+    assert restarted.stats()["cache"]["disk_hits"] == 1
+    await restarted.aclose()
@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from omni_lpr import inference_pool
+from omni_lpr.inference_pool import (
+    InferencePool,
+    RemoteALPR,
+    RemoteRecognizer,
+    attach_frame,
+    share_frame,
+)
+from omni_lpr.settings import settings
+
+
+class InlinePool:
+    """Runs operations in the current process, going through shared memory."""
+
+    def __init__(self):
+        self.calls = []
+
+    def run(self, operation, *args, frames=None):
+        self.calls.append((operation, args, None if frames is None else len(frames)))
+        if frames is None:
+            return inference_pool._worker_call(operation, args, None)
+        shared = [share_frame(np.ascontiguousarray(frame)) for frame in frames]
+        try:
+            return inference_pool._worker_call(operation, args, [ref for _, ref in shared])
+        finally:
+            inference_pool._release([shm for shm, _ in shared])
+
+
+def test_share_and_attach_frame_round_trip():
+    frame = np.arange(24, dtype=np.uint8).reshape(2, 4, 3)
+    owner, ref = share_frame(frame)
+    try:
+        shm, attached = attach_frame(ref)
+        np.testing.assert_array_equal(attached, frame)
+        assert ref.shape == (2, 4, 3)
+        del attached
+        shm.close()
+    finally:
+        inference_pool._release([owner])
+
+
+def test_inference_pool_passes_frames_through_shared_memory():
+    def frame_sums(scale, frames):
+        return [int(frame.sum()) * scale for frame in frames]
+
+    # Threads stand in for the worker processes, whose operations cannot be patched.
+    with (
+        patch(
+            "omni_lpr.inference_pool.ProcessPoolExecutor",
+            lambda max_workers, **_: ThreadPoolExecutor(max_workers),
+        ),
+        patch.dict(inference_pool.OPERATIONS, {"frame_sums": frame_sums}),
+    ):
+        pool = InferencePool(processes=1)
+        try:
+            frames = [np.ones((2, 2), dtype=np.uint8), np.full((3, 3), 2, dtype=np.uint8)]
+            assert pool.run("frame_sums", 10, frames=frames) == [40, 180]
+        finally:
+            pool.shutdown()
+
+
+def test_remote_alpr_runs_models_of_the_worker():
+    alpr = MagicMock()
+    alpr.predict.side_effect = lambda frame: [int(frame.sum())]
+    pool = InlinePool()
+
+    with patch.dict(
+        inference_pool._worker_models, {("alpr", "det", "ocr", "fp32"): alpr}, clear=True
+    ):
+        remote = RemoteALPR(pool, "det", "ocr")
+        result = remote.predict(np.ones((4, 4, 3), dtype=np.uint8))
+
+    assert result == [48]
+    assert pool.calls == [("predict", ("det", "ocr", "fp32"), 1)]
+
+
+def test_remote_alpr_detect_batch():
+    alpr = MagicMock()
+    with (
+        patch.dict(
+            inference_pool._worker_models, {("alpr", "det", "ocr", "fp32"): alpr}, clear=True
+        ),
+        patch(
+            "omni_lpr.tools._detect_plates_batch", side_effect=lambda _, frames: [[len(frames)]] * 2
+        ) as mock_detect,
+    ):
+        result = RemoteALPR(InlinePool(), "det", "ocr").detect_batch(
+            [np.zeros((4, 4, 3), dtype=np.uint8)] * 2
+        )
+
+    assert result == [[2], [2]]
+    assert mock_detect.call_args.args[0] is alpr
+
+
+def test_remote_recognizer_runs_ocr_on_plate_list():
+    recognizer = MagicMock()
+    recognizer.config = SimpleNamespace(image_color_mode="grayscale")
+    recognizer.run.side_effect = lambda plates, return_confidence: [
+        f"{plate.shape[0]}:{return_confidence}" for plate in plates
+    ]
+
+    with patch.dict(
+        inference_pool._worker_models, {("ocr", "ocr", "fp32"): recognizer}, clear=True
+    ):
+        remote = RemoteRecognizer(InlinePool(), "ocr")
+        single = remote.run(np.zeros((5, 10), dtype=np.uint8))
+        many = remote.run(
+            [np.zeros((5, 10), dtype=np.uint8), np.zeros((6, 10), dtype=np.uint8)],
+            return_confidence=True,
+        )
+
+    assert remote.config.image_color_mode == "grayscale"
+    assert single == ["5:False"]
+    assert many == ["5:True", "6:True"]
+
+
+@pytest.mark.asyncio
+async def test_model_getters_use_process_pool_when_configured():
+    from omni_lpr import tools
+
+    pool = MagicMock()
+    pool.run.return_value = "rgb"
+    tools.model_manager.clear()
+    with (
+        patch.object(settings, "inference_backend", "process"),
+        patch("omni_lpr.tools.get_inference_pool", return_value=pool),
+    ):
+        recognizer = await tools._get_ocr_recognizer("ocr")
+        alpr = await tools._get_alpr_instance("det", "ocr")
+
+    assert isinstance(recognizer, RemoteRecognizer)
+    assert recognizer.config.image_color_mode == "rgb"
+    assert isinstance(alpr, RemoteALPR)
+    assert (alpr.detector_model, alpr.ocr_model) == ("det", "ocr")
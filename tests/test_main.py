@@ -25,7 +25,6 @@ def test_cli_argument_overrides(mocker):
 
     mock_uvicorn_run = mocker.patch("uvicorn.run")
     mock_setup_logging = mocker.patch("omni_lpr.__main__.setup_logging")
-    mock_setup_cache = mocker.patch("omni_lpr.__main__.setup_cache")
 
     try:
         runner = CliRunner()
@@ -52,7 +51,6 @@ def test_cli_argument_overrides(mocker):
         assert settings.model_cache_size == 10
 
         mock_setup_logging.assert_called_once_with("DEBUG")
-        mock_setup_cache.assert_called_once()
         mock_uvicorn_run.assert_called_once()
 
     finally:
@@ -0,0 +1,129 @@
+import anyio
+import pytest
+
+from omni_lpr.model_manager import ModelManager
+from omni_lpr.settings import settings
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_a_single_load():
+    manager = ModelManager()
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await anyio.sleep(0.01)
+        return object()
+
+    results = []
+
+    async def get():
+        results.append(await manager.get(("ocr", "model"), loader))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(get)
+
+    assert len(loads) == 1
+    assert all(result is results[0] for result in results)
+    assert await manager.get(("ocr", "model"), loader) is results[0]
+
+    stats = manager.stats()
+    assert stats["loaded"] == ["ocr/model"]
+    model_stats = stats["models"]["ocr/model"]
+    assert model_stats["loads"] == 1
+    assert model_stats["shared_loads"] == 4
+    assert model_stats["hits"] == 1
+    assert model_stats["avg_load_s"] >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_failed_loads_are_not_cached():
+    manager = ModelManager()
+    attempts = []
+
+    async def loader():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("download failed")
+        return "model"
+
+    with pytest.raises(RuntimeError, match="download failed"):
+        await manager.get("key", loader)
+    assert await manager.get("key", loader) == "model"
+    assert manager.stats()["models"]["key"]["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_load():
+    manager = ModelManager()
+
+    async def loader():
+        await anyio.sleep(0.02)
+        return "model"
+
+    with anyio.move_on_after(0.005):
+        await manager.get("key", loader)
+
+    assert await manager.get("key", loader) == "model"
+    assert manager.stats()["models"]["key"]["loads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_models_are_unloaded(monkeypatch):
+    monkeypatch.setattr(settings, "model_cache_size", 2)
+    manager = ModelManager()
+
+    async def loader():
+        return object()
+
+    for key in ("a", "b", "a", "c"):
+        await manager.get(key, loader)
+
+    assert manager.stats()["loaded"] == ["a", "c"]
+
+    manager.clear()
+    assert manager.stats()["loaded"] == []
+
+
+@pytest.mark.asyncio
+async def test_models_are_bounded_by_estimated_memory(monkeypatch):
+    monkeypatch.setattr(settings, "model_cache_max_mb", 3)
+    manager = ModelManager()
+
+    async def loader():
+        return "model"
+
+    async def load(key, size_mb, pinned=False):
+        return await manager.get(key, loader, lambda _: size_mb * 2**20, pinned=pinned)
+
+    await load("pinned", 1, pinned=True)
+    await load("a", 1)
+    await load("b", 1)
+    await load("c", 1)
+
+    stats = manager.stats()
+    assert stats["loaded"] == ["pinned", "b", "c"]
+    assert stats["estimated_bytes"] == 3 * 2**20
+    assert stats["models"]["a"]["evictions"] == 1
+    assert stats["models"]["pinned"]["pinned"] is True
+
+    # A model that is too large on its own is still kept until the next load.
+    await load("large", 5)
+    assert manager.stats()["loaded"] == ["pinned", "large"]
+
+
+@pytest.mark.asyncio
+async def test_idle_models_are_unloaded(monkeypatch):
+    monkeypatch.setattr(settings, "model_idle_ttl_s", 0.01)
+    manager = ModelManager()
+
+    async def loader():
+        return "model"
+
+    await manager.get("idle", loader)
+    await manager.get("pinned", loader, pinned=True)
+    await anyio.sleep(0.02)
+    await manager.get("fresh", loader)
+
+    assert manager.stats()["loaded"] == ["pinned", "fresh"]
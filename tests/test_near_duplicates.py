@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from omni_lpr.context import RequestContext, request_context
+from omni_lpr.near_duplicates import NearDuplicateIndex, hamming_distances, perceptual_hash
+from omni_lpr.settings import settings
+
+
+def _scene(seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 256, (12, 16, 3), dtype=np.uint8)
+    return np.kron(small, np.ones((40, 40, 1), dtype=np.uint8))
+
+
+def _noisy(frame: np.ndarray, seed: int) -> np.ndarray:
+    noise = np.random.default_rng(seed).integers(-6, 7, frame.shape)
+    return np.clip(frame.astype(int) + noise, 0, 255).astype(np.uint8)
+
+
+def _distance(a: np.ndarray, b: np.ndarray) -> int:
+    return int(hamming_distances(np.array([perceptual_hash(a)], np.uint64), perceptual_hash(b))[0])
+
+
+def test_perceptual_hash_matches_noisy_frames_only():
+    scene = _scene(1)
+
+    assert _distance(scene, _noisy(scene, 2)) <= 4
+    assert _distance(scene, _scene(3)) > 16
+
+
+def test_hamming_distances():
+    hashes = np.array([0, 0b1011, 2**64 - 1], dtype=np.uint64)
+
+    assert hamming_distances(hashes, 0b0001).tolist() == [1, 2, 63]
+
+
+@pytest.fixture
+def index(mocker):
+    mocker.patch.object(settings, "near_duplicate_detection", True)
+    return NearDuplicateIndex()
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_frames_reuse_results(index):
+    calls = 0
+
+    async def run():
+        nonlocal calls
+        calls += 1
+        return [{"plate": calls}]
+
+    scene = _scene(1)
+    assert await index.run("cam-1", scene, run) == [{"plate": 1}]
+    assert await index.run("cam-1", _noisy(scene, 2), run) == [{"plate": 1}]
+    assert await index.run("cam-2", _noisy(scene, 3), run) == [{"plate": 2}]
+    assert await index.run("cam-1", _scene(4), run) == [{"plate": 3}]
+
+    assert index.stats()["hits"] == 1
+    assert index.stats()["misses"] == 3
+    assert index.stats()["sources"] == 2
+
+
+@pytest.mark.asyncio
+async def test_results_are_reused_for_a_limited_time(index, mocker):
+    clock = mocker.patch("omni_lpr.near_duplicates.time.monotonic", return_value=100.0)
+
+    async def run():
+        return [clock.return_value]
+
+    scene = _scene(1)
+    await index.run("cam-1", scene, run)
+    clock.return_value = 100.0 + settings.near_duplicate_max_age_s + 1
+
+    assert await index.run("cam-1", scene, run) == [clock.return_value]
+
+
+@pytest.mark.asyncio
+async def test_bypass_cache_skips_near_duplicates(index):
+    calls = 0
+
+    async def run():
+        nonlocal calls
+        calls += 1
+        return []
+
+    await index.run("cam-1", _scene(1), run)
+    token = request_context.set(RequestContext(bypass_cache=True))
+    try:
+        await index.run("cam-1", _scene(1), run)
+    finally:
+        request_context.reset(token)
+
+    assert calls == 2
@@ -0,0 +1,143 @@
+import threading
+from pathlib import Path
+
+import anyio
+import numpy as np
+import onnxruntime as ort
+import pytest
+from onnxruntime.datasets import get_example
+
+from omni_lpr.ort_sessions import (
+    TerminableSession,
+    _run_options,
+    build_session_options,
+    estimate_session_bytes,
+    execution_providers,
+    make_terminable,
+    run_terminable,
+    session_source,
+)
+from omni_lpr.settings import settings
+
+
+@pytest.fixture
+def example_model():
+    return Path(get_example("sigmoid.onnx"))
+
+
+def _run(session):
+    x = np.zeros((3, 4, 5), dtype=np.float32)
+    return session.run(None, {session.get_inputs()[0].name: x})[0]
+
+
+def test_build_session_options_applies_settings(monkeypatch):
+    monkeypatch.setattr(settings, "ort_intra_op_threads", 4)
+    monkeypatch.setattr(settings, "ort_inter_op_threads", 2)
+    monkeypatch.setattr(settings, "ort_execution_mode", "parallel")
+    monkeypatch.setattr(settings, "ort_graph_optimization_level", "basic")
+
+    sess_options = build_session_options()
+
+    assert sess_options.intra_op_num_threads == 4
+    assert sess_options.inter_op_num_threads == 2
+    assert sess_options.execution_mode == ort.ExecutionMode.ORT_PARALLEL
+    assert sess_options.graph_optimization_level == ort.GraphOptimizationLevel.ORT_ENABLE_BASIC
+
+
+@pytest.mark.parametrize(
+    "device, expected",
+    [
+        ("auto", None),
+        ("cpu", ["CPUExecutionProvider"]),
+        ("cuda", ["CUDAExecutionProvider", "CPUExecutionProvider"]),
+        ("openvino", ["OpenVINOExecutionProvider", "CPUExecutionProvider"]),
+    ],
+)
+def test_execution_providers(monkeypatch, device, expected):
+    monkeypatch.setattr(settings, "execution_device", device)
+    assert execution_providers() == expected
+
+
+def test_session_source_without_cache_uses_original_model(monkeypatch, example_model):
+    monkeypatch.setattr(settings, "ort_optimized_model_dir", None)
+    with session_source("sigmoid", example_model) as (model_path, sess_options):
+        assert model_path == example_model
+        assert sess_options.optimized_model_filepath == ""
+
+
+def test_session_source_caches_optimized_model(monkeypatch, tmp_path, example_model):
+    monkeypatch.setattr(settings, "ort_optimized_model_dir", str(tmp_path))
+
+    with session_source("sigmoid", example_model) as (model_path, sess_options):
+        assert model_path == example_model
+        expected = _run(ort.InferenceSession(str(model_path), sess_options))
+
+    cached = list(tmp_path.iterdir())
+    assert len(cached) == 1
+    assert cached[0].name.startswith("sigmoid.all.")
+    assert cached[0].suffix == ".onnx"
+
+    with session_source("sigmoid", example_model) as (model_path, sess_options):
+        assert model_path == cached[0]
+        assert sess_options.graph_optimization_level == ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        np.testing.assert_allclose(
+            _run(ort.InferenceSession(str(model_path), sess_options)), expected
+        )
+
+
+def test_session_source_discards_partial_files_on_failure(monkeypatch, tmp_path, example_model):
+    monkeypatch.setattr(settings, "ort_optimized_model_dir", str(tmp_path))
+
+    with pytest.raises(RuntimeError):
+        with session_source("sigmoid", example_model) as (_, sess_options):
+            Path(sess_options.optimized_model_filepath).write_bytes(b"partial")
+            raise RuntimeError("session creation failed")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_terminable_session_uses_run_options_of_inference_call(example_model):
+    owner = type("Owner", (), {})()
+    owner.model = ort.InferenceSession(str(example_model))
+    make_terminable(owner)
+    assert isinstance(owner.model, TerminableSession)
+    assert owner.model.get_inputs()[0].name
+
+    run_options = ort.RunOptions()
+    run_options.terminate = True
+    token = _run_options.set(run_options)
+    try:
+        with pytest.raises(Exception, match="[Tt]erminat"):
+            _run(owner.model)
+    finally:
+        _run_options.reset(token)
+    assert _run(owner.model).shape == (3, 4, 5)
+
+
+@pytest.mark.asyncio
+async def test_run_terminable_terminates_runs_when_cancelled():
+    started, release = threading.Event(), threading.Event()
+    seen = []
+
+    def inference():
+        seen.append(_run_options.get())
+        started.set()
+        release.wait(5)
+
+    with anyio.move_on_after(0.05):
+        await run_terminable(inference)
+    release.set()
+
+    assert started.is_set()
+    assert seen[0].terminate
+    assert await run_terminable(lambda x: x + 1, 1) == 2
+
+
+def test_estimate_session_bytes(example_model):
+    session = ort.InferenceSession(str(example_model))
+    expected = 2 * example_model.stat().st_size
+
+    assert estimate_session_bytes(session) == expected
+    assert estimate_session_bytes(TerminableSession(session)) == expected
+    assert estimate_session_bytes(ort.InferenceSession(example_model.read_bytes())) == expected
+    assert estimate_session_bytes(None) == 0
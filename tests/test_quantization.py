@@ -0,0 +1,61 @@
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from omni_lpr.quantization import model_file, variant_name
+from omni_lpr.settings import settings
+
+
+@pytest.fixture
+def quantize_dynamic(monkeypatch, tmp_path):
+    """Replaces ONNX Runtime's quantization tool, which needs the optional `onnx` package."""
+    calls = []
+
+    def fake_quantize_dynamic(model_input, model_output, weight_type):
+        calls.append((model_input, weight_type))
+        model_output.write_bytes(b"int8:" + model_input.read_bytes())
+
+    monkeypatch.setitem(
+        sys.modules,
+        "onnxruntime.quantization",
+        SimpleNamespace(
+            QuantType=SimpleNamespace(QInt8="QInt8"), quantize_dynamic=fake_quantize_dynamic
+        ),
+    )
+    monkeypatch.setattr(settings, "quantized_model_dir", str(tmp_path / "quantized"))
+    return calls
+
+
+def test_variant_name():
+    assert variant_name("cct-xs-v1-global-model", "fp32") == "cct-xs-v1-global-model"
+    assert variant_name("cct-xs-v1-global-model", "int8") == "cct-xs-v1-global-model-int8"
+
+
+def test_fp32_uses_the_original_model(tmp_path):
+    model_path = tmp_path / "model.onnx"
+    assert model_file("model", model_path, "fp32") == model_path
+
+
+def test_int8_model_is_quantized_once_and_cached(quantize_dynamic, tmp_path):
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"fp32")
+
+    first = model_file("model", model_path, "int8")
+    second = model_file("model", model_path, "int8")
+
+    assert first == second
+    assert first.parent == tmp_path / "quantized"
+    assert first.name.startswith("model-int8.")
+    assert first.read_bytes() == b"int8:fp32"
+    assert quantize_dynamic == [(model_path, "QInt8")]
+    # No temporary files are left behind.
+    assert list(first.parent.iterdir()) == [first]
+
+
+def test_int8_without_onnx_package_fails_with_install_hint(monkeypatch, tmp_path):
+    monkeypatch.setitem(sys.modules, "onnxruntime.quantization", None)
+    monkeypatch.setattr(settings, "quantized_model_dir", str(tmp_path))
+
+    with pytest.raises(RuntimeError, match=r"omni-lpr\[quantization\]"):
+        model_file("model", tmp_path / "model.onnx", "int8")
@@ -0,0 +1,204 @@
+import sqlite3
+
+import anyio
+import numpy as np
+import pytest
+
+from omni_lpr.context import RequestContext, request_context
+from omni_lpr.result_cache import ResultCache, image_digest, image_digests
+from omni_lpr.settings import settings
+
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+def test_image_digest_covers_pixels_and_shape():
+    assert image_digest(_frame(1)) == image_digest(_frame(1))
+    assert image_digest(_frame(1)) != image_digest(_frame(2))
+    assert image_digest(np.zeros((2, 8), np.uint8)) != image_digest(np.zeros((8, 2), np.uint8))
+
+
+@pytest.mark.asyncio
+async def test_run_runs_only_uncached_images():
+    cache = ResultCache()
+    calls = []
+
+    async def run(indices):
+        calls.append(indices)
+        return [[f"plate-{index}"] for index in indices]
+
+    parts = [("ocr", "model")] * 2
+    assert await cache.run([_frame(1), _frame(2)], parts, run) == [["plate-0"], ["plate-1"]]
+    assert await cache.run([_frame(3), _frame(2)], parts, run) == [["plate-0"], ["plate-1"]]
+
+    assert calls == [[0, 1], [0]]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 3
+
+
+@pytest.mark.asyncio
+async def test_results_are_keyed_by_models():
+    cache = ResultCache()
+
+    async def run(indices):
+        return [["plate"] for _ in indices]
+
+    await cache.run([_frame(1)], [("ocr", "a")], run)
+    await cache.run([_frame(1)], [("ocr", "b")], run)
+
+    assert cache.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_results_are_keyed_by_version_and_cascade_settings(monkeypatch):
+    cache = ResultCache()
+
+    async def run(indices):
+        return [["plate"] for _ in indices]
+
+    await cache.run([_frame(1)], [("alpr", "a")], run)
+    monkeypatch.setattr(settings, "cascade_policy", "empty")
+    await cache.run([_frame(1)], [("alpr", "a")], run)
+    monkeypatch.setattr(settings, "cascade_min_confidence", 0.9)
+    await cache.run([_frame(1)], [("alpr", "a")], run)
+    monkeypatch.setattr(settings, "pkg_version", "99.0.0")
+    await cache.run([_frame(1)], [("alpr", "a")], run)
+    await cache.run([_frame(1)], [("alpr", "a")], run)
+
+    assert cache.stats()["misses"] == 4
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bypass_skips_the_cache():
+    cache = ResultCache()
+    calls = 0
+
+    async def run(indices):
+        nonlocal calls
+        calls += 1
+        return [["plate"] for _ in indices]
+
+    token = request_context.set(RequestContext(bypass_cache=True))
+    try:
+        await cache.run([_frame(1)], [("ocr",)], run)
+        await cache.run([_frame(1)], [("ocr",)], run)
+    finally:
+        request_context.reset(token)
+
+    assert calls == 2
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bypassed"] == 2
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, mocker, tmp_path):
+    mocker.patch.object(settings, "result_cache_backend", request.param)
+    mocker.patch.object(settings, "result_cache_path", str(tmp_path / "results.sqlite3"))
+    return request.param
+
+
+@pytest.mark.asyncio
+async def test_put_evicts_by_count_and_bytes(backend, mocker):
+    mocker.patch.object(settings, "result_cache_size", 2)
+    mocker.patch.object(settings, "result_cache_max_mb", 1)
+    cache = ResultCache()
+
+    await cache.put("a", ["a"])
+    await cache.put("b", ["b"])
+    await cache.get("a")
+    await cache.put("c", ["c"])
+    assert await cache.get("b") is None
+    assert await cache.get("a") == ["a"]
+
+    await cache.put("large", ["x" * 2**20])
+    assert await cache.get("large") is None
+    await cache.put("half", ["x" * 2**19])
+    await cache.put("other half", ["y" * 2**19])
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] <= 2**20
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_results_expire(backend, mocker):
+    mocker.patch.object(settings, "result_cache_ttl_s", 60.0)
+    clock = mocker.patch("omni_lpr.result_cache.time.time", return_value=1000.0)
+    cache = ResultCache()
+
+    await cache.put("a", ["a"])
+    clock.return_value = 1059.0
+    assert await cache.get("a") == ["a"]
+    clock.return_value = 1061.0
+    assert await cache.get("a") is None
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_results_are_shared_and_kept_across_restarts(mocker, tmp_path):
+    mocker.patch.object(settings, "result_cache_backend", "sqlite")
+    mocker.patch.object(settings, "result_cache_path", str(tmp_path / "results.sqlite3"))
+    calls = 0
+
+    async def run(indices):
+        nonlocal calls
+        calls += 1
+        return [["plate"] for _ in indices]
+
+    worker, other_worker = ResultCache(), ResultCache()
+    await worker.start()
+    await worker.run([_frame(1)], [("ocr",)], run)
+    assert await other_worker.run([_frame(1)], [("ocr",)], run) == [["plate"]]
+    await worker.aclose()
+    await other_worker.aclose()
+
+    restarted = ResultCache()
+    await restarted.start()
+    assert await restarted.run([_frame(1)], [("ocr",)], run) == [["plate"]]
+
+    assert calls == 1
+    assert restarted.stats()["hits"] == 1
+    assert restarted.stats()["entries"] == 1
+    await restarted.aclose()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_stats_do_not_query_the_database(mocker, tmp_path):
+    mocker.patch.object(settings, "result_cache_backend", "sqlite")
+    mocker.patch.object(settings, "result_cache_path", str(tmp_path / "results.sqlite3"))
+    cache = ResultCache()
+    await cache.put("a", ["a"])
+    mocker.patch.object(cache._get_store(), "_connect", side_effect=AssertionError)
+
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == len('["a"]')
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failing_store_runs_the_images(mocker, tmp_path):
+    mocker.patch.object(settings, "result_cache_backend", "sqlite")
+    mocker.patch.object(settings, "result_cache_path", str(tmp_path / "results.sqlite3"))
+    cache = ResultCache()
+    mocker.patch.object(
+        cache._get_store(), "get_many", side_effect=sqlite3.OperationalError("locked")
+    )
+
+    async def run(indices):
+        return [["plate"] for _ in indices]
+
+    assert await cache.run([_frame(1)], [("ocr",)], run) == [["plate"]]
+    assert cache.stats()["errors"] == 1
+    await cache.aclose()
+
+
+@pytest.mark.asyncio
+async def test_large_images_are_hashed_off_the_event_loop(mocker):
+    run_sync = mocker.spy(anyio.to_thread, "run_sync")
+    small, large = _frame(1), np.zeros((1000, 1000, 3), dtype=np.uint8)
+
+    assert await image_digests([small]) == [image_digest(small)]
+    assert run_sync.call_count == 0
+    assert await image_digests([small, large]) == [image_digest(small), image_digest(large)]
+    assert run_sync.call_count == 1
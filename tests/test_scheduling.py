@@ -0,0 +1,222 @@
+import anyio
+import mcp.types as types
+import pytest
+
+from omni_lpr import scheduling
+from omni_lpr.context import RequestContext, request_context
+from omni_lpr.scheduling import FairScheduler
+from omni_lpr.settings import settings
+from omni_lpr.tools import InferenceCallOptions, ToolRegistry
+
+
+@pytest.fixture
+def single_slot(monkeypatch):
+    monkeypatch.setattr(settings, "scheduler_max_concurrency", 1)
+    monkeypatch.setattr(settings, "scheduler_default_priority", "realtime")
+    monkeypatch.setattr(settings, "scheduler_client_weights", {})
+
+
+async def _run_queued(scheduler, dispatches):
+    """Queues dispatches behind a running one and returns the order in which they ran."""
+    order = []
+    release = anyio.Event()
+
+    async def blocker():
+        async with scheduler.slot():
+            await release.wait()
+
+    async def dispatch(name, context):
+        request_context.set(context)
+        async with scheduler.slot():
+            order.append(name)
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(blocker)
+        await anyio.sleep(0)
+        for name, context in dispatches:
+            tg.start_soon(dispatch, name, context)
+            await anyio.sleep(0)
+        release.set()
+
+    return order
+
+
+@pytest.mark.asyncio
+async def test_realtime_dispatches_run_before_batch_dispatches(single_slot):
+    scheduler = FairScheduler()
+    order = await _run_queued(
+        scheduler,
+        [
+            ("batch-1", RequestContext("a", "batch")),
+            ("batch-2", RequestContext("a", "batch")),
+            ("realtime", RequestContext("b", "realtime")),
+        ],
+    )
+
+    assert order == ["realtime", "batch-1", "batch-2"]
+    stats = scheduler.stats()
+    assert stats["active"] == 0
+    assert stats["classes"]["batch"] == {"queue_depth": 0, "granted": 2}
+
+
+@pytest.mark.asyncio
+async def test_clients_share_slots_fairly(single_slot):
+    order = await _run_queued(
+        FairScheduler(),
+        [("a", RequestContext("a")) for _ in range(3)] + [("b", RequestContext("b"))],
+    )
+
+    assert order == ["a", "b", "a", "a"]
+
+
+@pytest.mark.asyncio
+async def test_client_weights_set_the_share_of_slots(single_slot, monkeypatch):
+    monkeypatch.setattr(settings, "scheduler_client_weights", {"a": 3.0})
+    order = await _run_queued(
+        FairScheduler(),
+        [("a", RequestContext("a")) for _ in range(4)] + [("b", RequestContext("b"))] * 2,
+    )
+
+    assert order == ["a", "a", "a", "b", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_batch_slot_waits_in_the_highest_class_and_charges_each_client(single_slot):
+    scheduler = FairScheduler()
+    order = []
+    release = anyio.Event()
+    contexts = [
+        RequestContext("bulk", "batch"),
+        RequestContext("rt-1", "realtime"),
+        RequestContext("rt-2", "realtime"),
+        RequestContext("rt-1", "realtime"),
+    ]
+
+    async def blocker():
+        async with scheduler.slot():
+            await release.wait()
+
+    async def dispatch():
+        request_context.set(RequestContext("other", "batch"))
+        async with scheduler.slot():
+            order.append("other")
+
+    async def batch():
+        async with scheduler.batch_slot(contexts):
+            order.append("batch")
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(blocker)
+        await anyio.sleep(0)
+        tg.start_soon(dispatch)
+        await anyio.sleep(0)
+        tg.start_soon(batch)
+        await anyio.sleep(0)
+        assert scheduler._finish_tags == {
+            ("realtime", "anonymous"): 1.0,
+            ("batch", "other"): 1.0,
+            ("batch", "bulk"): 1.0,
+            ("realtime", "rt-1"): 2.0,
+            ("realtime", "rt-2"): 1.0,
+        }
+        release.set()
+
+    assert order == ["batch", "other"]
+    assert scheduler.stats()["classes"]["realtime"]["granted"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_hold_a_slot(single_slot):
+    scheduler = FairScheduler()
+    release = anyio.Event()
+    ran = []
+
+    async def blocker():
+        async with scheduler.slot():
+            await release.wait()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(blocker)
+        await anyio.sleep(0)
+        with anyio.move_on_after(0.01):
+            async with scheduler.slot():
+                ran.append("cancelled")
+        assert scheduler.stats()["classes"]["realtime"]["queue_depth"] == 0
+        release.set()
+
+    async with scheduler.slot():
+        ran.append("next")
+
+    assert ran == ["next"]
+    assert scheduler.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_finish_tags_of_idle_clients_are_dropped(single_slot, monkeypatch):
+    monkeypatch.setattr(scheduling, "_MAX_FINISH_TAGS", 4)
+    scheduler = FairScheduler()
+    order = await _run_queued(
+        scheduler, [(str(client), RequestContext(str(client))) for client in range(10)]
+    )
+
+    assert order == [str(client) for client in range(10)]
+    assert scheduler._finish_tags == {}
+
+    release = anyio.Event()
+
+    async def blocker():
+        async with scheduler.slot():
+            await release.wait()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(blocker)
+        await anyio.sleep(0)
+        for client in range(10):
+            scheduler._tag("realtime", str(client), 1.0)
+        assert len(scheduler._finish_tags) <= 8
+        release.set()
+
+
+@pytest.mark.asyncio
+async def test_scheduling_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "scheduler_max_concurrency", 0)
+    scheduler = FairScheduler()
+
+    async with scheduler.slot(), scheduler.slot():
+        assert scheduler.stats()["active"] == 0
+
+
+def test_request_context_from_headers():
+    context = RequestContext.from_headers(
+        {"x-client-id": "cam-1", "x-priority": "Batch"}, "1.2.3.4"
+    )
+    assert context == RequestContext("cam-1", "batch")
+    assert RequestContext.from_headers({}, "1.2.3.4") == RequestContext("1.2.3.4", None)
+    with pytest.raises(ValueError):
+        RequestContext.from_headers({"x-priority": "urgent"}, "1.2.3.4")
+    assert RequestContext.from_headers(
+        {"cache-control": "no-cache"}, "1.2.3.4"
+    ).bypass_cache
+
+
+@pytest.mark.asyncio
+async def test_priority_argument_overrides_request_context():
+    registry = ToolRegistry()
+    seen = []
+
+    async def tool(_args):
+        seen.append(request_context.get())
+        return []
+
+    definition = types.Tool(name="tool", description="", inputSchema={})
+    registry.register_tool(definition, InferenceCallOptions, tool)
+
+    token = request_context.set(RequestContext("cam-1", "realtime"))
+    try:
+        await registry.call("tool", {"priority": "batch"})
+        await registry.call("tool", {})
+        assert request_context.get() == RequestContext("cam-1", "realtime")
+    finally:
+        request_context.reset(token)
+
+    assert seen == [RequestContext("cam-1", "batch"), RequestContext("cam-1", "realtime")]
@@ -1,4 +1,5 @@
-from unittest.mock import AsyncMock
+import io
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -13,6 +14,46 @@ async def test_health_check(test_app_client):
     assert "version" in response_json
 
 
+@pytest.mark.asyncio
+async def test_readiness_check(test_app_client, monkeypatch):
+    """Test that the readiness endpoint only succeeds after the model warm-up."""
+    from omni_lpr.warmup import readiness
+
+    monkeypatch.setattr(readiness, "status", "warming_up")
+    response = await test_app_client.get("/api/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming_up"
+
+    monkeypatch.setattr(readiness, "status", "ready")
+    response = await test_app_client.get("/api/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+@pytest.mark.asyncio
+async def test_invoke_tool_rejects_overloaded_tool(test_app_client, monkeypatch):
+    """Test that calls beyond a tool's admission limits are rejected with 429."""
+    from omni_lpr.settings import settings
+    from omni_lpr.tools import tool_registry
+
+    monkeypatch.setattr(settings, "admission_max_concurrency", 1)
+    monkeypatch.setattr(settings, "admission_max_queue", 0)
+    tool_registry.admission.clear()
+
+    try:
+        async with tool_registry.admission.admit("list_models"):
+            response = await test_app_client.post("/api/v1/tools/list_models/invoke")
+            metrics = (await test_app_client.get("/api/metrics")).json()
+    finally:
+        tool_registry.admission.clear()
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["error"]["code"] == "OVERLOADED"
+    assert metrics["admission"]["list_models"]["rejected"] == 1
+    assert metrics["admission"]["list_models"]["in_flight"] == 1
+
+
 @pytest.mark.asyncio
 async def test_list_tools_with_no_tools(no_tools_test_app_client):
     """Test the GET /tools endpoint when no tools are registered."""
@@ -73,7 +114,7 @@ async def test_tool_invocation_with_multipart_form_data(test_app_client, test_da
     """Test invoking a tool with a multipart/form-data request (file upload)."""
     # Mock the actual model loading and processing
     mocker.patch("anyio.to_thread.run_sync", return_value=["MOCKED-RESULT"])
-    mocker.patch("omni_lpr.tools._get_image_from_source", new_callable=AsyncMock)
+    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1))
     mocker.patch("omni_lpr.tools._get_ocr_recognizer")
 
     image_path = test_data_path / "dummy_image.png"
@@ -119,6 +160,89 @@ async def test_tool_invocation_validation_error(test_app_client):
     assert response.json()["error"]["code"] == "VALIDATION_ERROR"
 
 
+@pytest.mark.asyncio
+async def test_tool_invocation_invalid_priority_header(test_app_client):
+    """Test invoking a tool with an unknown priority class returns 400."""
+    response = await test_app_client.post(
+        "/api/v1/tools/list_models/invoke", json={}, headers={"X-Priority": "urgent"}
+    )
+    assert response.status_code == 400
+    assert "X-Priority" in response.json()["error"]["message"]
+
+
+@pytest.mark.asyncio
+async def test_tool_invocation_deadline_exceeded(test_app_client, mocker):
+    """Test that a tool call that outlives its X-Request-Timeout-Ms returns 504."""
+    import anyio
+
+    async def slow_call(*args, **kwargs):
+        await anyio.sleep(5)
+
+    mocker.patch("omni_lpr.tools._recognize_plate_logic", side_effect=slow_call)
+    response = await test_app_client.post(
+        "/api/v1/tools/recognize_plate_from_path/invoke",
+        json={"path": "plate.jpg"},
+        headers={"X-Request-Timeout-Ms": "50"},
+    )
+    assert response.status_code == 504
+    assert response.json()["error"]["code"] == "DEADLINE_EXCEEDED"
+
+
+@pytest.mark.asyncio
+async def test_tool_invocation_deadline_exceeded_in_tool(test_app_client, mocker):
+    """Test that a tool that finds its deadline passed returns 504."""
+    from omni_lpr.deadlines import DeadlineExceededError
+
+    mocker.patch(
+        "omni_lpr.tools._recognize_plate_logic",
+        side_effect=DeadlineExceededError("inference"),
+    )
+    response = await test_app_client.post(
+        "/api/v1/tools/recognize_plate_from_path/invoke", json={"path": "plate.jpg"}
+    )
+    assert response.status_code == 504
+    assert response.json()["error"]["code"] == "DEADLINE_EXCEEDED"
+
+
+@pytest.mark.asyncio
+async def test_tool_invocation_overloaded_in_tool(test_app_client, mocker):
+    """Test that a tool call rejected while running returns 429 with Retry-After."""
+    from omni_lpr.admission import OverloadedError
+
+    mocker.patch(
+        "omni_lpr.tools._recognize_plate_logic",
+        side_effect=OverloadedError("recognize_plate_from_path", 3, "queue full"),
+    )
+    response = await test_app_client.post(
+        "/api/v1/tools/recognize_plate_from_path/invoke", json={"path": "plate.jpg"}
+    )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+
+
+@pytest.mark.asyncio
+async def test_tool_call_is_cancelled_when_client_disconnects():
+    """Test that the tool call of a REST request stops when its client disconnects."""
+    import anyio
+    from starlette.requests import Request
+
+    from omni_lpr.rest import _cancel_on_disconnect
+
+    async def receive():
+        await anyio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    request = Request({"type": "http", "method": "POST", "headers": []}, receive)
+    finished = False
+    with anyio.fail_after(1):
+        async with _cancel_on_disconnect(request) as scope:
+            await anyio.sleep(5)
+            finished = True
+
+    assert scope.cancel_called
+    assert not finished
+
+
 @pytest.mark.asyncio
 async def test_tool_invocation_unsupported_content_type(test_app_client):
     """Test invoking a tool with an unsupported content type returns 400."""
@@ -131,6 +255,105 @@ async def test_tool_invocation_unsupported_content_type(test_app_client):
     assert "Unsupported Content-Type" in response.json()["error"]["message"]
 
 
+@pytest.mark.asyncio
+async def test_multipart_upload_skips_base64(test_app_client, mocker):
+    """Test that uploaded images reach the decoder without being Base64-encoded."""
+    from PIL import Image
+
+    from omni_lpr import tools
+
+    mocker.patch("anyio.to_thread.run_sync", return_value=["MOCKED-RESULT"])
+    mocker.patch("omni_lpr.tools._get_ocr_recognizer")
+    mock_b64decode = mocker.patch("omni_lpr.tools.base64.b64decode")
+    mock_decode = mocker.patch.object(
+        tools.decode_pool, "decode", new_callable=AsyncMock, return_value=(MagicMock(), 1)
+    )
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 4)).save(buffer, format="PNG")
+    image_bytes = buffer.getvalue()
+    response = await test_app_client.post(
+        "/api/v1/tools/recognize_plate/invoke",
+        files={"image": ("plate.png", image_bytes, "image/png")},
+    )
+
+    assert response.status_code == 200, response.text
+    mock_b64decode.assert_not_called()
+    assert mock_decode.call_args.args[0] == image_bytes
+
+
+@pytest.mark.asyncio
+async def test_multipart_upload_too_large(test_app_client, mocker):
+    """Test that the image size limit applies to uploaded images."""
+    from omni_lpr.settings import settings
+
+    mocker.patch.object(settings, "max_image_size_mb", 1)
+    response = await test_app_client.post(
+        "/api/v1/tools/recognize_plate/invoke",
+        files={"image": ("big.png", b"x" * (1024 * 1024 + 1), "image/png")},
+    )
+
+    assert response.status_code == 400
+    assert "too large" in response.json()["error"]["details"][0]["msg"]
+
+
+@pytest.mark.asyncio
+async def test_raw_image_body(test_app_client, mocker):
+    """Test that a raw image body is decoded as is, with parameters from the query and headers."""
+    from PIL import Image
+
+    from omni_lpr import tools
+
+    mocker.patch("anyio.to_thread.run_sync", return_value=["MOCKED-RESULT"])
+    mock_get_ocr = mocker.patch("omni_lpr.tools._get_ocr_recognizer")
+    mock_decode = mocker.patch.object(
+        tools.decode_pool, "decode", new_callable=AsyncMock, return_value=(MagicMock(), 1)
+    )
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 4)).save(buffer, format="PNG")
+    image_bytes = buffer.getvalue()
+    response = await test_app_client.post(
+        "/api/v1/tools/recognize_plate/invoke?ocr_model=cct-s-v1-global-model",
+        content=image_bytes,
+        headers={"content-type": "image/png", "x-tool-precision": "int8"},
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["content"][0]["data"] == ["MOCKED-RESULT"]
+    mock_get_ocr.assert_called_once_with("cct-s-v1-global-model", "int8")
+    assert mock_decode.call_args.args[0] == image_bytes
+
+
+@pytest.mark.asyncio
+async def test_raw_image_body_too_large(test_app_client, mocker):
+    """Test that the image size limit applies to raw image bodies."""
+    from omni_lpr.settings import settings
+
+    mocker.patch.object(settings, "max_image_size_mb", 1)
+    response = await test_app_client.post(
+        "/api/v1/tools/recognize_plate/invoke",
+        content=b"x" * (1024 * 1024 + 1),
+        headers={"content-type": "application/octet-stream"},
+    )
+
+    assert response.status_code == 400
+    assert "too large" in response.json()["error"]["message"]
+
+
+@pytest.mark.asyncio
+async def test_raw_image_body_for_path_tool(test_app_client):
+    """Test that tools without image data reject raw image bodies."""
+    response = await test_app_client.post(
+        "/api/v1/tools/recognize_plate_from_path/invoke",
+        content=b"image",
+        headers={"content-type": "image/jpeg"},
+    )
+
+    assert response.status_code == 400
+    assert "does not take image data" in response.json()["error"]["message"]
+
+
 @pytest.mark.asyncio
 async def test_tool_invocation_multipart_missing_image(test_app_client):
     """Test invoking a tool with multipart form data but missing the image part returns 400."""
@@ -155,3 +378,20 @@ async def test_tool_invocation_internal_server_error(test_app_client, mocker):
     )
     assert response.status_code == 500
     assert response.json()["error"]["code"] == "INTERNAL_SERVER_ERROR"
+
+
+@pytest.mark.asyncio
+async def test_batch_tool_invocation_endpoint(test_app_client, mocker):
+    """Test invoking a batch tool through the REST endpoint."""
+    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1))
+    mocker.patch("omni_lpr.tools._get_ocr_recognizer")
+    mocker.patch("omni_lpr.tools._recognize_plates", return_value=["AAA", "BBB"])
+
+    response = await test_app_client.post(
+        "/api/v1/tools/recognize_plates_batch/invoke",
+        json={"images": [{"path": "/a.jpg"}, {"path": "/b.jpg"}]},
+    )
+
+    assert response.status_code == 200, f"Request failed: {response.text}"
+    data = response.json()["content"][0]["data"]
+    assert data == [{"index": 0, "results": ["AAA"]}, {"index": 1, "results": ["BBB"]}]
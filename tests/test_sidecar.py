@@ -0,0 +1,135 @@
+import json
+import socket
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from fast_alpr import ALPRResult, OcrResult
+from fast_plate_ocr.core.types import PlatePrediction
+from open_image_models.detection.core.base import BoundingBox, DetectionResult
+
+from omni_lpr import inference_pool
+from omni_lpr.inference_pool import RemoteALPR, RemoteRecognizer
+from omni_lpr.sidecar import (
+    _PEER_CREDENTIALS,
+    InferenceSidecarServer,
+    SidecarClient,
+    _decode_value,
+)
+
+
+@pytest.fixture
+def sidecar(tmp_path):
+    """Runs an inference sidecar in a background thread and yields a client for it."""
+    server = InferenceSidecarServer(str(tmp_path / "inference.sock"))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = SidecarClient(server.socket_path)
+    yield client
+    client.shutdown()
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_sidecar_runs_alpr_on_forwarded_frames(sidecar):
+    def predict(frame):
+        height, width, _ = frame.shape
+        return [
+            ALPRResult(
+                detection=DetectionResult(
+                    label="plate",
+                    confidence=np.float32(0.5),
+                    bounding_box=BoundingBox(x1=0, y1=0, x2=width, y2=height),
+                ),
+                ocr=OcrResult(
+                    text=str(int(frame.sum())),
+                    confidence=[0.25, 0.75],
+                    region=None,
+                    region_confidence=None,
+                ),
+            )
+        ]
+
+    alpr = MagicMock()
+    alpr.predict.side_effect = predict
+
+    with patch.dict(
+        inference_pool._worker_models, {("alpr", "det", "ocr", "fp32"): alpr}, clear=True
+    ):
+        result = RemoteALPR(sidecar, "det", "ocr").predict(np.ones((4, 5, 3), dtype=np.uint8))
+
+    assert result == predict(np.ones((4, 5, 3), dtype=np.uint8))
+    assert isinstance(result[0].detection.bounding_box, BoundingBox)
+
+
+def test_sidecar_runs_ocr_on_plate_lists(sidecar):
+    recognizer = MagicMock()
+    recognizer.config = SimpleNamespace(image_color_mode="grayscale")
+    recognizer.run.side_effect = lambda plates, return_confidence: [
+        PlatePrediction(
+            plate="x" * plate.shape[0],
+            char_probs=np.full(plate.shape[0], 0.5, dtype=np.float32)
+            if return_confidence
+            else None,
+        )
+        for plate in plates
+    ]
+
+    with patch.dict(
+        inference_pool._worker_models, {("ocr", "ocr", "fp32"): recognizer}, clear=True
+    ):
+        remote = RemoteRecognizer(sidecar, "ocr")
+        result = remote.run(
+            [np.zeros((5, 10), dtype=np.uint8), np.zeros((6, 12), dtype=np.uint8)],
+            return_confidence=True,
+        )
+
+    assert remote.config.image_color_mode == "grayscale"
+    assert [prediction.plate for prediction in result] == ["xxxxx", "xxxxxx"]
+    assert result[1].char_probs.dtype == np.float32
+    assert result[1].char_probs.tolist() == [0.5] * 6
+
+
+def test_sidecar_reports_errors_and_keeps_serving(sidecar):
+    alpr = MagicMock()
+    alpr.predict.side_effect = [ValueError("bad frame"), [], object()]
+    frame = np.zeros((2, 2, 3), dtype=np.uint8)
+
+    with patch.dict(
+        inference_pool._worker_models, {("alpr", "det", "ocr", "fp32"): alpr}, clear=True
+    ):
+        with pytest.raises(RuntimeError, match="ValueError: bad frame"):
+            sidecar.run("predict", "det", "ocr", "fp32", frames=[frame])
+        assert sidecar.run("predict", "det", "ocr", "fp32", frames=[frame]) == [[]]
+        with pytest.raises(RuntimeError, match="Cannot send a value of type object"):
+            sidecar.run("predict", "det", "ocr", "fp32", frames=[frame])
+
+    with pytest.raises(RuntimeError, match="Unknown operation"):
+        sidecar.run("train")
+
+
+def test_sidecar_client_reports_missing_sidecar(tmp_path):
+    client = SidecarClient(str(tmp_path / "missing.sock"))
+    with pytest.raises(OSError):
+        client.run("ocr_color_mode", "ocr")
+
+
+def test_sidecar_client_only_rebuilds_result_types():
+    with pytest.raises(ValueError, match="Unknown result type 'Popen'"):
+        json.loads('{"__type__": "Popen", "args": ["true"]}', object_hook=_decode_value)
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_PEERCRED"), reason="SO_PEERCRED is Linux-only.")
+def test_sidecar_client_refuses_a_sidecar_of_another_user():
+    client = SidecarClient("/nonexistent/inference.sock")
+    peer = MagicMock()
+    peer.getsockopt.return_value = _PEER_CREDENTIALS.pack(1234, 4321, 4321)
+
+    with patch("omni_lpr.sidecar.os.getuid", return_value=1000):
+        with pytest.raises(PermissionError, match="runs as user 4321"):
+            client._check_peer(peer)
+        peer.getsockopt.return_value = _PEER_CREDENTIALS.pack(1234, 1000, 1000)
+        client._check_peer(peer)
@@ -2,9 +2,10 @@ import base64
 import json
 from dataclasses import asdict, dataclass
 from typing import get_args
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import ANY, AsyncMock, MagicMock
 
 import httpx
+import numpy as np
 import pytest
 from mcp import types
 from pydantic import BaseModel
@@ -16,9 +17,10 @@ from omni_lpr.tools import (
     DetectorModel,
     ListModelsArgs,
     OcrModel,
+    RawImage,
     ToolRegistry,
     list_models,
-    setup_cache,
+    model_manager,
     setup_tools,
     tool_registry as global_tool_registry,
 )
@@ -69,10 +71,8 @@ def mock_alpr_result():
 @pytest.fixture(autouse=True)
 def clear_caches_and_registry():
     """Clears all tool-related caches and the global registry before each test."""
-    # Clear the LRU caches on the functions
-    setup_cache()
-    tools._get_ocr_recognizer.cache_clear()
-    tools._get_alpr_instance.cache_clear()
+    # Unload the models of earlier tests
+    model_manager.clear()
 
     # Clear the tool registry
     global_tool_registry._tools.clear()
@@ -84,6 +84,8 @@ def clear_caches_and_registry():
     tools.RecognizePlateFromPathArgs = BaseModel
     tools.DetectAndRecognizePlateArgs = BaseModel
     tools.DetectAndRecognizePlateFromPathArgs = BaseModel
+    tools.RecognizePlatesBatchArgs = BaseModel
+    tools.DetectAndRecognizePlatesBatchArgs = BaseModel
 
 
 @pytest.fixture
@@ -167,7 +169,7 @@ async def test_recognize_plate_base64_tool_success(mocker):
     setup_tools()
     mocker.patch("anyio.to_thread.run_sync", return_value=["TEST-123"])
     mock_get_image = mocker.patch(
-        "omni_lpr.tools._get_image_from_source", return_value=AsyncMock()
+        "omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1)
     )
     mocker.patch("omni_lpr.tools._get_ocr_recognizer", return_value=AsyncMock())
 
@@ -176,7 +178,9 @@ async def test_recognize_plate_base64_tool_success(mocker):
     )
 
     assert json.loads(result[0].text) == ["TEST-123"]
-    mock_get_image.assert_called_once_with(image_base64=TINY_PNG_BASE64, path=None)
+    mock_get_image.assert_called_once_with(
+        image_base64=RawImage(base64.b64decode(TINY_PNG_BASE64)), path=None
+    )
 
 
 @pytest.mark.asyncio
@@ -184,7 +188,7 @@ async def test_recognize_plate_path_tool_success(mocker):
     setup_tools()
     mocker.patch("anyio.to_thread.run_sync", return_value=["TEST-123"])
     mock_get_image = mocker.patch(
-        "omni_lpr.tools._get_image_from_source", return_value=AsyncMock()
+        "omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1)
     )
     mocker.patch("omni_lpr.tools._get_ocr_recognizer", return_value=AsyncMock())
 
@@ -201,7 +205,7 @@ async def test_detect_and_recognize_plate_base64_tool_success(mocker, mock_alpr_
     setup_tools()
     mocker.patch("anyio.to_thread.run_sync", return_value=[mock_alpr_result])
     mock_get_image = mocker.patch(
-        "omni_lpr.tools._get_image_from_source", return_value=AsyncMock()
+        "omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1)
     )
     mocker.patch("omni_lpr.tools._get_alpr_instance", return_value=AsyncMock())
 
@@ -211,7 +215,9 @@ async def test_detect_and_recognize_plate_base64_tool_success(mocker, mock_alpr_
 
     expected_dict = [asdict(mock_alpr_result)]
     assert json.loads(result[0].text) == expected_dict
-    mock_get_image.assert_called_once_with(image_base64=TINY_PNG_BASE64, path=None)
+    mock_get_image.assert_called_once_with(
+        image_base64=RawImage(base64.b64decode(TINY_PNG_BASE64)), path=None, min_size=0
+    )
 
 
 @pytest.mark.asyncio
@@ -219,7 +225,7 @@ async def test_detect_and_recognize_plate_path_tool_success(mocker, mock_alpr_re
     setup_tools()
     mocker.patch("anyio.to_thread.run_sync", return_value=[mock_alpr_result])
     mock_get_image = mocker.patch(
-        "omni_lpr.tools._get_image_from_source", return_value=AsyncMock()
+        "omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1)
     )
     mocker.patch("omni_lpr.tools._get_alpr_instance", return_value=AsyncMock())
 
@@ -229,7 +235,48 @@ async def test_detect_and_recognize_plate_path_tool_success(mocker, mock_alpr_re
 
     expected_dict = [asdict(mock_alpr_result)]
     assert json.loads(result[0].text) == expected_dict
-    mock_get_image.assert_called_once_with(image_base64=None, path="/fake/path.jpg")
+    mock_get_image.assert_called_once_with(image_base64=None, path="/fake/path.jpg", min_size=0)
+
+
+@pytest.mark.asyncio
+async def test_detect_and_recognize_plate_maps_boxes_to_original_image(mocker, mock_alpr_result):
+    setup_tools()
+    mocker.patch.object(settings, "reduced_decode", True)
+    mocker.patch("anyio.to_thread.run_sync", return_value=[mock_alpr_result])
+    mock_get_image = mocker.patch(
+        "omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 4)
+    )
+    mocker.patch("omni_lpr.tools._get_alpr_instance", return_value=AsyncMock())
+
+    result = await global_tool_registry.call(
+        "detect_and_recognize_plate_from_path",
+        {
+            "path": "/fake/path.jpg",
+            "cascade_detector_model": "yolo-v9-s-608-license-plate-end2end",
+        },
+    )
+
+    (plate,) = json.loads(result[0].text)
+    assert plate["detection"]["bounding_box"] == {"x1": 40, "y1": 80, "x2": 400, "y2": 200}
+    mock_get_image.assert_called_once_with(
+        image_base64=None, path="/fake/path.jpg", min_size=608
+    )
+
+
+@pytest.mark.asyncio
+async def test_detect_and_recognize_plate_full_resolution_decode(mocker, mock_alpr_result):
+    setup_tools()
+    mocker.patch("anyio.to_thread.run_sync", return_value=[mock_alpr_result])
+    mock_get_image = mocker.patch(
+        "omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1)
+    )
+    mocker.patch("omni_lpr.tools._get_alpr_instance", return_value=AsyncMock())
+
+    await global_tool_registry.call(
+        "detect_and_recognize_plate_from_path", {"path": "/fake/path.jpg"}
+    )
+
+    mock_get_image.assert_called_once_with(image_base64=None, path="/fake/path.jpg", min_size=0)
 
 
 @pytest.mark.asyncio
@@ -261,6 +308,15 @@ async def test_tool_validation_errors(tool_name, invalid_data, expected_error_ms
     assert expected_error_msg in str(excinfo.value.error.details)
 
 
+def test_oversized_base64_is_rejected_before_decoding(mocker):
+    b64decode = mocker.patch("omni_lpr.tools.base64.b64decode")
+
+    with pytest.raises(ValueError, match="Input image is too large"):
+        tools._validate_base64(OVERSIZED_BASE64)
+
+    b64decode.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_recognizer_model_caching(mocker):
     setup_tools()
@@ -269,7 +325,7 @@ async def test_recognizer_model_caching(mocker):
     mock_recognizer_class = mocker.patch(
         "fast_plate_ocr.LicensePlateRecognizer", return_value=mock_recognizer_instance
     )
-    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=AsyncMock())
+    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1))
 
     # Call tool with first OCR model
     await global_tool_registry.call(
@@ -281,7 +337,9 @@ async def test_recognizer_model_caching(mocker):
         "recognize_plate",
         {"image_base64": TINY_PNG_BASE64, "ocr_model": "cct-s-v1-global-model"},
     )
-    mock_recognizer_class.assert_called_once_with("cct-s-v1-global-model")
+    mock_recognizer_class.assert_called_once_with(
+        "cct-s-v1-global-model", device="auto", sess_options=ANY
+    )
 
     # Call tool with the second OCR model
     await global_tool_registry.call(
@@ -292,12 +350,13 @@ async def test_recognizer_model_caching(mocker):
 
 
 @pytest.mark.asyncio
-async def test_alpr_instance_caching(mocker):
+async def test_alpr_pipelines_share_model_components(mocker):
     setup_tools()
-    mock_alpr_instance = MagicMock()
-    mock_alpr_instance.predict.return_value = []
-    mock_alpr_class = mocker.patch("fast_alpr.ALPR", return_value=mock_alpr_instance)
-    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=AsyncMock())
+    mock_detector_class = mocker.patch("open_image_models.create_detector")
+    mock_detector_class.return_value.predict.return_value = []
+    mock_recognizer_class = mocker.patch("fast_plate_ocr.LicensePlateRecognizer")
+    mock_recognizer_class.return_value.run.return_value = ["TEST"]
+    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1))
 
     # Call with first set of models
     args_1 = {
@@ -307,21 +366,26 @@ async def test_alpr_instance_caching(mocker):
     }
     await global_tool_registry.call("detect_and_recognize_plate", args_1)
     await global_tool_registry.call("detect_and_recognize_plate", args_1)
-    mock_alpr_class.assert_called_once_with(
-        detector_model="yolo-v9-t-384-license-plate-end2end",
-        ocr_model="cct-s-v1-global-model",
-        ocr_device="auto",
-        detector_providers=None,
+    mock_detector_class.assert_called_once_with(
+        "yolo-v9-t-384-license-plate-end2end",
+        conf_thresh=0.4,
+        batch_size=1,
+        providers=None,
+        sess_options=ANY,
+    )
+    mock_recognizer_class.assert_called_once_with(
+        "cct-s-v1-global-model", device="auto", sess_options=ANY
     )
 
-    # Call with the second set of models
-    args_2 = {
-        "image_base64": TINY_PNG_BASE64,
-        "detector_model": "yolo-v9-t-256-license-plate-end2end",
-        "ocr_model": "cct-xs-v1-global-model",
-    }
+    # Another detector reuses the loaded OCR model, and so does the OCR-only tool
+    args_2 = {**args_1, "detector_model": "yolo-v9-t-256-license-plate-end2end"}
     await global_tool_registry.call("detect_and_recognize_plate", args_2)
-    assert mock_alpr_class.call_count == 2
+    await global_tool_registry.call(
+        "recognize_plate",
+        {"image_base64": TINY_PNG_BASE64, "ocr_model": "cct-s-v1-global-model"},
+    )
+    assert mock_detector_class.call_count == 2
+    assert mock_recognizer_class.call_count == 1
 
 
 @pytest.mark.asyncio
@@ -333,6 +397,8 @@ async def test_list_models():
     expected = {
         "detector_models": list(get_args(DetectorModel)),
         "ocr_models": list(get_args(OcrModel)),
+        "precisions": ["fp32", "int8"],
+        "default_precision": "fp32",
     }
     assert models == expected
 
@@ -367,6 +433,22 @@ async def test_get_image_from_corrupted_data():
         )
 
 
+@pytest.mark.asyncio
+async def test_base64_image_is_decoded_once(mocker):
+    """Tests that Base64 image data is decoded during validation and not again."""
+    setup_tools()
+    mocker.patch("anyio.to_thread.run_sync", return_value=["TEST-123"])
+    mocker.patch("omni_lpr.tools._get_ocr_recognizer", return_value=AsyncMock())
+    mocker.patch.object(
+        tools.decode_pool, "decode", new_callable=AsyncMock, return_value=(MagicMock(), 1)
+    )
+    b64decode = mocker.spy(tools.base64, "b64decode")
+
+    await global_tool_registry.call("recognize_plate", {"image_base64": TINY_PNG_BASE64})
+
+    b64decode.assert_called_once_with(TINY_PNG_BASE64)
+
+
 @pytest.mark.asyncio
 async def test_unsupported_image_format_from_path(tmp_path):
     """Tests that an unsupported image format from a path raises a ValueError."""
@@ -400,3 +482,458 @@ async def test_get_image_from_directory_path_raises_error(tmp_path):
     # The specific error can vary by OS (like IsADirectoryError on Linux),
     # so we check for a substring that indicates a read failure on a directory.
     assert "Is a directory" in str(exc_info.value) or "read failed" in str(exc_info.value)
+
+
+def test_detect_plates_batch_items_groups_frames_by_instance():
+    import numpy as np
+
+    frame = np.zeros((60, 120, 3), dtype=np.uint8)
+    detection = MockDetectionResult(
+        bounding_box=MockBoundingBox(x1=0, y1=0, x2=10, y2=10), confidence=0.9
+    )
+    alpr_1, alpr_2 = MagicMock(), MagicMock()
+    alpr_1.detector.detector.batch_size = 4
+    alpr_1.detector.detector.predict.return_value = [[detection], []]
+    alpr_2.detector.detector = None
+    alpr_2.detector.predict.return_value = [detection]
+
+    results = tools._detect_plates_batch_items([(alpr_1, frame), (alpr_2, frame), (alpr_1, frame)])
+
+    alpr_1.detector.detector.predict.assert_called_once()
+    alpr_2.detector.predict.assert_called_once()
+    assert results == [[detection], [detection], []]
+
+
+def test_composed_alpr_runs_shared_recognizer():
+    import numpy as np
+
+    frame = np.zeros((60, 120, 3), dtype=np.uint8)
+    detection = MockDetectionResult(
+        bounding_box=MockBoundingBox(x1=10, y1=20, x2=100, y2=50), confidence=0.9
+    )
+    detector, recognizer = MagicMock(), MagicMock()
+    detector.predict.return_value = [detection]
+    recognizer.config.image_color_mode = "rgb"
+    recognizer.run_one.return_value = MagicMock(
+        plate="ABC123", char_probs=None, region=None, region_prob=None
+    )
+
+    results = tools._compose_alpr(detector, recognizer).predict(frame)
+
+    assert recognizer.run_one.call_args.args[0].shape == (30, 90, 3)
+    assert results[0].detection is detection
+    assert results[0].ocr.text == "ABC123"
+    # Pipelines sharing a detector are batched together.
+    detector.detector.batch_size = 4
+    detector.detector.predict.return_value = [[], []]
+    pipelines = [tools._compose_alpr(detector, recognizer) for _ in range(2)]
+    tools._detect_plates_batch_items([(pipeline, frame) for pipeline in pipelines])
+    detector.detector.predict.assert_called_once()
+
+
+def test_recognize_plates_batch_runs_one_stacked_call_per_recognizer():
+    import numpy as np
+
+    plate = np.zeros((20, 60, 3), dtype=np.uint8)
+    recognizer = MagicMock()
+    recognizer.run.return_value = ["AAA", "BBB"]
+
+    results = tools._recognize_plates_batch([(recognizer, plate), (recognizer, plate)])
+
+    recognizer.run.assert_called_once()
+    assert len(recognizer.run.call_args.args[0]) == 2
+    assert results == ["AAA", "BBB"]
+
+
+def test_crop_plate_clamps_to_frame_bounds():
+    import numpy as np
+
+    frame = np.zeros((60, 120, 3), dtype=np.uint8)
+    box = MockBoundingBox(x1=-5, y1=10, x2=200, y2=40)
+    assert tools._crop_plate(frame, box).shape == (30, 120, 3)
+
+
+@dataclass
+class MockPlatePrediction:
+    plate: str
+    char_probs: object = None
+    region: str | None = None
+    region_prob: float | None = None
+
+
+@pytest.mark.asyncio
+async def test_detect_and_recognize_plate_uses_batchers_when_enabled(mocker):
+    import numpy as np
+
+    setup_tools()
+    tools.batch_scheduler.clear()
+    mocker.patch.object(settings, "inference_batch_max_size", 4)
+    frame = np.zeros((60, 120, 3), dtype=np.uint8)
+    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=(frame, 1))
+    mocker.patch("omni_lpr.tools._get_alpr_instance", return_value=MagicMock())
+    recognizer = MagicMock()
+    recognizer.config.image_color_mode = "rgb"
+    mocker.patch("omni_lpr.tools._get_ocr_recognizer", return_value=recognizer)
+    detection = MockDetectionResult(
+        bounding_box=MockBoundingBox(x1=10, y1=20, x2=100, y2=50), confidence=0.99
+    )
+    mocker.patch(
+        "omni_lpr.tools._detect_plates_batch_items",
+        side_effect=lambda items: [[detection] for _ in items],
+    )
+    mock_ocr_batch = mocker.patch(
+        "omni_lpr.tools._recognize_plates_batch",
+        side_effect=lambda items: [
+            MockPlatePrediction(plate="TEST1234", char_probs=np.array([0.5, 1.0]))
+            for _ in items
+        ],
+    )
+
+    result = await global_tool_registry.call(
+        "detect_and_recognize_plate", {"image_base64": TINY_PNG_BASE64}
+    )
+
+    data = json.loads(result[0].text)
+    assert data[0]["ocr"] == {
+        "text": "TEST1234",
+        "confidence": [0.5, 1.0],
+        "region": None,
+        "region_confidence": None,
+    }
+    assert data[0]["detection"]["confidence"] == 0.99
+    cropped = mock_ocr_batch.call_args.args[0][0][1]
+    assert cropped.shape == (30, 90, 3)
+    tools.batch_scheduler.clear()
+
+
+@pytest.mark.asyncio
+async def test_recognize_plate_uses_ocr_batcher_when_enabled(mocker):
+    setup_tools()
+    tools.batch_scheduler.clear()
+    mocker.patch.object(settings, "inference_batch_max_size", 4)
+    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1))
+    mocker.patch("omni_lpr.tools._get_ocr_recognizer", return_value=MagicMock())
+    mocker.patch(
+        "omni_lpr.tools._recognize_plates_batch",
+        side_effect=lambda items: [MockPlatePrediction(plate="XYZ") for _ in items],
+    )
+
+    result = await global_tool_registry.call(
+        "recognize_plate", {"image_base64": TINY_PNG_BASE64}
+    )
+
+    assert json.loads(result[0].text) == [
+        {"plate": "XYZ", "char_probs": None, "region": None, "region_prob": None}
+    ]
+    assert tools.batch_scheduler.stats()["ocr/cct-xs-v1-global-model"]["items_processed"] == 1
+    tools.batch_scheduler.clear()
+
+
+@pytest.mark.asyncio
+async def test_detect_and_recognize_plates_batch_returns_per_item_results(
+    mocker, mock_alpr_result
+):
+    import numpy as np
+
+    setup_tools()
+    frame = np.zeros((10, 10, 3), dtype=np.uint8)
+
+    async def fake_get_image(image_base64=None, path=None, min_size=0):
+        if path == "/missing.jpg":
+            raise ValueError("File not found at path: /missing.jpg")
+        if path == "http://example.com/forbidden.jpg":
+            raise tools.ImageFetchError(403)
+        return frame, 1
+
+    mocker.patch("omni_lpr.tools._get_image_from_source", side_effect=fake_get_image)
+    mocker.patch("omni_lpr.tools._get_alpr_instance", return_value=MagicMock())
+    mock_run_many = mocker.patch(
+        "omni_lpr.tools._run_alpr_many",
+        side_effect=lambda alpr, det, ocr, frames, precision: [
+            [mock_alpr_result] for _ in frames
+        ],
+    )
+
+    result = await global_tool_registry.call(
+        "detect_and_recognize_plates_batch",
+        {
+            "images": [
+                {"image_base64": TINY_PNG_BASE64},
+                {"path": "/missing.jpg"},
+                {"path": "http://example.com/forbidden.jpg"},
+                {"path": "/car.jpg"},
+            ]
+        },
+    )
+
+    entries = json.loads(result[0].text)
+    assert [entry["index"] for entry in entries] == [0, 1, 2, 3]
+    assert entries[0]["results"] == [asdict(mock_alpr_result)]
+    assert entries[1]["error"]["code"] == "TOOL_LOGIC_ERROR"
+    assert "File not found" in entries[1]["error"]["message"]
+    assert entries[2] == {"index": 2, "results": []}
+    assert entries[3]["results"] == [asdict(mock_alpr_result)]
+    # All successfully loaded frames go through one batched pipeline call.
+    mock_run_many.assert_called_once()
+    assert len(mock_run_many.call_args.args[3]) == 2
+
+
+@pytest.mark.asyncio
+async def test_recognize_plates_batch_reports_inference_failure_per_item(mocker):
+    setup_tools()
+    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1))
+    mocker.patch("omni_lpr.tools._get_ocr_recognizer", return_value=MagicMock())
+    mocker.patch("omni_lpr.tools._recognize_plates", side_effect=RuntimeError("boom"))
+
+    result = await global_tool_registry.call(
+        "recognize_plates_batch",
+        {"images": [{"image_base64": TINY_PNG_BASE64}, {"path": "/plate.jpg"}]},
+    )
+
+    entries = json.loads(result[0].text)
+    assert [entry["error"]["message"] for entry in entries] == ["boom", "boom"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "images, expected_error_msg",
+    [
+        ([], "at least 1 item"),
+        ([{}], "Provide exactly one of"),
+        ([{"image_base64": TINY_PNG_BASE64, "path": "/a.jpg"}], "Provide exactly one of"),
+    ],
+)
+async def test_batch_tool_validation_errors(images, expected_error_msg):
+    setup_tools()
+    with pytest.raises(ToolLogicError) as excinfo:
+        await global_tool_registry.call("recognize_plates_batch", {"images": images})
+    assert excinfo.value.error.code == ErrorCode.VALIDATION_ERROR
+    assert expected_error_msg in str(excinfo.value.error.details)
+
+
+def test_components_load_models_through_optimized_model_cache(mocker, tmp_path):
+    from omni_lpr import tools
+    from omni_lpr.settings import settings
+
+    mocker.patch.object(settings, "ort_optimized_model_dir", str(tmp_path))
+    detector_file = tmp_path / "detector.onnx"
+    ocr_file, config_file = tmp_path / "ocr.onnx", tmp_path / "ocr.yaml"
+    mocker.patch(
+        "open_image_models.detection.core.hub.download_model", return_value=detector_file
+    )
+    mocker.patch(
+        "fast_plate_ocr.inference.hub.download_model", return_value=(ocr_file, config_file)
+    )
+    mock_create_detector = mocker.patch("open_image_models.create_detector")
+    mock_recognizer_class = mocker.patch("fast_plate_ocr.LicensePlateRecognizer")
+
+    detector = tools._build_detector("yolo-v9-t-384-license-plate-end2end")
+    tools._build_ocr_recognizer("cct-xs-v1-global-model")
+
+    assert mock_create_detector.call_args.args[0] == detector_file
+    assert mock_create_detector.call_args.kwargs["backend"] == "yolo_v9"
+    assert detector.detector is mock_create_detector.return_value
+    kwargs = mock_recognizer_class.call_args.kwargs
+    assert kwargs["onnx_model_path"] == ocr_file
+    assert kwargs["plate_config_path"] == config_file
+    # The optimized graphs are written to the cache directory when the sessions are created.
+    assert kwargs["sess_options"].optimized_model_filepath.startswith(str(tmp_path))
+
+
+def test_int8_components_load_quantized_model_files(mocker, tmp_path):
+    from omni_lpr import tools
+
+    detector_file = tmp_path / "detector.onnx"
+    ocr_file, config_file = tmp_path / "ocr.onnx", tmp_path / "ocr.yaml"
+    mocker.patch("open_image_models.detection.core.hub.download_model", return_value=detector_file)
+    mocker.patch(
+        "fast_plate_ocr.inference.hub.download_model", return_value=(ocr_file, config_file)
+    )
+    mock_model_file = mocker.patch(
+        "omni_lpr.tools.model_file",
+        side_effect=lambda name, path, precision: path.with_suffix(".q"),
+    )
+    mock_create_detector = mocker.patch("open_image_models.create_detector")
+    mock_recognizer_class = mocker.patch("fast_plate_ocr.LicensePlateRecognizer")
+
+    tools._build_detector("yolo-v9-t-384-license-plate-end2end", "int8")
+    tools._build_ocr_recognizer("cct-xs-v1-global-model", "int8")
+
+    assert [call.args[2] for call in mock_model_file.call_args_list] == ["int8", "int8"]
+    assert mock_create_detector.call_args.args[0] == tmp_path / "detector.q"
+    kwargs = mock_recognizer_class.call_args.kwargs
+    assert kwargs["onnx_model_path"] == tmp_path / "ocr.q"
+    assert kwargs["plate_config_path"] == config_file
+
+
+@pytest.mark.asyncio
+async def test_precision_selects_model_variant(mocker):
+    from omni_lpr.settings import settings
+
+    mocker.patch.object(settings, "model_precision", "int8")
+    setup_tools()
+    mock_build = mocker.patch("omni_lpr.tools._build_ocr_recognizer")
+    mock_build.return_value.run.return_value = ["TEST"]
+    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1))
+
+    # Calls without a precision use the configured one.
+    await global_tool_registry.call("recognize_plate", {"image_base64": TINY_PNG_BASE64})
+    await global_tool_registry.call(
+        "recognize_plate", {"image_base64": TINY_PNG_BASE64, "precision": "fp32"}
+    )
+    with pytest.raises(ToolLogicError):
+        await global_tool_registry.call(
+            "recognize_plate", {"image_base64": TINY_PNG_BASE64, "precision": "fp16"}
+        )
+
+    assert [call.args for call in mock_build.call_args_list] == [
+        ("cct-xs-v1-global-model", "int8"),
+        ("cct-xs-v1-global-model", "fp32"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_detect_and_recognize_plate_escalates_through_cascade(mocker, mock_alpr_result):
+    setup_tools()
+    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=(MagicMock(), 1))
+    mock_get_alpr = mocker.patch("omni_lpr.tools._get_alpr_instance")
+    mocker.patch(
+        "omni_lpr.tools._run_alpr",
+        side_effect=lambda alpr, det, ocr, frame, precision: (
+            [] if det == "yolo-v9-t-256-license-plate-end2end" else [mock_alpr_result]
+        ),
+    )
+
+    result = await global_tool_registry.call(
+        "detect_and_recognize_plate",
+        {
+            "image_base64": TINY_PNG_BASE64,
+            "detector_model": "yolo-v9-t-256-license-plate-end2end",
+            "cascade_detector_model": "yolo-v9-s-608-license-plate-end2end",
+        },
+    )
+
+    assert json.loads(result[0].text) == [
+        {
+            **asdict(mock_alpr_result),
+            "stage": "escalated",
+            "detector_model": "yolo-v9-s-608-license-plate-end2end",
+        }
+    ]
+    assert [call.args[0] for call in mock_get_alpr.call_args_list] == [
+        "yolo-v9-t-256-license-plate-end2end",
+        "yolo-v9-s-608-license-plate-end2end",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_recognize_plate_serves_repeated_images_from_result_cache(mocker):
+    setup_tools()
+    run_sync = mocker.patch("anyio.to_thread.run_sync", return_value=["TEST-123"])
+    frame = np.zeros((8, 8, 3), dtype=np.uint8)
+    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=(frame, 1))
+    mocker.patch("omni_lpr.tools._get_ocr_recognizer", return_value=AsyncMock())
+
+    for arguments in ({}, {}, {"bypass_cache": True}):
+        result = await global_tool_registry.call(
+            "recognize_plate", {"image_base64": TINY_PNG_BASE64, **arguments}
+        )
+        assert json.loads(result[0].text) == ["TEST-123"]
+
+    assert run_sync.call_count == 2
+    assert tools.result_cache.stats()["hits"] >= 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("source, expected_runs", [("parking-cam-1", 1), (None, 2)])
+async def test_detect_and_recognize_plate_reuses_results_of_near_duplicate_frames(
+    mocker, mock_alpr_result, source, expected_runs
+):
+    mocker.patch.object(settings, "near_duplicate_detection", True)
+    setup_tools()
+    # Large frames are hashed in worker threads, so only inference is mocked.
+    run_sync = mocker.patch(
+        "omni_lpr.tools.run_terminable", new=AsyncMock(return_value=[mock_alpr_result])
+    )
+    frame = np.kron(
+        np.random.default_rng(1).integers(0, 256, (12, 16, 3), dtype=np.uint8),
+        np.ones((40, 40, 1), dtype=np.uint8),
+    )
+    noisy_frame = frame.copy()
+    noisy_frame[0, 0] ^= 1
+    mocker.patch(
+        "omni_lpr.tools._get_image_from_source", side_effect=[(frame, 1), (noisy_frame, 1)]
+    )
+    mocker.patch("omni_lpr.tools._get_alpr_instance", return_value=AsyncMock())
+
+    hits = tools.near_duplicates.stats()["hits"]
+    for _ in range(2):
+        result = await global_tool_registry.call(
+            "detect_and_recognize_plate",
+            {"image_base64": TINY_PNG_BASE64, "source": source},
+        )
+        assert json.loads(result[0].text) == [asdict(mock_alpr_result)]
+
+    assert run_sync.call_count == expected_runs
+    assert tools.near_duplicates.stats()["hits"] - hits == 2 - expected_runs
+
+
+@pytest.mark.asyncio
+async def test_recognize_plate_converts_frames_to_the_ocr_color_mode(mocker):
+    setup_tools()
+    frame = np.zeros((2, 2, 3), dtype=np.uint8)
+    frame[..., 0] = 255  # Blue in BGR
+    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=(frame, 1))
+    recognizer = MagicMock()
+    recognizer.config.image_color_mode = "rgb"
+    mocker.patch("omni_lpr.tools._get_ocr_recognizer", return_value=recognizer)
+    run = mocker.patch("omni_lpr.tools.run_terminable", new=AsyncMock(return_value=["ABC"]))
+
+    await global_tool_registry.call("recognize_plate_from_path", {"path": "/fake/path.jpg"})
+
+    ((_, plate),) = run.call_args.args[1]
+    assert plate[0, 0].tolist() == [0, 0, 255]
+
+
+@pytest.mark.asyncio
+async def test_recognize_plate_returns_confidences_without_batching(mocker):
+    setup_tools()
+    mocker.patch.object(settings, "inference_batch_max_size", 1)
+    frame = np.full((3, 3, 3), 7, dtype=np.uint8)
+    mocker.patch("omni_lpr.tools._get_image_from_source", return_value=(frame, 1))
+    recognizer = MagicMock()
+    recognizer.config.image_color_mode = "rgb"
+    recognizer.run.return_value = [MockPlatePrediction(plate="XYZ", char_probs=np.array([0.5]))]
+    mocker.patch("omni_lpr.tools._get_ocr_recognizer", return_value=recognizer)
+
+    result = await global_tool_registry.call(
+        "recognize_plate", {"image_base64": TINY_PNG_BASE64, "bypass_cache": True}
+    )
+
+    assert recognizer.run.call_args.kwargs == {"return_confidence": True}
+    assert json.loads(result[0].text) == [
+        {"plate": "XYZ", "char_probs": [0.5], "region": None, "region_prob": None}
+    ]
+
+
+@pytest.mark.parametrize("batch_dimension, expected_runs", [("batch", 1), (1, 3)])
+def test_detector_runs_a_batch_in_one_session_run(
+    mocker, tmp_path, batch_dimension, expected_runs
+):
+    mocker.patch.object(settings, "inference_batch_max_size", 8)
+    model_file = tmp_path / "detector.onnx"
+    model_file.write_bytes(b"")
+    mocker.patch("open_image_models.detection.factory.download_model", return_value=model_file)
+    session = MagicMock()
+    session.get_inputs.return_value = [MagicMock(shape=[batch_dimension, 3, 384, 384])]
+    # End-to-end models output one row per plate: batch index, box, score, class.
+    session.run.return_value = [np.zeros((0, 7), dtype=np.float32)]
+    ort = mocker.patch("open_image_models.detection.core.yolo_v9.inference.ort")
+    ort.InferenceSession.return_value = session
+
+    detector = tools._build_detector("yolo-v9-t-384-license-plate-end2end")
+    frames = [np.zeros((480, 640, 3), dtype=np.uint8)] * 3
+    detections = tools._detect_plates_batch(MagicMock(detector=detector), frames)
+
+    assert detections == [[], [], []]
+    assert session.run.call_count == expected_runs
@@ -0,0 +1,65 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from omni_lpr.settings import ServerSettings
+from omni_lpr.warmup import Readiness, parse_model_combination, warm_up_models
+
+
+def test_parse_model_combination():
+    assert parse_model_combination(" det:ocr ") == ("det", "ocr")
+    for entry in ["det", "det:", ":ocr"]:
+        with pytest.raises(ValueError, match="Invalid preload entry"):
+            parse_model_combination(entry)
+
+
+def test_preload_models_setting_accepts_comma_separated_string():
+    assert ServerSettings(preload_models="a:b, c:d,").preload_models == ["a:b", "c:d"]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_models_loads_and_runs_each_combination():
+    state = Readiness()
+    alpr, recognizer = MagicMock(), MagicMock()
+    recognizer.config.image_color_mode = "grayscale"
+
+    with (
+        patch("omni_lpr.tools._get_alpr_instance", new=AsyncMock(return_value=alpr)) as get_alpr,
+        patch("omni_lpr.tools._get_ocr_recognizer", new=AsyncMock(return_value=recognizer)),
+        patch("omni_lpr.tools._run_alpr", new=AsyncMock(return_value=[])) as run_alpr,
+        patch("omni_lpr.tools._recognize_plates", new=AsyncMock(return_value=[])) as recognize,
+    ):
+        await warm_up_models(["det-a:ocr-a", "det-b:ocr-b"], iterations=2, state=state)
+
+    assert state.ready
+    assert state.to_dict()["models"] == ["det-a:ocr-a", "det-b:ocr-b"]
+    assert [call.args for call in get_alpr.call_args_list] == [
+        ("det-a", "ocr-a", "fp32"),
+        ("det-b", "ocr-b", "fp32"),
+    ]
+    assert run_alpr.call_count == 4
+    assert run_alpr.call_args.args[3].shape == (480, 640, 3)
+    # The synthetic plate is converted to the OCR model's color mode.
+    assert recognize.call_args.args[2][0].ndim == 2
+    assert recognize.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_warm_up_models_without_combinations_is_ready():
+    state = Readiness()
+    await warm_up_models([], iterations=3, state=state)
+    assert state.ready
+
+
+@pytest.mark.asyncio
+async def test_warm_up_models_records_failures():
+    state = Readiness()
+    with patch(
+        "omni_lpr.tools._get_alpr_instance",
+        new=AsyncMock(side_effect=RuntimeError("download failed")),
+    ):
+        await warm_up_models(["det:ocr"], iterations=1, state=state)
+
+    assert not state.ready
+    assert state.to_dict()["status"] == "failed"
+    assert state.to_dict()["error"] == "download failed"